@@ -0,0 +1,279 @@
+"""
+Throughput benchmark of the rules engine and the solver.
+
+Usage:
+    python -m Assets.module.benchmark [workload ...] [--repeat N]
+           [--save-baseline] [--tolerance 0.5] [--generate-maps]
+
+Workloads, each timed on every level of maps_collection and on the
+generated maps of benchmark_maps.json (12x12 and 16x16):
+    is_linked       every cell, direction and gate state
+    enemy_steps     zombie / scorpion moves from the start positions, for
+                    every player cell
+    check_same_pos  collisions of the enemy moves above
+    generate_graph  both gate states
+    turn_step       LevelRules.step with every direction from every cell
+    shortest_path   Shortest_Path (A*) from the start state, board included
+
+A workload runs --repeat times per map (looped to last a few ms) and the
+fastest run counts; the runs of one map group are summed.
+
+Timings only compare on the machine that measured them, so no baseline is
+shipped: run with --save-baseline first (benchmark_baseline.json, not
+versioned), then again after a change. Without a baseline the results are
+only printed; with one the exit status is 1 when a workload got slower
+than baseline * (1 + tolerance).
+
+--generate-maps rebuilds benchmark_maps.json with MapGenerator from fixed
+seeds. The maps are stored so the numbers do not move when the generator
+changes.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+
+from .map_collection import maps_collection
+from .levels import load_level, clean_map_data, get_winning_position
+from .settings import UP, DOWN, LEFT, RIGHT
+from .rules import (
+    is_linked, generate_next_zombie_positions, generate_next_scorpion_positions, check_same_pos,
+    LevelRules,
+)
+from .game_algorithms import Shortest_Path, generate_graph, SEARCH_ASTAR
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCHMARK_MAPS_FILE = os.path.join(MODULE_DIR, "benchmark_maps.json")
+BASELINE_FILE = os.path.join(MODULE_DIR, "benchmark_baseline.json")
+
+# (size, MapGenerator seed) of the generated maps in BENCHMARK_MAPS_FILE
+GENERATED_MAP_SEEDS = [(12, 0), (12, 2), (16, 0), (16, 2)]
+
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.5
+MIN_RUN_TIME = 0.005  # seconds, see time_workload
+
+
+class BenchmarkLevel:
+    """One map prepared for the workloads (start state and winning cell)."""
+
+    def __init__(self, superdata: dict) -> None:
+        self.superdata = superdata
+        self.map_data = superdata["map_data"]
+        self.size = superdata.get("map_length", len(self.map_data))
+        self.player_start = tuple(superdata["player_start"])
+        self.zombies = [tuple(zombie) for zombie in superdata.get("zombie_starts") or []]
+        self.scorpions = [tuple(scorpion) for scorpion in superdata.get("scorpion_starts") or []]
+        self.cells = [(x, y) for y in range(1, len(self.map_data) + 1) for x in range(1, len(self.map_data[0]) + 1)]
+
+        winning_position, self.goal_direction = get_winning_position(superdata["stair_position"], self.size)
+        self.winning_position = tuple(winning_position)
+
+
+def load_benchmark_levels() -> dict:
+    """Return {group name: [BenchmarkLevel, ...]} of every benchmarked map."""
+    groups = {"levels": []}
+    for level_index in range(len(maps_collection)):
+        groups["levels"].append(BenchmarkLevel(load_level(level_index)[2]))
+
+    if os.path.exists(BENCHMARK_MAPS_FILE):
+        with open(BENCHMARK_MAPS_FILE) as f:
+            generated_maps = json.load(f)
+        for superdata in generated_maps:
+            superdata["map_data"] = clean_map_data(superdata["map_data"])
+            size = superdata["map_length"]
+            groups.setdefault(f"generated_{size}x{size}", []).append(BenchmarkLevel(superdata))
+    return groups
+
+
+def generate_benchmark_maps() -> list:
+    """Generate the maps of GENERATED_MAP_SEEDS with MapGenerator."""
+    from .map_generator import MapGenerator
+
+    generated_maps = []
+    for size, seed in GENERATED_MAP_SEEDS:
+        map_dict = MapGenerator(size, seed=seed).create_map()
+        if map_dict is None:
+            raise RuntimeError(f"MapGenerator({size}) found no valid map with seed {seed}")
+        map_dict["name"] = f"Benchmark {size}x{size} (seed {seed})"
+        generated_maps.append(map_dict)
+    return generated_maps
+
+
+# -------------------------------------------------- #
+# ------------------- WORKLOADS -------------------- #
+# -------------------------------------------------- #
+
+def bench_is_linked(level: BenchmarkLevel) -> None:
+    superdata, map_data = level.superdata, level.map_data
+    for cell in level.cells:
+        for direction in DIRECTIONS:
+            is_linked(map_data, cell, direction, False, superdata)
+            is_linked(map_data, cell, direction, True, superdata)
+
+
+def bench_enemy_steps(level: BenchmarkLevel) -> list:
+    superdata, map_data = level.superdata, level.map_data
+    moves = []
+    for cell in level.cells:
+        moves.append((
+            generate_next_zombie_positions(map_data, level.zombies, cell, False, superdata),
+            generate_next_scorpion_positions(map_data, level.scorpions, cell, False, superdata),
+        ))
+    return moves
+
+
+def prepare_check_same_pos(level: BenchmarkLevel):
+    moves = bench_enemy_steps(level)
+    superdata = level.superdata
+
+    def bench_check_same_pos() -> None:
+        for zombies, scorpions in moves:
+            check_same_pos(zombies, scorpions, superdata)
+    return bench_check_same_pos
+
+
+def bench_generate_graph(level: BenchmarkLevel) -> None:
+    generate_graph(level.superdata, gate_opened=False)
+    generate_graph(level.superdata, gate_opened=True)
+
+
+def prepare_turn_step(level: BenchmarkLevel):
+    rules = LevelRules(level.superdata, level.winning_position, level.goal_direction)
+    states = [rules.initial_state(cell, level.zombies, level.scorpions) for cell in level.cells]
+
+    def bench_turn_step() -> None:
+        for state in states:
+            for direction in DIRECTIONS:
+                rules.step(state, direction)
+    return bench_turn_step
+
+
+def bench_shortest_path(level: BenchmarkLevel) -> list:
+    return Shortest_Path(
+        level.superdata, level.player_start, level.winning_position,
+        level.zombies, level.scorpions, algorithm=SEARCH_ASTAR,
+    )
+
+
+# name -> function(level) returning the callable to time
+WORKLOADS = {
+    "is_linked": lambda level: lambda: bench_is_linked(level),
+    "enemy_steps": lambda level: lambda: bench_enemy_steps(level),
+    "check_same_pos": prepare_check_same_pos,
+    "generate_graph": lambda level: lambda: bench_generate_graph(level),
+    "turn_step": prepare_turn_step,
+    "shortest_path": lambda level: lambda: bench_shortest_path(level),
+}
+
+
+def time_workload(workload, levels: list, repeat: int) -> float:
+    """
+    Sum over 'levels' of the time of one run (seconds).
+
+    Fast workloads are looped until a timed run lasts MIN_RUN_TIME, so timer
+    noise stays small; the fastest of 'repeat' timed runs counts.
+    """
+    total = 0.0
+    for level in levels:
+        run = WORKLOADS[workload](level)
+
+        number = 1
+        while True:
+            start_time = time.perf_counter()
+            for _ in range(number):
+                run()
+            if time.perf_counter() - start_time >= MIN_RUN_TIME:
+                break
+            number *= 2
+
+        best = None
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            for _ in range(number):
+                run()
+            elapsed = (time.perf_counter() - start_time) / number
+            if best is None or elapsed < best:
+                best = elapsed
+        total += best
+    return total
+
+
+def run_benchmarks(workloads: list = None, repeat: int = DEFAULT_REPEAT) -> dict:
+    """Return {workload: {group: seconds}} for 'workloads' (default: all)."""
+    groups = load_benchmark_levels()
+    results = {}
+    for workload in workloads or WORKLOADS:
+        results[workload] = {
+            group: round(time_workload(workload, levels, repeat), 6) for group, levels in groups.items()
+        }
+    return results
+
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """
+    Rows (workload, group, seconds, baseline seconds or None, ratio or None,
+    regressed) of every result. A result regressed when it is slower than
+    baseline * (1 + tolerance).
+    """
+    rows = []
+    for workload, group_times in results.items():
+        for group, seconds in group_times.items():
+            reference = baseline.get(workload, {}).get(group)
+            ratio = seconds / reference if reference else None
+            rows.append((workload, group, seconds, reference, ratio, ratio is not None and ratio > 1 + tolerance))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the rules engine and the solver.")
+    parser.add_argument("workloads", nargs="*", help=f"workloads to run (default: all of {', '.join(WORKLOADS)})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs per map, the fastest counts")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown against the baseline (0.5 = 50%%)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"store the results in {os.path.basename(BASELINE_FILE)}")
+    parser.add_argument("--generate-maps", action="store_true", help=f"rebuild {os.path.basename(BENCHMARK_MAPS_FILE)} first")
+    args = parser.parse_args()
+
+    unknown = [workload for workload in args.workloads if workload not in WORKLOADS]
+    if unknown:
+        parser.error(f"no such workload: {unknown}")
+
+    if args.generate_maps:
+        with open(BENCHMARK_MAPS_FILE, "w") as f:
+            json.dump(generate_benchmark_maps(), f, indent=2)
+
+    results = run_benchmarks(args.workloads or None, args.repeat)
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f).get("results", {})
+    elif not args.save_baseline:
+        print(f"No baseline yet, run with --save-baseline to create {os.path.basename(BASELINE_FILE)}",
+              file=sys.stderr)
+
+    rows = compare_with_baseline(results, baseline, args.tolerance)
+    print(f"{'workload':<16}{'maps':<18}{'seconds':>10}{'baseline':>10}{'ratio':>8}")
+    for workload, group, seconds, reference, ratio, regressed in rows:
+        print(
+            f"{workload:<16}{group:<18}{seconds:>10.4f}"
+            f"{reference if reference is not None else '-':>10}"
+            f"{f'{ratio:.2f}' if ratio is not None else '-':>8}"
+            f"{'  SLOWER' if regressed else ''}"
+        )
+
+    if args.save_baseline:
+        # Keep the workloads that were not run this time
+        for workload, group_times in results.items():
+            baseline[workload] = group_times
+        with open(BASELINE_FILE, "w") as f:
+            json.dump({"python": platform.python_version(), "repeat": args.repeat, "results": baseline}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline saved to {BASELINE_FILE}", file=sys.stderr)
+    elif any(row[5] for row in rows):
+        sys.exit(1)
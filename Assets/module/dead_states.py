@@ -0,0 +1,186 @@
+"""
+Dead-state pruning for the hint solver.
+
+An enemy only reacts to the player, the walls and the gate, never to the
+other enemies. So as long as nothing can remove an enemy from the board, the
+player has to beat that enemy alone: if the player cannot reach the goal
+against it with no other enemy around, the full state is lost too.
+
+An enemy can be removed by a trap, by an enemy of the other kind (zombie +
+scorpion annihilate) or by a stronger enemy of its own kind landing on it
+(check_same_pos). Traps are part of the single-enemy game below. The other
+two cannot happen when the state holds one kind of enemy only and the enemy
+has the highest type of them (an equal type merging in continues on the same
+cell with the same rules). Those enemies are "pinned".
+
+DangerTable solves the single-enemy game of one enemy kind and type for a
+goal: for every (gate, player cell, enemy cell) the fewest turns the player
+needs to win against that enemy alone (0 = on the goal), DOOMED if it cannot. DeadStateFilter
+drops a successor before it is enqueued when one pinned enemy says DOOMED.
+
+Only states with no winning continuation are dropped and every state on a
+winning line keeps its parent, so BFS and A* return exactly the same path.
+"""
+
+from array import array
+from collections import deque
+
+from .game_algorithms import CompiledBoard
+from .rules import generate_next_zombie_positions, generate_next_scorpion_positions
+from .movement_kernel import advance_enemies, ZOMBIE_STEPS, SCORPION_STEPS
+
+# Turns stored for (player, enemy) cells from which the player cannot win
+DOOMED = 0xFFFF
+
+ZOMBIE = "zombie"
+SCORPION = "scorpion"
+
+
+class DangerTable:
+    """
+    Solved single-enemy game of one enemy kind / type and goal.
+
+    Index of a state: (gate * cell_count + player cell) * (cell_count + 1) + enemy cell,
+    enemy cell cell_count meaning the enemy died in a trap.
+    """
+
+    def __init__(self, board: CompiledBoard, goal: tuple, kind: str, enemy_type: int) -> None:
+        self.kind = kind
+        self.enemy_type = enemy_type
+        self.cell_count = board.width * board.height
+        self.turns = self._solve(board, goal)
+
+    def escape_turns(self, player: tuple, enemy: tuple, gate_opened: bool, board: CompiledBoard) -> int:
+        """Fewest turns to win from this state against the enemy alone, DOOMED if none."""
+        cell_count = self.cell_count
+        index = (int(gate_opened) * cell_count + board.encode_cell(player)) * (cell_count + 1) + board.encode_cell(enemy)
+        return self.turns[index]
+
+    def _enemy_moves(self, board: CompiledBoard) -> list:
+        """
+        Next enemy cell for every (gate, player cell, enemy cell), flattened
+        the same way as the table (a dead enemy stays dead).
+        """
+        cell_count = self.cell_count
+        dead = cell_count
+        steps = ZOMBIE_STEPS if self.kind == ZOMBIE else SCORPION_STEPS
+        cells = [board.decode_cell(cell) for cell in range(cell_count)]
+
+        if board.wall_masks is not None:
+            rows = [(gate, player, enemy) for gate in (0, 1) for player in cells for enemy in cells]
+            new_x, new_y = advance_enemies(
+                board.wall_masks,
+                [enemy[0] for _, _, enemy in rows],
+                [enemy[1] for _, _, enemy in rows],
+                [self.enemy_type] * len(rows),
+                [player[0] for _, player, _ in rows],
+                [player[1] for _, player, _ in rows],
+                [gate for gate, _, _ in rows],
+                [steps] * len(rows),
+            )
+            new_cells = iter(zip(new_x.tolist(), new_y.tolist()))
+        else:
+            generate = generate_next_zombie_positions if self.kind == ZOMBIE else generate_next_scorpion_positions
+            new_cells = (
+                generate(board.map_data, [enemy + (self.enemy_type,)], player, bool(gate), board.superdata)[0][:2]
+                for gate in (0, 1) for player in cells for enemy in cells
+            )
+
+        trap_cells = board.trap_cells
+        moves = array("H")
+        for _ in range(2 * cell_count):
+            for _ in range(cell_count):
+                new_cell = next(new_cells)
+                moves.append(dead if new_cell in trap_cells else board.encode_cell(new_cell))
+            moves.append(dead)
+        return moves
+
+    def _solve(self, board: CompiledBoard, goal: tuple) -> array:
+        """Backwards BFS from every state with the player on the goal and not caught."""
+        cell_count = self.cell_count
+        stride = cell_count + 1
+        enemy_moves = self._enemy_moves(board)
+        goal_cell = board.encode_cell(goal)
+
+        # (gate, player cell) -> every (gate, player cell) one player move away before it
+        previous_players = [[] for _ in range(2 * cell_count)]
+        for gate in (0, 1):
+            for player_cell in range(cell_count):
+                player = board.decode_cell(player_cell)
+                for neighbor in board.get_moves(player, bool(gate)):
+                    new_gate = 1 - gate if board.key_pos and neighbor == board.key_pos else gate
+                    previous_players[new_gate * cell_count + board.encode_cell(neighbor)].append((gate, player_cell))
+
+        # (gate, player cell) -> {enemy cell after the turn: enemy cells before it}, built when needed
+        previous_enemies = {}
+
+        def enemies_before(player_slot: int) -> dict:
+            if player_slot not in previous_enemies:
+                before = {}
+                offset = player_slot * stride
+                for enemy_cell in range(stride):
+                    before.setdefault(enemy_moves[offset + enemy_cell], []).append(enemy_cell)
+                previous_enemies[player_slot] = before
+            return previous_enemies[player_slot]
+
+        turns = array("H", [DOOMED]) * (2 * cell_count * stride)
+        queue = deque()
+
+        # Won: the player stands on the goal and the enemy is not there
+        for gate in (0, 1):
+            for enemy_cell in range(stride):
+                if enemy_cell != goal_cell:
+                    index = (gate * cell_count + goal_cell) * stride + enemy_cell
+                    turns[index] = 0
+                    queue.append(index)
+
+        while queue:
+            index = queue.popleft()
+            player_slot, enemy_cell = divmod(index, stride)
+            next_turns = turns[index] + 1
+            for enemy_before in enemies_before(player_slot).get(enemy_cell, ()):
+                for gate, player_cell in previous_players[player_slot]:
+                    # Enemy on the player = already caught, the game is over there
+                    if enemy_before == player_cell:
+                        continue
+                    previous = (gate * cell_count + player_cell) * stride + enemy_before
+                    if turns[previous] == DOOMED:
+                        turns[previous] = next_turns
+                        queue.append(previous)
+
+        return turns
+
+
+class DeadStateFilter:
+    """
+    Drops solver states that are lost against one pinned enemy (see module doc).
+    DangerTables are built on first use and kept on the board per goal.
+    """
+
+    def __init__(self, board: CompiledBoard, goal: tuple) -> None:
+        self.board = board
+        self.goal = goal
+        self.__tables = board.danger_tables.setdefault(goal, {})
+
+    def table(self, kind: str, enemy_type: int) -> DangerTable:
+        key = (kind, enemy_type)
+        if key not in self.__tables:
+            self.__tables[key] = DangerTable(self.board, self.goal, kind, enemy_type)
+        return self.__tables[key]
+
+    def is_doomed(self, position: tuple, gate_opened: bool, zombies: list, scorpions: list) -> bool:
+        """True if the player cannot win from this state any more."""
+        # Zombies and scorpions can kill each other, no enemy is pinned
+        if zombies and scorpions:
+            return False
+        enemies = zombies or scorpions
+        if not enemies:
+            return False
+
+        kind = ZOMBIE if zombies else SCORPION
+        strongest = max(enemy[2] for enemy in enemies)
+        table = self.table(kind, strongest)
+        for enemy in enemies:
+            if enemy[2] == strongest and table.escape_turns(position, enemy, gate_opened, self.board) == DOOMED:
+                return True
+        return False
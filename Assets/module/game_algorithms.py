@@ -1,47 +1,38 @@
+import time
+import heapq
+import threading
 from collections import deque
 
-from click import Tuple
-from . utils import is_linked
+from .rules import (
+    get_wall_board, is_linked, get_face_direction, get_trap_cells, is_trap, is_lose,
+    normalize_position, toggle_gate, resolve_turn, check_same_pos,
+)
+from .movement_kernel import build_wall_masks, advance_enemies, ZOMBIE_STEPS, SCORPION_STEPS
+from .search_stats import SearchStats
 UP = 'UP'
 DOWN = 'DOWN'
 LEFT = 'LEFT'
 RIGHT = 'RIGHT'
 
+# Search modes of Shortest_Path
+SEARCH_BFS = 'bfs'
+SEARCH_ASTAR = 'astar'
+SEARCH_PARALLEL_BFS = 'parallel_bfs'
+SEARCH_IDA = 'ida'
 
-def is_trap(superdata: list, position: tuple) -> bool:
-    """
-    Check if a position contains a trap.  
-    """
-    x, y = position[0], position[1]
-    map_data = superdata["map_data"]
-    # Check boundaries
-    if x < 1 or y < 1 or y > len(map_data) or x > len(map_data[0]):
-        return False
-    
-    # Check if cell is a trap (adjust 'X' based on your map notation)
-    return [x,y] in superdata["trap_pos"]
+# How many expanded states between two checks of a cancel_event
+CANCEL_CHECK_INTERVAL = 256
+
+# How many queued states are expanded together (one vectorized enemy move)
+FRONTIER_BATCH_SIZE = 1024
+
+# Transposition table slots of SEARCH_IDA when no memory_limit is given
+IDA_TABLE_SIZE = 1 << 16
+# Spreads packed states over the table (their low bits barely change)
+IDA_SLOT_MULTIPLIER = 0x9E3779B97F4A7C15
+# Neighbouring slots a state may be stored in
+IDA_TABLE_WAYS = 4
 
-def is_lose(superdata: list, player_position: tuple, zombie_positions: list = [], scorpion_positions: list = []) -> bool:
-    """
-    Check if player is caught by zombie or scorpion.  
-    """
-    # Check traps
-    if is_trap(superdata, player_position):
-        return True
-    
-    # Check zombies
-    if zombie_positions:
-        for zombie_info in zombie_positions:
-            if player_position == (zombie_info[0], zombie_info[1]):
-                return True
-    
-    # Check scorpions
-    if scorpion_positions:
-        for scorpion_info in scorpion_positions:  
-            if player_position == (scorpion_info[0], scorpion_info[1]):
-                return True
-    
-    return False
 
 def generate_graph(superdata: list, gate_opened: bool = False) -> dict:
     """
@@ -92,6 +83,196 @@ def generate_graph(superdata: list, gate_opened: bool = False) -> dict:
     return graph
 
 
+class CompiledBoard:
+    """
+    Static view of one level, built once and reused by every hint search.
+
+    The board graph only depends on the gate state, so both variants are
+    generated up front instead of calling generate_graph() per BFS state.
+
+    Attributes:
+        superdata: Original level dictionary
+        map_data: Wall matrix of the level
+        key_pos: Key position (x, y) or None
+        gate_pos: Gate position (x, y) or None
+        adjacency: (graph with gate closed, graph with gate opened)
+        moves: Same as adjacency but each entry also contains the "wait" move
+               when a wall, the border or the gate blocks one direction (a
+               move into it is how the player waits; a trap does not count,
+               stepping on it loses)
+        wall_masks: Enemy wall masks for movement_kernel (None without NumPy)
+        trap_cells: Trap positions as a frozenset of (x, y)
+        danger_tables: Single-enemy games solved for dead-state pruning,
+                       {goal: {(kind, type): DangerTable}} (see dead_states.py)
+    """
+
+    def __init__(self, superdata: dict) -> None:
+        self.superdata = superdata
+        self.map_data = superdata["map_data"]
+        self.key_pos = normalize_position(superdata.get("key_pos", []))
+        self.gate_pos = normalize_position(superdata.get("gate_pos", []))
+        self.trap_cells = get_trap_cells(superdata)
+
+        self.adjacency = (
+            generate_graph(superdata, gate_opened=False),
+            generate_graph(superdata, gate_opened=True),
+        )
+        self.moves = tuple(
+            self._build_moves(graph, gate_opened) for gate_opened, graph in enumerate(self.adjacency)
+        )
+        self.wall_masks = build_wall_masks(superdata)
+        self._distance_cache = {}
+        self.danger_tables = {}
+
+        # State encoding: every cell is a small int, an enemy is (cell, type)
+        # packed in entity_bits, a whole state is one int (see encode_state)
+        self.width = len(self.map_data[0])
+        self.height = len(self.map_data)
+        self.cell_bits = max(1, (self.width * self.height).bit_length())
+        self.entity_bits = self.cell_bits + 2
+        self.entity_mask = (1 << self.entity_bits) - 1
+        self.cell_mask = (1 << self.cell_bits) - 1
+
+    def encode_cell(self, position: tuple) -> int:
+        """Pack a 1-indexed (x, y) position into a cell number."""
+        return (position[1] - 1) * self.width + (position[0] - 1)
+
+    def decode_cell(self, cell: int) -> tuple:
+        """Unpack a cell number into a 1-indexed (x, y) position."""
+        return (cell % self.width + 1, cell // self.width + 1)
+
+    def encode_enemies(self, enemies: list) -> list:
+        """
+        Pack enemies [(x, y, type), ...] into sorted non-zero ints.
+
+        Enemies of one kind are interchangeable: each moves on its own, and
+        check_same_pos only looks at the order to break a tie between equal
+        enemies on the same cell. Sorting makes every ordering of the same
+        multiset one state, for the visited set and for every cache keyed by
+        packed states (SolutionCache, MoveTable, parallel_search shards).
+        """
+        cell_bits = self.cell_bits
+        return sorted(
+            ((enemy[2] << cell_bits) | self.encode_cell(enemy)) + 1
+            for enemy in enemies
+        )
+
+    def encode_state(self, position: tuple, gate_opened: bool, zombies: list, scorpions: list) -> int:
+        """
+        Pack a full solver state into a single int.
+
+        Layout (lowest bits first, entity_bits per field):
+            [player cell | gate] [zombie]... [0] [scorpion]...
+        Enemy codes are never 0, so the 0 field separates both groups.
+        """
+        bits = self.entity_bits
+        key = 0
+        shift = 0
+        for code in self.encode_enemies(zombies) + [0] + self.encode_enemies(scorpions):
+            shift += bits
+            key |= code << shift
+        return key | (self.encode_cell(position) << 1) | int(gate_opened)
+
+    def decode_position(self, key: int) -> tuple:
+        """Return only the player position stored in a state key."""
+        return self.decode_cell((key & self.entity_mask) >> 1)
+
+    def decode_state(self, key: int) -> tuple:
+        """Inverse of encode_state: (position, gate_opened, zombies, scorpions)."""
+        bits = self.entity_bits
+        mask = self.entity_mask
+        cell_bits = self.cell_bits
+        cell_mask = self.cell_mask
+
+        position = self.decode_cell((key & mask) >> 1)
+        gate_opened = bool(key & 1)
+        key >>= bits
+
+        zombies = []
+        while key & mask:
+            code = (key & mask) - 1
+            zombies.append(self.decode_cell(code & cell_mask) + (code >> cell_bits,))
+            key >>= bits
+        key >>= bits
+
+        scorpions = []
+        while key:
+            code = (key & mask) - 1
+            scorpions.append(self.decode_cell(code & cell_mask) + (code >> cell_bits,))
+            key >>= bits
+
+        return position, gate_opened, zombies, scorpions
+
+    def _build_moves(self, graph: dict, gate_opened: bool) -> dict:
+        """Attach the 'wait' move to every cell with a blocked direction."""
+        wall_board = get_wall_board(self.map_data, self.superdata.get("gate_pos"))
+        moves = {}
+        for position, neighbors in graph.items():
+            if position in self.trap_cells:
+                moves[position] = ()
+            elif not all(wall_board.can_move(position[0], position[1], direction, gate_opened)
+                         for direction in (UP, DOWN, LEFT, RIGHT)):
+                moves[position] = (position,) + tuple(neighbors)
+            else:
+                moves[position] = tuple(neighbors)
+        return moves
+
+    def get_moves(self, position: tuple, gate_opened: bool) -> tuple:
+        """Return every cell the player can end the turn on (including waiting)."""
+        return self.moves[gate_opened].get(position, (position,))
+
+    def distances_to(self, goal: tuple) -> dict:
+        """
+        True walking distance from every cell to 'goal', ignoring enemies.
+
+        Uses the gate-opened graph (it contains every edge of the closed one),
+        so the value never overestimates the number of turns needed and can be
+        used as an admissible A* heuristic. Unreachable cells are missing.
+        Results are cached per goal.
+        """
+        if goal not in self._distance_cache:
+            graph = self.adjacency[True]
+            reverse_graph = {position: [] for position in graph}
+            for position, neighbors in graph.items():
+                for neighbor in neighbors:
+                    reverse_graph.setdefault(neighbor, []).append(position)
+
+            distances = {goal: 0}
+            queue = deque([goal])
+            while queue:
+                position = queue.popleft()
+                for previous in reverse_graph.get(position, []):
+                    if previous not in distances:
+                        distances[previous] = distances[position] + 1
+                        queue.append(previous)
+            self._distance_cache[goal] = distances
+        return self._distance_cache[goal]
+
+
+def path_directions(path: list, superdata: dict, gate_opened: bool = False) -> list:
+    """
+    Turn a Shortest_Path result into the direction to press for every turn.
+
+    A wait (same cell twice) becomes a direction blocked by a wall or the
+    gate, like the hint arrow. The gate state is followed along the path
+    (every turn ending on the key toggles it).
+
+    Args:
+        path: [(x1,y1), (x2,y2), ..., goal] as returned by Shortest_Path
+        superdata: Dictionary containing map_data, gate_pos, key_pos, trap_pos
+        gate_opened: Gate state at path[0]
+
+    Returns:
+        list: One of UP / DOWN / LEFT / RIGHT per turn (len(path) - 1 items)
+    """
+    key_pos = normalize_position(superdata.get("key_pos", []))
+    directions = []
+    for current, following in zip(path, path[1:]):
+        directions.append(get_face_direction(current, following, superdata["map_data"], gate_opened, superdata))
+        gate_opened = toggle_gate(key_pos, following, gate_opened)
+    return directions
+
+
 def BFS(graph: dict, start: tuple) -> set:
     visited = set()
     queue = deque([start])
@@ -118,715 +299,575 @@ def DFS(graph: dict, start: tuple) -> set:
                 stack.append(neighbor)
     return visited
 
-def try_move(game_map: list, current_pos: tuple, direction: str, delta_x: int, delta_y:  int, 
-             gate_opened: bool = False, superdata: dict = None) -> tuple:
+
+def rebuild_path(board: CompiledBoard, parents: dict, state: int, solution_cache=None) -> list:
     """
-    Attempts to move in a specific direction considering walls and gates.
-    Returns the new coordinate if linked, otherwise returns the current coordinate.
-    
-    Args:
-        game_map: Map data matrix
-        current_pos: Current position (x, y) in 1-indexed coordinates
-        direction: Direction constant (UP/DOWN/LEFT/RIGHT)
-        delta_x: Change in x coordinate
-        delta_y: Change in y coordinate
-        gate_opened:  Whether gate is currently opened
-        superdata: Full map data including gate_pos, key_pos, trap_pos
+    Follow parent pointers from 'state' back to the initial state.
+    If a SolutionCache is given, every state on the path is stored in it
+    ('state' must then be the winning state).
     
     Returns:
-        tuple: New position if move is valid, otherwise current position
+        list: Player positions [(x1,y1), ..., position of 'state']
     """
-    if is_linked(game_map, current_pos, direction, gate_opened, superdata):
-        return (current_pos[0] + delta_x, current_pos[1] + delta_y)
-    return current_pos
+    states = []
+    while state is not None:
+        states.append(state)
+        state = parents[state]
+    states.reverse()
+    
+    path = [board.decode_position(state) for state in states]
+    if solution_cache is not None:
+        solution_cache.record(states, path)
+    return path
 
-def get_horizontal_direction(zombie_x: int, player_x: int) -> tuple:
+def generate_successors(board: CompiledBoard, position: tuple, gate_opened: bool,
+                        zombie_list: list, scorpion_list: list, stats: SearchStats = None) -> list:
     """
-    Determines the horizontal direction towards the player.
-    Returns:  (direction_constant, delta_x, delta_y)
+    Simulate one full turn for every move the player can make from a state.
+    
+    Args:
+        board: Precompiled board of the level
+        position: Player position (x, y)
+        gate_opened: Gate state before the player moves
+        zombie_list: List of (x, y, type)
+        scorpion_list: List of (x, y, intelligence_level)
+        stats: SearchStats to add graph_time / enemy_time to (optional)
+    
+    Returns:
+        list: [(new_position, new_gate_opened, new_zombies, new_scorpions), ...]
     """
-    if zombie_x > player_x:  
-        return LEFT, -1, 0  # Move Left
-    if zombie_x < player_x:  
-        return RIGHT, 1, 0  # Move Right
+    superdata = board.superdata
+    key_pos = board.key_pos
+    successors = []
+    
+    if stats is not None:
+        started = time.perf_counter()
+    
+    # "Wait" move is already included where a direction is blocked
+    moves = board.get_moves(position, gate_opened)
     
-    return None, 0, 0       # Same column
+    if stats is not None:
+        graph_done = time.perf_counter()
+        stats.graph_time += graph_done - started
+    
+    for neighbor in moves:
+        # Same turn as LevelRules.step: key toggle, enemy moves (they see the
+        # NEW gate state), collisions and trap deaths
+        new_gate_opened, new_zombie_positions, new_scorpion_positions, _ = resolve_turn(
+            superdata, neighbor, gate_opened, key_pos, zombie_list, scorpion_list, board.trap_cells
+        )
+        
+        successors.append((neighbor, new_gate_opened, new_zombie_positions, new_scorpion_positions))
+    
+    if stats is not None:
+        stats.enemy_time += time.perf_counter() - graph_done
+    
+    return successors
 
-def get_vertical_direction(zombie_y: int, player_y: int) -> tuple:
+def expand_frontier(board: CompiledBoard, frontier: list, stats: SearchStats = None) -> list:
     """
-    Determines the vertical direction towards the player.
-    Returns: (direction_constant, delta_x, delta_y)
+    generate_successors for many states at once.
+    
+    The enemy moves of every (state, player move) pair are computed in one
+    vectorized advance_enemies call. Without NumPy each state falls back to
+    generate_successors.
+    
+    Args:
+        board: Precompiled board of the level
+        frontier: Decoded states [(position, gate_opened, zombie_list, scorpion_list), ...]
+        stats: SearchStats to add graph_time / enemy_time to (optional)
+    
+    Returns:
+        list: Successors of each state, same format and order as generate_successors
     """
-    if zombie_y > player_y: 
-        return UP, 0, -1    # Move Up
-    if zombie_y < player_y: 
-        return DOWN, 0, 1   # Move Down
+    if board.wall_masks is None:
+        return [generate_successors(board, *state, stats=stats) for state in frontier]
     
-    return None, 0, 0       # Same row
-
-#==============================================================================
-#                         ZOMBIE MOVEMENT SYSTEM
-#==============================================================================
+    superdata = board.superdata
+    key_pos = board.key_pos
+    
+    if stats is not None:
+        started = time.perf_counter()
+    
+    frontier_moves = [board.get_moves(position, gate_opened) for position, gate_opened, _, _ in frontier]
+    
+    if stats is not None:
+        graph_done = time.perf_counter()
+        stats.graph_time += graph_done - started
+    
+    #──────────────────────────────────────────────────────────────────
+    #              GATHER ONE ROW PER (PLAYER MOVE, ENEMY)
+    #──────────────────────────────────────────────────────────────────
+    
+    moves = []
+    move_counts = []
+    enemy_x, enemy_y, enemy_types = [], [], []
+    player_x, player_y, gates, steps = [], [], [], []
+    
+    for (position, gate_opened, zombie_list, scorpion_list), state_moves in zip(frontier, frontier_moves):
+        move_counts.append(len(state_moves))
+        
+        for neighbor in state_moves:
+            # Key toggles the gate, enemies see the NEW gate state
+            new_gate_opened = toggle_gate(key_pos, neighbor, gate_opened)
+            moves.append((neighbor, new_gate_opened, zombie_list, scorpion_list))
+            
+            for enemies, enemy_steps in ((zombie_list, ZOMBIE_STEPS), (scorpion_list, SCORPION_STEPS)):
+                for enemy in enemies:
+                    enemy_x.append(enemy[0])
+                    enemy_y.append(enemy[1])
+                    enemy_types.append(enemy[2])
+                    player_x.append(neighbor[0])
+                    player_y.append(neighbor[1])
+                    gates.append(new_gate_opened)
+                    steps.append(enemy_steps)
+    
+    if enemy_x:
+        new_x, new_y = advance_enemies(board.wall_masks, enemy_x, enemy_y, enemy_types,
+                                       player_x, player_y, gates, steps)
+        new_x, new_y = new_x.tolist(), new_y.tolist()
+    
+    #──────────────────────────────────────────────────────────────────
+    #              SPLIT ROWS BACK INTO SUCCESSORS
+    #──────────────────────────────────────────────────────────────────
+    
+    results = []
+    move_index = 0
+    row = 0
+    for move_count in move_counts:
+        successors = []
+        for neighbor, new_gate_opened, zombie_list, scorpion_list in moves[move_index:move_index + move_count]:
+            new_zombie_positions = []
+            for zombie in zombie_list:
+                new_zombie_positions.append((new_x[row], new_y[row], zombie[2]))
+                row += 1
+            new_scorpion_positions = []
+            for scorpion in scorpion_list:
+                new_scorpion_positions.append((new_x[row], new_y[row], scorpion[2]))
+                row += 1
+            
+            # Handle enemy collisions and trap deaths
+            new_zombie_positions, new_scorpion_positions = check_same_pos(
+                new_zombie_positions,
+                new_scorpion_positions,
+                superdata,
+                board.trap_cells
+            )
+            successors.append((neighbor, new_gate_opened, new_zombie_positions, new_scorpion_positions))
+        results.append(successors)
+        move_index += move_count
+    
+    if stats is not None:
+        stats.enemy_time += time.perf_counter() - graph_done
+    
+    return results
 
-def generate_next_zombie_positions(
-    map_data: list = [], 
-    current_zombie_positions: list = [], 
-    current_player_position: tuple = (), 
-    gate_opened: bool = False, 
-    superdata: dict = None, 
-    show_list: bool = False
-) -> list:
+def a_star_search(board: CompiledBoard, initial_state: int, goal: tuple, max_iterations: int = 1000000,
+                  cancel_event: threading.Event = None, solution_cache=None,
+                  stats: SearchStats = None, prune_dead_states: bool = False,
+                  memory_limit: int = None) -> list:
     """
-    Generate next positions for all zombies considering walls, gates, and player position.
+    A* over the same state space as Shortest_Path.
+    
+    Cost of a state is the number of turns played, heuristic is the walking
+    distance from the player to goal ignoring enemies (board.distances_to).
+    The heuristic is consistent (one turn moves the player at most one cell),
+    so the first winning state popped from the heap is on a shortest path.
+    States whose player cell cannot reach goal at all are dropped.
     
     Args:
-        map_data: Map data matrix
-        current_zombie_positions:  List of zombie tuples [(x, y, type), ...]
-        current_player_position: Player position (x, y)
-        gate_opened: Current state of gate (True = open, False = closed)
-        superdata: Full map data including gate_pos, key_pos, trap_pos
-        show_list:  If True, return movement directions; if False, return positions
+        board: Precompiled board of the level
+        initial_state: Packed initial state (CompiledBoard.encode_state)
+        goal: Goal position (x, y)
+        max_iterations: Maximum number of expanded states
+        cancel_event: Search stops (returns []) once this event is set
+        solution_cache: SolutionCache filled with the found path (optional)
+        stats: SearchStats filled with counters and timings (optional)
+        prune_dead_states: Skip states lost against one enemy (dead_states.py)
+        memory_limit: Give up (return None) once more states are stored
     
     Returns:
-        List of next zombie positions or movement directions
-    
-    Zombie Types:
-        Type 0: Vertical priority, dumb (freezes if blocked vertically)
-        Type 1: Horizontal priority, dumb (freezes if blocked horizontally)
-        Type 2: Vertical priority, smart (tries horizontal if blocked vertically)
-        Type 3: Horizontal priority, smart (tries vertical if blocked horizontally)
+        list: Shortest path as [(x1,y1), (x2,y2), ..., goal] or [] if no path,
+              None if memory_limit was exceeded
     """
-
-    def generate_type_0(
-        map_data: list, 
-        current_zombie_position: tuple, 
-        current_player_position: tuple,
-        gate_opened: bool,
-        superdata: dict,
-        show_list: bool = False
-    ) -> tuple:
-        """
-        Type 0 Zombie:  Vertical Priority, Dumb AI
-        - Speed: 2 steps per turn
-        - Behavior: Prioritizes vertical movement (UP/DOWN)
-        - Weakness: Freezes if blocked vertically, won't try horizontal
-        """
-        zombie_pos = current_zombie_position
-        move_list = []
+    superdata = board.superdata
+    distances = board.distances_to(goal)
+    dead_states = None
+    if prune_dead_states:
+        from .dead_states import DeadStateFilter  # imports this module
+        dead_states = DeadStateFilter(board, goal)
+    
+    if stats is not None:
+        stats.start(SEARCH_ASTAR)
+    
+    start = board.decode_position(initial_state)
+    if start not in distances:
+        return stats.finish([]) if stats is not None else []
+    
+    # Heap entries: (turns + distance, -turns, insertion order, state)
+    # Deeper states first on ties, insertion order keeps it deterministic
+    best_turns = {initial_state: 0}
+    parents = {initial_state: None}
+    heap = [(distances[start], 0, 0, initial_state)]
+    pushed = 1
+    count_steps = 0
+    
+    while heap and count_steps < max_iterations:
+        if stats is not None:
+            stats.peak_queue_size = max(stats.peak_queue_size, len(heap))
         
-        # Determine initial direction
-        move_dir, dx, dy = get_vertical_direction(zombie_pos[1], current_player_position[1])
+        if memory_limit is not None and len(best_turns) > memory_limit:
+            return None
         
-        # Move up to 2 steps
-        for _ in range(2):
-            z_x, z_y = zombie_pos
-            p_x, p_y = current_player_position
-
-            # Stop if caught player
-            if zombie_pos == current_player_position:
-                break
-
-            new_pos = zombie_pos
-
-            # CASE 1: Vertical Alignment Needed (Priority)
-            if z_y != p_y: 
-                # Determine vertical direction
-                if z_y > p_y: 
-                    move_dir, dx, dy = UP, 0, -1
-                else:
-                    move_dir, dx, dy = DOWN, 0, 1
-                
-                # Attempt vertical move (gate affects this!)
-                new_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata)
-                if new_pos != zombie_pos and move_dir is not None: 
-                    move_list.append(move_dir)
-
-                # [DUMB AI] Freeze if blocked vertically
-                if new_pos == zombie_pos:
-                    break
-
-            # CASE 2: Same Row - Move Horizontally
-            else:
-                move_dir, dx, dy = get_horizontal_direction(z_x, p_x)
-                
-                if move_dir is not None: 
-                    new_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata)
-                    if new_pos != zombie_pos: 
-                        move_list.append(move_dir)
-
-            zombie_pos = new_pos
-
-        # Add idle animation if can't move
-        if move_list == [] and move_dir is not None:
-            move_list. append(move_dir)
-
-        return move_list if show_list else zombie_pos
+        _, negative_turns, _, current_state = heapq.heappop(heap)
+        turns = -negative_turns
         
-    def generate_type_1(
-        map_data: list,
-        current_zombie_position:  tuple,
-        current_player_position: tuple,
-        gate_opened: bool,
-        superdata: dict,
-        show_list: bool = False
-    ) -> tuple:
-        """
-        Type 1 Zombie: Horizontal Priority, Dumb AI
-        - Speed: 2 steps per turn
-        - Behavior:  Prioritizes horizontal movement (LEFT/RIGHT)
-        - Weakness:  Freezes if blocked horizontally, won't try vertical
-        """
-        zombie_pos = current_zombie_position
-        move_list = []
-
-        # Determine initial direction
-        move_dir, dx, dy = get_horizontal_direction(zombie_pos[0], current_player_position[0])
+        # Skip outdated heap entries (state was reached faster later)
+        if turns > best_turns[current_state]:
+            continue
+        count_steps += 1
         
-        # Move up to 2 steps
-        for _ in range(2):
-            z_x, z_y = zombie_pos
-            p_x, p_y = current_player_position
-
-            # Stop if caught player
-            if zombie_pos == current_player_position:
-                break
-
-            new_pos = zombie_pos
-
-            # CASE 1: Horizontal Alignment Needed (Priority)
-            if z_x != p_x: 
-                move_dir, dx, dy = get_horizontal_direction(z_x, p_x)
-                
-                # Attempt horizontal move
-                new_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata)
-                if new_pos != zombie_pos and move_dir is not None: 
-                    move_list.append(move_dir)
-                    
-                # [DUMB AI] Freeze if blocked horizontally
-                if new_pos == zombie_pos:
-                    break
-
-            # CASE 2: Same Column - Move Vertically
-            else:
-                move_dir, dx, dy = get_vertical_direction(z_y, p_y)
-                
-                if move_dir is not None: 
-                    new_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata)
-                    if new_pos != zombie_pos:
-                        move_list.append(move_dir)
-
-            zombie_pos = new_pos
-
-        # Add idle animation if can't move
-        if move_list == [] and move_dir is not None:
-            move_list.append(move_dir)
-
-        return move_list if show_list else zombie_pos
-    
-    def generate_type_2(
-        map_data: list,
-        current_zombie_position: tuple,
-        current_player_position: tuple,
-        gate_opened: bool,
-        superdata: dict,
-        show_list: bool = False
-    ) -> tuple:
-        """
-        Type 2 Zombie:  Vertical Priority, Smart AI
-        - Speed: 2 steps per turn
-        - Behavior: Prioritizes vertical movement (UP/DOWN)
-        - Intelligence: If blocked vertically, tries horizontal (sliding)
-        """
-        zombie_pos = current_zombie_position
-        move_list = []
-
-        # Determine initial direction
-        move_dir, dx, dy = get_vertical_direction(zombie_pos[1], current_player_position[1])
-
-        # Move up to 2 steps
-        for _ in range(2):
-            z_x, z_y = zombie_pos
-            p_x, p_y = current_player_position
-
-            if zombie_pos == current_player_position:
-                break
-
-            new_pos = zombie_pos
-
-            # CASE 1: Vertical Alignment Needed (Priority)
-            if z_y != p_y:
-                move_dir, dx, dy = get_vertical_direction(z_y, p_y)
+        if stats is not None:
+            stats.states_expanded = count_steps
+            stats.max_depth = max(stats.max_depth, turns)
+        
+        if cancel_event is not None and count_steps % CANCEL_CHECK_INTERVAL == 0 and cancel_event.is_set():
+            if stats is not None:
+                stats.cancelled = True
+                stats.peak_visited_size = len(best_turns)
+                stats.finish([])
+            return []
+        
+        current_pos, gate_opened, zombie_list, scorpion_list = board.decode_state(current_state)
+        
+        # Skip traps / player caught
+        if is_lose(superdata, current_pos, zombie_list, scorpion_list):
+            continue
+        
+        # Goal check on pop (not on push) keeps A* optimal
+        if current_pos == goal and current_state != initial_state:
+            path = rebuild_path(board, parents, current_state, solution_cache)
+            if stats is not None:
+                stats.peak_visited_size = len(best_turns)
+                stats.finish(path)
+            return path
+        
+        successors = generate_successors(board, current_pos, gate_opened, zombie_list, scorpion_list, stats)
+        if stats is not None:
+            dedupe_started = time.perf_counter()
+        
+        for neighbor, new_gate_opened, new_zombie_positions, new_scorpion_positions in successors:
+            
+            distance = distances.get(neighbor)
+            if distance is None:
+                continue
+            
+            new_state = board.encode_state(
+                neighbor,
+                new_gate_opened,
+                new_zombie_positions,
+                new_scorpion_positions
+            )
+            new_turns = turns + 1
+            
+            if new_turns < best_turns.get(new_state, float("inf")):
+                best_turns[new_state] = new_turns
+                parents[new_state] = current_state
                 
-                # Try vertical move first (gate may block this!)
-                attempt_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata)
-
-                if attempt_pos != zombie_pos:
-                    # Vertical move succeeded
-                    new_pos = attempt_pos
-                    if move_dir is not None: 
-                        move_list.append(move_dir)
-                else:
-                    # [SMART AI] Blocked vertically -> Try horizontal slide
-                    h_dir, h_dx, h_dy = get_horizontal_direction(z_x, p_x)
-                    
-                    if h_dir is not None:
-                        new_pos = try_move(map_data, zombie_pos, h_dir, h_dx, h_dy, gate_opened, superdata)
-                        if new_pos != zombie_pos:
-                            move_list.append(h_dir)
-
-            # CASE 2: Same Row - Move Horizontally
-            else: 
-                move_dir, dx, dy = get_horizontal_direction(z_x, p_x)
-                if move_dir is not None: 
-                    new_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata)
-                    if new_pos != zombie_pos:
-                        move_list.append(move_dir)
-
-            zombie_pos = new_pos
-
-        # Add idle animation if can't move
-        if move_list == [] and move_dir is not None:
-            move_list.append(move_dir)
-
-        return move_list if show_list else zombie_pos
-    
-    def generate_type_3(
-        map_data:  list,
-        current_zombie_position: tuple,
-        current_player_position: tuple,
-        gate_opened: bool,
-        superdata: dict,
-        show_list: bool = False
-    ) -> tuple:
-        """
-        Type 3 Zombie:  Horizontal Priority, Smart AI
-        - Speed: 2 steps per turn
-        - Behavior:  Prioritizes horizontal movement (LEFT/RIGHT)
-        - Intelligence: If blocked horizontally, tries vertical (sliding)
-        """
-        zombie_pos = current_zombie_position
-        move_list = []
-
-        # Determine initial direction
-        move_dir, dx, dy = get_horizontal_direction(zombie_pos[0], current_player_position[0])
-
-        # Move up to 2 steps
-        for _ in range(2):
-            z_x, z_y = zombie_pos
-            p_x, p_y = current_player_position
-
-            if zombie_pos == current_player_position:
-                break
-
-            new_pos = zombie_pos
-
-            # CASE 1: Horizontal Alignment Needed (Priority)
-            if z_x != p_x:
-                move_dir, dx, dy = get_horizontal_direction(z_x, p_x)
+                # Lost against a pinned enemy whatever the player does
+                if dead_states is not None and dead_states.is_doomed(
+                    neighbor, new_gate_opened, new_zombie_positions, new_scorpion_positions
+                ):
+                    if stats is not None:
+                        stats.states_pruned += 1
+                    continue
                 
-                # Try horizontal move first
-                attempt_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata)
-
-                if attempt_pos != zombie_pos:
-                    # Horizontal move succeeded
-                    new_pos = attempt_pos
-                    if move_dir is not None:
-                        move_list. append(move_dir)
-                else:
-                    # [SMART AI] Blocked horizontally -> Try vertical slide
-                    v_dir, v_dx, v_dy = get_vertical_direction(z_y, p_y)
-                    
-                    if v_dir is not None:
-                        new_pos = try_move(map_data, zombie_pos, v_dir, v_dx, v_dy, gate_opened, superdata)
-                        if new_pos != zombie_pos: 
-                            move_list.append(v_dir)
-
-            # CASE 2: Same Column - Move Vertically
-            else: 
-                move_dir, dx, dy = get_vertical_direction(z_y, p_y)
-                if move_dir is not None:
-                    new_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata)
-                    if new_pos != zombie_pos: 
-                        move_list.append(move_dir)
-
-            zombie_pos = new_pos
-
-        # Add idle animation if can't move
-        if move_list == [] and move_dir is not None: 
-            move_list.append(move_dir)
-
-        return move_list if show_list else zombie_pos
-
-    #--------------------------------------------------------#
-    #----- Main Logic:  Process All Zombies -----#
-    #--------------------------------------------------------#
-    
-    next_zombie_pos = []
-    move_list = []
-
-    for zombie_info in current_zombie_positions: 
-        current_zombie_position = (zombie_info[0], zombie_info[1])
-        zombie_type = zombie_info[2]
-
-        # Dispatch to appropriate AI type
-        if zombie_type == 0:
-            result = generate_type_0(map_data, current_zombie_position, current_player_position, gate_opened, superdata, show_list)
-        elif zombie_type == 1:
-            result = generate_type_1(map_data, current_zombie_position, current_player_position, gate_opened, superdata, show_list)
-        elif zombie_type == 2:
-            result = generate_type_2(map_data, current_zombie_position, current_player_position, gate_opened, superdata, show_list)
-        elif zombie_type == 3:
-            result = generate_type_3(map_data, current_zombie_position, current_player_position, gate_opened, superdata, show_list)
-        else:
-            continue  # Invalid zombie type
+                heapq.heappush(heap, (new_turns + distance, -new_turns, pushed, new_state))
+                pushed += 1
         
-        if show_list:
-            move_list += result
-        else:
-            next_zombie_pos. append(result + (zombie_type,))
+        if stats is not None:
+            stats.dedupe_time += time.perf_counter() - dedupe_started
     
-    return move_list if show_list else next_zombie_pos
-
-
-#==============================================================================
-#                        SCORPION MOVEMENT SYSTEM
-#==============================================================================
+    if stats is not None:
+        stats.hit_iteration_cap = bool(heap) and count_steps >= max_iterations
+        stats.peak_visited_size = len(best_turns)
+        stats.finish([])
+    return []
 
-def generate_next_scorpion_positions(
-    map_data: list = [], 
-    current_scorpion_positions: list = [], 
-    current_player_position: tuple = (),
-    gate_opened: bool = False,
-    superdata:  dict = None,
-    show_list: bool = False
-) -> list:
+def ida_star_search(board: CompiledBoard, initial_state: int, goal: tuple, max_iterations: int = 1000000,
+                    cancel_event: threading.Event = None, solution_cache=None,
+                    stats: SearchStats = None, prune_dead_states: bool = False,
+                    table_size: int = IDA_TABLE_SIZE) -> list:
     """
-    Generate next positions for all scorpions considering walls, gates, and player position. 
+    Low-memory search: iterative-deepening A* (IDA*) over the same state space.
+    
+    Depth-first search cut at turns + estimated turns left, repeated with the
+    smallest cut that was exceeded until a win is found, so the first win is
+    on a shortest path. Memory is the current DFS path plus a transposition
+    table of table_size slots, a state is kept in one of IDA_TABLE_WAYS
+    neighbouring slots picked by its hash:
+        slot -> (state, turns left at least, turns, iteration, expanded)
+    
+    "Turns left at least" starts as the walking distance to goal (the A*
+    heuristic) and is raised to the cheapest turns left found below a state
+    once its subtree is searched, so the next iteration does not walk into it
+    again just to find out it is too expensive. A state reached in more turns
+    than it was reached before is skipped (that is never a shortest path), and
+    so is one reached again in the same iteration with no fewer turns (already
+    searched with at least as much budget). A state already on the current
+    path is never entered again, whatever the table still holds.
+    
+    When all its slots are taken, an entry of an older iteration is replaced
+    first, then the one farthest from the start. A lost entry only costs
+    time (the subtree is searched again), never the path; stats.hit_memory_limit
+    tells that the table overflowed.
+    
+    States beyond the cut are kept in free slots too (not expanded yet). As
+    long as no entry was lost, the table knows every state seen: once all of
+    them are expanded without a win there is no way to win, and the search
+    returns [] right away instead of raising the cut up to max_iterations.
     
     Args:
-        map_data: Map data matrix
-        current_scorpion_positions: List of scorpion tuples [(x, y, intelligence_level), ...]
-        current_player_position: Player position (x, y)
-        gate_opened:  Current state of gate (True = open, False = closed)
-        superdata: Full map data including gate_pos, key_pos, trap_pos
-        show_list: If True, return movement directions; if False, return positions
+        board: Precompiled board of the level
+        initial_state: Packed initial state (CompiledBoard.encode_state)
+        goal: Goal position (x, y)
+        max_iterations: Maximum number of expanded states (all iterations)
+        cancel_event: Search stops (returns []) once this event is set
+        solution_cache: SolutionCache filled with the found path (optional)
+        stats: SearchStats filled with counters and timings (optional)
+        prune_dead_states: Skip states lost against one enemy (dead_states.py)
+        table_size: Number of transposition table slots (the memory ceiling)
     
     Returns:
-        List of next scorpion positions or movement directions
-    
-    Scorpion Types: 
-        Type 0: Vertical priority, dumb (freezes if blocked vertically)
-        Type 1: Horizontal priority, dumb (freezes if blocked horizontally)
-        Type 2: Vertical priority, smart (tries horizontal if blocked vertically)
-        Type 3: Horizontal priority, smart (tries vertical if blocked horizontally)
+        list: Shortest path as [(x1,y1), (x2,y2), ..., goal] or [] if no path
     """
+    superdata = board.superdata
+    distances = board.distances_to(goal)
+    dead_states = None
+    if prune_dead_states:
+        from .dead_states import DeadStateFilter  # imports this module
+        dead_states = DeadStateFilter(board, goal)
     
-    def generate_type_0(
-        map_data: list,
-        current_scorpion_position: tuple,
-        current_player_position: tuple,
-        gate_opened: bool,
-        superdata: dict,
-        show_list: bool = False
-    ) -> tuple:
-        """
-        Type 0 Scorpion: Vertical Priority, Dumb AI
-        - Speed: 1 step per turn
-        - Behavior: Prioritizes vertical movement (UP/DOWN)
-        - Weakness: Freezes if blocked vertically
-        """
-        scorpion_pos = current_scorpion_position
-        move_list = []
+    if stats is not None:
+        stats.start(SEARCH_IDA)
+    
+    start_pos, _, start_zombies, start_scorpions = board.decode_state(initial_state)
+    if start_pos not in distances or is_lose(superdata, start_pos, start_zombies, start_scorpions):
+        return stats.finish([]) if stats is not None else []
+    
+    table_size = max(table_size, IDA_TABLE_WAYS)
+    table = [None] * table_size
+    table_used = 0
+    unexpanded = 0  # entries beyond every cut so far
+    lost = False    # an entry was replaced or not stored
+    
+    def slots_of(state: int) -> list:
+        mixed = ((hash(state) * IDA_SLOT_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> 32
+        slot = (mixed * table_size) >> 32
+        return [(slot + way) % table_size for way in range(IDA_TABLE_WAYS)]
+    
+    def lookup(state: int):
+        for slot in slots_of(state):
+            entry = table[slot]
+            if entry is not None and entry[0] == state:
+                return entry
+        return None
+    
+    def remember(state: int, turns_left: float, turns: int, iteration: int, expanded: bool = True) -> None:
+        nonlocal table_used, unexpanded, lost
+        victim = None
+        for slot in slots_of(state):
+            entry = table[slot]
+            if entry is None or entry[0] == state:
+                victim = slot
+                break
+            # A state beyond the cut only takes a free slot
+            if not expanded:
+                continue
+            # Evict states beyond the cut first, then entries of older
+            # iterations, then the deepest one
+            if victim is None or (entry[4], entry[3], -entry[2]) < (table[victim][4], table[victim][3], -table[victim][2]):
+                victim = slot
+        if victim is None:
+            lost = True
+            return
+        entry = table[victim]
+        if entry is None:
+            table_used += 1
+        elif entry[0] != state:
+            if entry[3] == iteration and entry[2] < turns:
+                lost = True
+                return
+            lost = True
+            if not entry[4]:
+                unexpanded -= 1
+        elif not entry[4]:
+            unexpanded -= 1
+        if not expanded:
+            unexpanded += 1
+        table[victim] = (state, turns_left, turns, iteration, expanded)
+    
+    unsolvable = float("inf")
+    bound = distances[start_pos]
+    count_steps = 0
+    iteration = 0
+    
+    while count_steps < max_iterations:
+        iteration += 1
+        next_bound = unsolvable
         
-        move_dir, dx, dy = get_vertical_direction(scorpion_pos[1], current_player_position[1])
-
-        s_x, s_y = scorpion_pos
-        p_x, p_y = current_player_position
-
-        if scorpion_pos == current_player_position:
-            return move_list if show_list else scorpion_pos
-
-        new_pos = scorpion_pos
-
-        # CASE 1: Vertical Alignment Needed
-        if s_y != p_y:
-            if s_y > p_y: 
-                move_dir, dx, dy = UP, 0, -1
-            else:
-                move_dir, dx, dy = DOWN, 0, 1
-            
-            new_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata)
-            if new_pos != scorpion_pos and move_dir is not None: 
-                move_list.append(move_dir)
-
-        # CASE 2: Same Row (Horizontal Alignment)
-        else:
-            move_dir, dx, dy = get_horizontal_direction(s_x, p_x)
-            
-            if move_dir is not None:
-                new_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata)
-                if new_pos != scorpion_pos:
-                    move_list. append(move_dir)
-
-        if move_list == [] and move_dir is not None:
-            move_list.append(move_dir)
-
-        return move_list if show_list else new_pos
+        #──────────────────────────────────────────────────────────────────
+        #              DEPTH-FIRST SEARCH UP TO 'bound'
+        #──────────────────────────────────────────────────────────────────
         
-    def generate_type_1(
-        map_data: list,
-        current_scorpion_position: tuple,
-        current_player_position: tuple,
-        gate_opened: bool,
-        superdata: dict,
-        show_list: bool = False
-    ) -> tuple:
-        """
-        Type 1 Scorpion: Horizontal Priority, Dumb AI
-        - Speed:  1 step per turn
-        - Behavior: Prioritizes horizontal movement (LEFT/RIGHT)
-        - Weakness: Freezes if blocked horizontally
-        """
-        scorpion_pos = current_scorpion_position
-        move_list = []
+        # Frame per state on the current path: [state, successors still to
+        # try (None until expanded), cheapest turns left seen below it,
+        # turns left estimate it was entered with]
+        stack = [[initial_state, None, unsolvable, bound]]
+        on_path = {initial_state: stack[0]}
         
-        move_dir, dx, dy = get_horizontal_direction(scorpion_pos[0], current_player_position[0])
-
-        s_x, s_y = scorpion_pos
-        p_x, p_y = current_player_position
-
-        if scorpion_pos == current_player_position:
-            return move_list if show_list else scorpion_pos
-
-        new_pos = scorpion_pos
-
-        # CASE 1: Horizontal Alignment Needed (Priority)
-        if s_x != p_x:
-            move_dir, dx, dy = get_horizontal_direction(s_x, p_x)
+        while stack:
+            frame = stack[-1]
+            depth = len(stack) - 1
             
-            new_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata)
-            if new_pos != scorpion_pos and move_dir is not None: 
-                move_list.append(move_dir)
-
-        # CASE 2: Same Column (Vertical Alignment)
-        else:
-            move_dir, dx, dy = get_vertical_direction(s_y, p_y)
+            if frame[1] is None:
+                if count_steps >= max_iterations:
+                    break
+                count_steps += 1
+                
+                if cancel_event is not None and count_steps % CANCEL_CHECK_INTERVAL == 0 and cancel_event.is_set():
+                    if stats is not None:
+                        stats.cancelled = True
+                        stats.states_expanded = count_steps
+                        stats.peak_visited_size = table_used
+                        stats.hit_memory_limit = lost
+                        stats.finish([])
+                    return []
+                
+                current_pos, gate_opened, zombie_list, scorpion_list = board.decode_state(frame[0])
+                successors = []
+                for neighbor, new_gate_opened, new_zombie_positions, new_scorpion_positions in \
+                        generate_successors(board, current_pos, gate_opened, zombie_list, scorpion_list, stats):
+                    
+                    distance = distances.get(neighbor)
+                    if distance is None:
+                        continue
+                    if is_lose(superdata, neighbor, new_zombie_positions, new_scorpion_positions):
+                        continue
+                    
+                    new_state = board.encode_state(
+                        neighbor,
+                        new_gate_opened,
+                        new_zombie_positions,
+                        new_scorpion_positions
+                    )
+                    
+                    # Win within the cut = shortest path
+                    if neighbor == goal:
+                        states = [path_frame[0] for path_frame in stack] + [new_state]
+                        path = [board.decode_position(state) for state in states]
+                        if solution_cache is not None:
+                            solution_cache.record(states, path)
+                        if stats is not None:
+                            stats.states_expanded = count_steps
+                            stats.max_depth = len(path) - 1
+                            stats.peak_visited_size = table_used
+                            stats.hit_memory_limit = lost
+                            stats.finish(path)
+                        return path
+                    
+                    if dead_states is not None and dead_states.is_doomed(
+                        neighbor, new_gate_opened, new_zombie_positions, new_scorpion_positions
+                    ):
+                        if stats is not None:
+                            stats.states_pruned += 1
+                        continue
+                    
+                    successors.append((distance, new_state))
+                
+                # Closest to goal first, move order on ties (popped from the end)
+                successors.reverse()
+                successors.sort(key=lambda child: child[0], reverse=True)
+                frame[1] = successors
+                
+                if stats is not None:
+                    stats.peak_queue_size = max(stats.peak_queue_size, len(stack))
             
-            if move_dir is not None:
-                new_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata)
-                if new_pos != scorpion_pos:
-                    move_list.append(move_dir)
-
-        if move_list == [] and move_dir is not None: 
-            move_list.append(move_dir)
-
-        return move_list if show_list else new_pos
-    
-    def generate_type_2(
-        map_data: list,
-        current_scorpion_position: tuple,
-        current_player_position: tuple,
-        gate_opened: bool,
-        superdata:  dict,
-        show_list:  bool = False
-    ) -> tuple:
-        """
-        Type 2 Scorpion:  Vertical Priority, Smart AI
-        - Speed: 1 step per turn
-        - Behavior: Prioritizes vertical movement (UP/DOWN)
-        - Intelligence: If blocked vertically, tries horizontal
-        """
-        scorpion_pos = current_scorpion_position
-        move_list = []
-        
-        move_dir, dx, dy = get_vertical_direction(scorpion_pos[1], current_player_position[1])
-
-        s_x, s_y = scorpion_pos
-        p_x, p_y = current_player_position
-
-        if scorpion_pos == current_player_position: 
-            return move_list if show_list else scorpion_pos
-
-        new_pos = scorpion_pos
-
-        # CASE 1: Vertical Alignment Needed (Priority)
-        if s_y != p_y:
-            move_dir, dx, dy = get_vertical_direction(s_y, p_y)
+            #──────────────────────────────────────────────────────────────
+            #              SUBTREE DONE: REMEMBER ITS TURNS LEFT
+            #──────────────────────────────────────────────────────────────
             
-            attempt_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata)
-
-            if attempt_pos != scorpion_pos:
-                new_pos = attempt_pos
-                if move_dir is not None: 
-                    move_list.append(move_dir)
-            else:
-                # [SMART AI] Blocked Vertically -> Try Horizontal
-                h_dir, h_dx, h_dy = get_horizontal_direction(s_x, p_x)
-                
-                if h_dir is not None: 
-                    new_pos = try_move(map_data, scorpion_pos, h_dir, h_dx, h_dy, gate_opened, superdata)
-                    if new_pos != scorpion_pos:
-                        move_list.append(h_dir)
-
-        # CASE 2: Same Row (Horizontal only)
-        else:
-            move_dir, dx, dy = get_horizontal_direction(s_x, p_x)
-            if move_dir is not None: 
-                new_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata)
-                if new_pos != scorpion_pos: 
-                    move_list.append(move_dir)
-
-        if move_list == [] and move_dir is not None:
-            move_list.append(move_dir)
-
-        return move_list if show_list else new_pos
-    
-    def generate_type_3(
-        map_data: list,
-        current_scorpion_position: tuple,
-        current_player_position: tuple,
-        gate_opened: bool,
-        superdata: dict,
-        show_list: bool = False
-    ) -> tuple:
-        """
-        Type 3 Scorpion: Horizontal Priority, Smart AI
-        - Speed: 1 step per turn
-        - Behavior: Prioritizes horizontal movement (LEFT/RIGHT)
-        - Intelligence: If blocked horizontally, tries vertical
-        """
-        scorpion_pos = current_scorpion_position
-        move_list = []
-        
-        move_dir, dx, dy = get_horizontal_direction(scorpion_pos[0], current_player_position[0])
-
-        s_x, s_y = scorpion_pos
-        p_x, p_y = current_player_position
-
-        if scorpion_pos == current_player_position: 
-            return move_list if show_list else scorpion_pos
-
-        new_pos = scorpion_pos
-
-        # CASE 1: Horizontal Alignment Needed (Priority)
-        if s_x != p_x: 
-            move_dir, dx, dy = get_horizontal_direction(s_x, p_x)
+            if not frame[1]:
+                stack.pop()
+                del on_path[frame[0]]
+                turns_left = max(frame[2], frame[3])
+                remember(frame[0], turns_left, depth, iteration)
+                if stack:
+                    stack[-1][2] = min(stack[-1][2], 1 + turns_left)
+                continue
             
-            attempt_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata)
-
-            if attempt_pos != scorpion_pos:
-                new_pos = attempt_pos
-                if move_dir is not None: 
-                    move_list.append(move_dir)
-            else:
-                # [SMART AI] Blocked Horizontally -> Try Vertical
-                v_dir, v_dx, v_dy = get_vertical_direction(s_y, p_y)
-                
-                if v_dir is not None:
-                    new_pos = try_move(map_data, scorpion_pos, v_dir, v_dx, v_dy, gate_opened, superdata)
-                    if new_pos != scorpion_pos: 
-                        move_list.append(v_dir)
-
-        # CASE 2: Same Column (Vertical only)
-        else:
-            move_dir, dx, dy = get_vertical_direction(s_y, p_y)
-            if move_dir is not None:
-                new_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata)
-                if new_pos != scorpion_pos:
-                    move_list.append(move_dir)
-
-        if move_list == [] and move_dir is not None: 
-            move_list.append(move_dir)
-
-        return move_list if show_list else new_pos
-
-    #----------------------------------------------------------#
-    #----- Main Logic: Process All Scorpions -----#
-    #----------------------------------------------------------#
-    
-    next_scorpion_pos = []
-    move_list = []
-
-    for scorpion_info in current_scorpion_positions:
-        current_scorpion_position = (scorpion_info[0], scorpion_info[1])
-        intelligence_level = scorpion_info[2]
-
-        # Dispatch to appropriate AI type
-        if intelligence_level == 0:
-            result = generate_type_0(map_data, current_scorpion_position, current_player_position, gate_opened, superdata, show_list)
-        elif intelligence_level == 1:
-            result = generate_type_1(map_data, current_scorpion_position, current_player_position, gate_opened, superdata, show_list)
-        elif intelligence_level == 2:
-            result = generate_type_2(map_data, current_scorpion_position, current_player_position, gate_opened, superdata, show_list)
-        elif intelligence_level == 3:
-            result = generate_type_3(map_data, current_scorpion_position, current_player_position, gate_opened, superdata, show_list)
-        else:
-            continue  # Invalid scorpion type
-
-        if show_list:
-            move_list += result
-        else:
-            next_scorpion_pos.append(result + (intelligence_level,))
+            #──────────────────────────────────────────────────────────────
+            #              NEXT SUCCESSOR (TRANSPOSITION TABLE)
+            #──────────────────────────────────────────────────────────────
             
-    return move_list if show_list else next_scorpion_pos
-
-
-def check_same_pos(next_zombie_positions: list, next_scorpion_positions: list, superdata = None) -> Tuple: 
-    # Check if two zombie in a same position
-    zombie_i = 0
-    while zombie_i < len(next_zombie_positions):
-        zombie_j = zombie_i + 1
-        while zombie_j < len(next_zombie_positions):
-            if (next_zombie_positions[zombie_i][0], next_zombie_positions[zombie_i][1]) == (next_zombie_positions[zombie_j][0], next_zombie_positions[zombie_j][1]):
-                # If two zombies in same position, keep the one with higher type value
-                if next_zombie_positions[zombie_i][2] >= next_zombie_positions[zombie_j][2]:
-                    next_zombie_positions. pop(zombie_j)
-                else:
-                    next_zombie_positions.pop(zombie_i)
-                    zombie_i -= 1
-                    break
-            else:
-                zombie_j += 1
-        zombie_i += 1
-
-    # Check if two scorpions in a same position
-    scorpion_i = 0
-    while scorpion_i < len(next_scorpion_positions):
-        scorpion_j = scorpion_i + 1
-        while scorpion_j < len(next_scorpion_positions):
-            if (next_scorpion_positions[scorpion_i][0], next_scorpion_positions[scorpion_i][1]) == (next_scorpion_positions[scorpion_j][0], next_scorpion_positions[scorpion_j][1]):
-                # If two scorpions in same position, keep the one with higher intelligence level
-                if next_scorpion_positions[scorpion_i][2] >= next_scorpion_positions[scorpion_j][2]:
-                    next_scorpion_positions. pop(scorpion_j)
-                else:
-                    next_scorpion_positions.pop(scorpion_i)
-                    scorpion_i -= 1
-                    break
-            else:
-                scorpion_j += 1
-        scorpion_i += 1
+            turns_left, new_state = frame[1].pop()
+            new_turns = depth + 1
+            
+            # Back to a state of the current path: a loop, never shorter
+            path_frame = on_path.get(new_state)
+            if path_frame is not None:
+                frame[2] = min(frame[2], 1 + max(turns_left, path_frame[3]))
+                continue
+            
+            entry = lookup(new_state)
+            if entry is not None:
+                turns_left = max(turns_left, entry[1])
+                # Reached in fewer turns before (never on a shortest path), or
+                # already searched in this iteration with at least this budget
+                if entry[2] < new_turns or (entry[2] == new_turns and entry[3] == iteration):
+                    frame[2] = min(frame[2], 1 + turns_left)
+                    continue
+            
+            # Beyond the cut: its estimate is all this iteration learns about
+            # it, kept as not expanded
+            if new_turns + turns_left > bound:
+                frame[2] = min(frame[2], 1 + turns_left)
+                next_bound = min(next_bound, new_turns + turns_left)
+                if entry is None:
+                    remember(new_state, turns_left, new_turns, iteration, expanded=False)
+                elif new_turns < entry[2]:
+                    remember(new_state, turns_left, new_turns, iteration, expanded=entry[4])
+                continue
+            
+            remember(new_state, turns_left, new_turns, iteration)
+            new_frame = [new_state, None, unsolvable, turns_left]
+            stack.append(new_frame)
+            on_path[new_state] = new_frame
+        
+        if stack:
+            break  # max_iterations reached inside the iteration
+        
+        # No cut was exceeded, or (nothing lost) every state seen was
+        # expanded = no way to win
+        if next_bound == unsolvable or (not lost and not unexpanded):
+            break
+        bound = next_bound
     
-    # check if any zombie is in trap, if yes remove it
-    next_zombie_positions = [zombie for zombie in next_zombie_positions if not is_trap(superdata, (zombie[0], zombie[1]))]
+    if stats is not None:
+        stats.hit_iteration_cap = count_steps >= max_iterations
+        stats.hit_memory_limit = lost
+        stats.states_expanded = count_steps
+        stats.max_depth = bound
+        stats.peak_visited_size = table_used
+        stats.finish([])
+    return []
 
-    # check if any scorpion is in trap, if yes remove it
-    next_scorpion_positions = [scorpion for scorpion in next_scorpion_positions if not is_trap(superdata, (scorpion[0], scorpion[1]))]
-
-    # Check if any zombie and scorpion in same position, if yes remove both
-    zombie_i = 0
-    while zombie_i < len(next_zombie_positions):
-        scorpion_i = 0
-        while scorpion_i < len(next_scorpion_positions):
-            if (next_zombie_positions[zombie_i][0], next_zombie_positions[zombie_i][1]) == (next_scorpion_positions[scorpion_i][0], next_scorpion_positions[scorpion_i][1]):
-                next_zombie_positions.pop(zombie_i)
-                next_scorpion_positions.pop(scorpion_i)
-                zombie_i -= 1
-                break
-            else:
-                scorpion_i += 1
-        zombie_i += 1
-    
-    return next_zombie_positions, next_scorpion_positions
+def _record_bfs_stats(stats: SearchStats, states_explored: int, states_pruned: int, depth: int, parents: dict) -> None:
+    """Copy the BFS counters of Shortest_Path into 'stats'."""
+    stats.states_expanded = states_explored
+    stats.states_pruned = states_pruned
+    stats.max_depth = depth
+    stats.peak_visited_size = len(parents)
 
 def Shortest_Path(
     superdata:  dict, 
@@ -834,7 +875,16 @@ def Shortest_Path(
     goal: tuple, 
     zombie_positions: list = [], 
     scorpion_positions: list = [],
-    current_gate_opened: bool = False  # ✅ THÊM PARAMETER NÀY! 
+    current_gate_opened: bool = False,  # ✅ THÊM PARAMETER NÀY! 
+    board: CompiledBoard = None,
+    algorithm: str = SEARCH_BFS,
+    cancel_event: threading.Event = None,
+    solution_cache=None,
+    move_table=None,
+    workers: int = None,
+    stats: SearchStats = None,
+    prune_dead_states: bool = False,
+    memory_limit: int = None
 ) -> list:
     """
     Finds shortest path from start to goal using BFS with state-space search.
@@ -866,6 +916,31 @@ def Shortest_Path(
         zombie_positions: List of [(x, y, type), ...]
         scorpion_positions: List of [(x, y, intelligence_level), ...]
         current_gate_opened:  CURRENT gate state in the game ← ✅ NEW!
+        board: Precompiled board of the level (built here if not given)
+        algorithm: SEARCH_BFS (plain BFS), SEARCH_ASTAR (A* ordered by
+                   turns + walking distance to goal), SEARCH_PARALLEL_BFS
+                   (the BFS split across processes, see parallel_search.py)
+                   or SEARCH_IDA (low-memory iterative-deepening A*).
+                   All return a shortest path, BFS and parallel BFS the same
+                   one, A* and IDA* may differ between equally short paths.
+        cancel_event: Set from another thread to abort the search (returns [])
+        solution_cache: SolutionCache of this level and goal. Cached states are
+                        answered without searching, found paths are stored
+        move_table: MoveTable of this level and goal (see move_table.py).
+                    States solved offline are answered without searching
+        workers: Number of processes for SEARCH_PARALLEL_BFS (default: CPUs)
+        stats: SearchStats filled with states expanded, peak queue / visited
+               sizes, time split and whether MAX_ITERATIONS was hit. Its
+               on_finish callback runs before Shortest_Path returns
+        prune_dead_states: SEARCH_BFS / SEARCH_ASTAR never expand states that
+                           are lost against one enemy alone (see
+                           dead_states.py). Same path, fewer states; the
+                           tables are built once per board and goal
+        memory_limit: Most states kept in memory (kiosk mode). BFS / A* switch
+                      to SEARCH_IDA once they store more states than this, and
+                      it is the transposition table size of SEARCH_IDA (a
+                      full table costs time, not the path; stats.hit_memory_limit
+                      tells it overflowed)
     
     Returns: 
         list:   Shortest path as [(x1,y1), (x2,y2), ..., goal] or [] if no path
@@ -875,19 +950,12 @@ def Shortest_Path(
     #                         STEP 1: INITIALIZATION
     #══════════════════════════════════════════════════════════════════════════
     
-    map_data = superdata["map_data"]
-    
-    # Extract game object positions
-    gate_pos = superdata. get("gate_pos", [])
-    key_pos = superdata.get("key_pos", [])
-    
-    # Convert to tuples for hashability
-    gate_pos = tuple(gate_pos) if gate_pos and gate_pos != [] else None
-    key_pos = tuple(key_pos) if key_pos and key_pos != [] else None
+    # Adjacency tables are built once per level, not once per state
+    if board is None:
+        board = CompiledBoard(superdata)
     
     # ✅ USE CURRENT GAME STATE AS INITIAL STATE
     initial_gate_opened = current_gate_opened
-    new_state = "OPEN" if initial_gate_opened else "CLOSED"
     
     # Performance limit
     count_steps = 0
@@ -897,182 +965,207 @@ def Shortest_Path(
     #                         STEP 2: INPUT VALIDATION
     #════════════���═════════════════════════════════════════════════════════════
     
-    if is_trap(superdata, start):
-        return []
-    
-    if is_trap(superdata, goal):
-        return []
+    if is_trap(superdata, start) or is_trap(superdata, goal):
+        return stats.finish([], "input") if stats is not None else []
     
     if start == goal:
         if not is_lose(superdata, start, zombie_positions, scorpion_positions):
-            return [start]
+            path = [start]
         else:
-            return []
+            path = []
+        return stats.finish(path, "input") if stats is not None else path
     
     #══════════════════════════════════════════════════════════════════════════
     #                    STEP 3: BFS DATA STRUCTURES
     #══════════════════════════════════════════════════════════════════════════
     
-    visited = set()
-    
-    initial_state = (
+    # Every state is packed into one int (see CompiledBoard.encode_state).
+    # parents maps state -> previous state, it is both the visited set and
+    # the way the path is rebuilt, so queue entries no longer copy paths.
+    initial_state = board.encode_state(
         start,
         initial_gate_opened,
-        tuple(zombie_positions),
-        tuple(scorpion_positions)
+        zombie_positions,
+        scorpion_positions
     )
-    visited.add(initial_state)
     
-    queue = deque([[
-        [start],              # path
-        initial_gate_opened,  # gate_opened
-        zombie_positions,     # zombie_list
-        scorpion_positions    # scorpion_list
-    ]])
+    # State solved offline -> replay the table, no search needed
+    if move_table is not None:
+        table_path = move_table.get_path(board, initial_state)
+        if table_path is not None:
+            return stats.finish(table_path, "move_table") if stats is not None else table_path
+    
+    # Repeated hint from an already solved state -> no search needed
+    if solution_cache is not None:
+        cached_moves = solution_cache.lookup(initial_state)
+        if cached_moves is not None:
+            path = [start] + cached_moves
+            return stats.finish(path, "cache") if stats is not None else path
+    
+    # Low-memory mode: depth-first, only a fixed-size transposition table
+    ida_table_size = memory_limit or IDA_TABLE_SIZE
+    if algorithm == SEARCH_IDA:
+        return ida_star_search(board, initial_state, goal, MAX_ITERATIONS, cancel_event, solution_cache, stats,
+                               prune_dead_states, ida_table_size)
     
-    # Statistics tracking
+    # A* uses the same move rules and state encoding, only the order differs
+    if algorithm == SEARCH_ASTAR:
+        path = a_star_search(board, initial_state, goal, MAX_ITERATIONS, cancel_event, solution_cache, stats,
+                             prune_dead_states, memory_limit)
+        if path is None:
+            # State space is larger than memory_limit, continue in low-memory mode
+            path = ida_star_search(board, initial_state, goal, MAX_ITERATIONS, cancel_event, solution_cache, stats,
+                                   prune_dead_states, ida_table_size)
+        return path
+    
+    if algorithm == SEARCH_PARALLEL_BFS:
+        from .parallel_search import parallel_bfs  # imports this module
+        return parallel_bfs(superdata, board, initial_state, goal, workers, MAX_ITERATIONS, cancel_event,
+                            solution_cache, stats)
+    
+    if stats is not None:
+        stats.start(SEARCH_BFS)
+    
+    parents = {initial_state: None}
+    queue = deque([initial_state])
+    dead_states = None
+    if prune_dead_states:
+        from .dead_states import DeadStateFilter  # imports this module
+        dead_states = DeadStateFilter(board, goal)
+    
+    # Statistics tracking (BFS depth = current path length - 1)
     max_path_length = 0
     states_explored = 0
+    states_pruned = 0
+    layer_remaining = 1
+    next_layer_size = 0
     
     #══════════════════════════════════════════════════════════════════════════
     #                    STEP 4: BFS MAIN LOOP
     #══════════════════════════════════════════════════════════════════════════
     
     while queue and count_steps < MAX_ITERATIONS: 
-        count_steps += 1
-        states_explored += 1
         
-        # Dequeue current state
-        current_data = queue.popleft()
-        path = current_data[0]
-        gate_opened = current_data[1]
-        zombie_list = current_data[2]
-        scorpion_list = current_data[3]
+        # State space is larger than memory_limit: drop the BFS tables and
+        # continue in low-memory mode
+        if memory_limit is not None and len(parents) > memory_limit:
+            parents = queue = None
+            return ida_star_search(board, initial_state, goal, MAX_ITERATIONS, cancel_event, solution_cache, stats,
+                                   prune_dead_states, ida_table_size)
         
-        current_pos = path[-1]
-        
-        # Track longest path for debugging
-        if len(path) > max_path_length:
-            max_path_length = len(path)
-        
-        # Skip traps
-        if is_trap(superdata, current_pos):
-            continue
-        
-        # Skip if player dies
-        if is_lose(superdata, current_pos, zombie_list, scorpion_list):
-            continue
+        # Dequeue the next states in queue order and expand them together,
+        # the result is the same as expanding them one by one
+        batch = []
+        while queue and count_steps < MAX_ITERATIONS and len(batch) < FRONTIER_BATCH_SIZE:
+            
+            # Track longest path for debugging (children of the batch are
+            # counted only after expansion, so a batch stops at a layer end)
+            if layer_remaining == 0:
+                if batch:
+                    break
+                layer_remaining = next_layer_size
+                next_layer_size = 0
+                max_path_length += 1
+            layer_remaining -= 1
+            
+            count_steps += 1
+            states_explored += 1
+            
+            # Hint requests from the game run on a worker thread and can be dropped
+            if cancel_event is not None and count_steps % CANCEL_CHECK_INTERVAL == 0 and cancel_event.is_set():
+                if stats is not None:
+                    stats.cancelled = True
+                    _record_bfs_stats(stats, states_explored, states_pruned, max_path_length, parents)
+                    stats.finish([])
+                return []
+            
+            current_state = queue.popleft()
+            current_pos, gate_opened, zombie_list, scorpion_list = board.decode_state(current_state)
+            
+            # Skip traps
+            if current_pos in board.trap_cells:
+                continue
+            
+            # Skip if player dies
+            if is_lose(superdata, current_pos, zombie_list, scorpion_list):
+                continue
+            
+            batch.append((current_state, (current_pos, gate_opened, zombie_list, scorpion_list)))
         
         #──────────────────────────────────────────────────────────────────────
-        #              STEP 5: GENERATE GRAPH BASED ON GATE STATE
+        #              STEP 5: SIMULATE EVERY PLAYER MOVE
         #──────────────────────────────────────────────────────────────────────
         
-        # Graph changes dynamically based on gate state! 
-        graph = generate_graph(superdata, gate_opened)
-        
-        # Get reachable neighbors
-        neighbors = graph.get(current_pos, [])
+        # Graph changes dynamically based on gate state, both variants are
+        # precompiled. Enemies react to the gate state after the key toggle
+        expanded = expand_frontier(board, [decoded for _, decoded in batch], stats)
         
-        # Optimization: Allow "wait" move if not fully connected
-        if len(neighbors) < 4:
-            neighbors = [current_pos] + neighbors
+        if stats is not None:
+            dedupe_started = time.perf_counter()
         
         #──────────────────────────────────────────────────────────────────────
         #              STEP 6: EXPLORE EACH NEIGHBOR
         #──────────────────────────────────────────────────────────────────────
         
-        for neighbor in neighbors: 
-            
-            # Skip traps
-            if is_trap(superdata, neighbor):
-                continue
-            
-            # Build new path
-            new_path = path + [neighbor]
-            
-            #╔══════════════════════════════════════════════════════════════╗
-            #║             KEY MECHANIC:  TOGGLE SWITCH                       ║
-            #╚══════════════════════════════════════════════════════════════╝
-            
-            new_gate_opened = gate_opened  # Inherit current state
-            
-            # Check if stepping on key position
-            if key_pos and (neighbor[0], neighbor[1]) == (key_pos[0], key_pos[1]):
-                # TOGGLE gate state every time player touches key
-                new_gate_opened = not gate_opened
+        for (current_state, _), successors in zip(batch, expanded):
+            for neighbor, new_gate_opened, new_zombie_positions, new_scorpion_positions in successors: 
                 
-                # Debug output (only for first few steps to avoid spam)
-                if count_steps <= 50:
-                    old_state = "OPEN" if gate_opened else "CLOSED"
-                    new_state = "OPEN" if new_gate_opened else "CLOSED"
-            
-            #──────────────────────────────────────────────────────────────────
-            #              ENEMY MOVEMENT SIMULATION
-            #──────────────────────────────────────────────────────────────────
-            
-            # Important: Enemies see the NEW gate state (after toggle)
-            new_zombie_positions = generate_next_zombie_positions(
-                map_data=map_data,
-                current_zombie_positions=zombie_list,
-                current_player_position=neighbor,
-                gate_opened=new_gate_opened,  # Use NEW gate state! 
-                superdata=superdata
-            )
-            
-            new_scorpion_positions = generate_next_scorpion_positions(
-                map_data=map_data,
-                current_scorpion_positions=scorpion_list,
-                current_player_position=neighbor,
-                gate_opened=new_gate_opened,  # Use NEW gate state! 
-                superdata=superdata
-            )
-            
-            # Handle enemy collisions and trap deaths
-            new_zombie_positions, new_scorpion_positions = check_same_pos(
-                new_zombie_positions,
-                new_scorpion_positions,
-                superdata
-            )
-            
-            #──────────────────────────────────────────────────────────────────
-            #              GOAL CHECK
-            #──────────────────────────────────────────────────────────────────
-            
-            if neighbor == goal:
-                if not is_lose(superdata, neighbor, new_zombie_positions, new_scorpion_positions):
-                    # Count how many times key was touched
-                    key_touches = 0
-                    if key_pos:
-                        for pos in new_path:
-                            if (pos[0], pos[1]) == (key_pos[0], key_pos[1]):
-                                key_touches += 1
-                    
-                    return new_path
-            
-            #──────────────────────────────────────────────────────────────────
-            #              STATE TRACKING
-            #──────────────────────────────────────────────────────────────────
-            
-            new_state = (
-                neighbor,
-                new_gate_opened,
-                tuple(new_zombie_positions),
-                tuple(new_scorpion_positions)
-            )
-            
-            if new_state not in visited:
-                visited.add(new_state)
-                queue. append([
-                    new_path,
+                #──────────────────────────────────────────────────────────────
+                #              GOAL CHECK
+                #──────────────────────────────────────────────────────────────
+                
+                if neighbor == goal:
+                    if not is_lose(superdata, neighbor, new_zombie_positions, new_scorpion_positions):
+                        winning_state = board.encode_state(
+                            neighbor,
+                            new_gate_opened,
+                            new_zombie_positions,
+                            new_scorpion_positions
+                        )
+                        parents[winning_state] = current_state
+                        path = rebuild_path(board, parents, winning_state, solution_cache)
+                        if stats is not None:
+                            _record_bfs_stats(stats, states_explored, states_pruned, max_path_length + 1, parents)
+                            stats.finish(path)
+                        return path
+                
+                #──────────────────────────────────────────────────────────────
+                #              STATE TRACKING
+                #──────────────────────────────────────────────────────────────
+                
+                new_state = board.encode_state(
+                    neighbor,
                     new_gate_opened,
                     new_zombie_positions,
                     new_scorpion_positions
-                ])
+                )
+                
+                if new_state not in parents:
+                    parents[new_state] = current_state
+                    
+                    # Lost against a pinned enemy whatever the player does:
+                    # stays visited but is never expanded
+                    if dead_states is not None and dead_states.is_doomed(
+                        neighbor, new_gate_opened, new_zombie_positions, new_scorpion_positions
+                    ):
+                        states_pruned += 1
+                        continue
+                    
+                    queue.append(new_state)
+                    next_layer_size += 1
+        
+        if stats is not None:
+            stats.dedupe_time += time.perf_counter() - dedupe_started
+            stats.peak_queue_size = max(stats.peak_queue_size, len(queue))
     
     #══════════════════════════════════════════════════════════════════════════
     #                    STEP 7: NO PATH FOUND
     #══════════════════════════════════════════════════════════════════════════
    
+    if stats is not None:
+        stats.hit_iteration_cap = bool(queue) and count_steps >= MAX_ITERATIONS
+        _record_bfs_stats(stats, states_explored, states_pruned, max_path_length, parents)
+        stats.finish([])
     
     return []
 
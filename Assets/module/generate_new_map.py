@@ -1,13 +1,22 @@
 import json
 import sys
 import os
-
-print("Starting script...")
+import random
+import argparse
+import multiprocessing
+from functools import partial
 
 # Add Assets/module to path
 sys.path.append(os.path.join(os.path.dirname(__file__), "Assets", "module"))
 
-from Assets.module.map_generator import MapGenerator
+from Assets.module.map_generator import MapGenerator, DIFFICULTY_BANDS, MAX_SEED, in_difficulty_band, print_progress
+
+BULK_SIZES = [6, 8, 10, 12, 16]
+# Candidates handed to a worker at once (keeps the pool busy without
+# delaying the first accepted maps too much)
+BULK_CHUNK_SIZE = 4
+# Level keys written by --seeds-only, the map itself is regenerated from the seed
+SEED_ONLY_KEYS = ("name", "map_length", "seed", "level_score", "difficulty")
 
 
 def main():
@@ -58,7 +67,19 @@ def main():
     else:
         print("Failed 16x16")
 
-    # Custom JSON formatting to align map_data
+    formatted_lines = format_maps_json(maps)
+
+    with open("generated_maps.json", "w") as f:
+        f.write("\n".join(formatted_lines))
+
+    print("Maps saved to generated_maps.json")
+
+
+def format_maps_json(maps: list) -> list:
+    """
+    Dump maps as JSON lines (indent 4) with every map_data row and every
+    coordinate list kept on one line, aligned like maps_collection.
+    """
     json_str = json.dumps(maps, indent=4)
 
     lines = json_str.split("\n")
@@ -150,11 +171,101 @@ def main():
         else:
             formatted_lines.append(line)
 
-    with open("generated_maps.json", "w") as f:
-        f.write("\n".join(formatted_lines))
+    return formatted_lines
 
-    print("Maps saved to generated_maps.json")
+
+def generate_candidate(task: tuple, difficulty: str = None):
+    """
+    One generation attempt: the map of task = (size, seed).
+
+    Returns:
+        (map dict, size, None) if it is winnable (and inside the DIFFICULTY_BANDS
+        band 'difficulty', if given), else (None, size, tier that rejected it)
+    """
+    size, seed = task
+    generator = MapGenerator(size)
+    generator.build_from_seed(seed)
+    if not generator.validate():
+        return None, size, generator.rejected_by
+    if difficulty is not None and not in_difficulty_band(generator.measure_difficulty()["score"], difficulty):
+        return None, size, "difficulty"
+    return generator.get_map_dict(), size, None
+
+
+def generate_bulk(count: int, sizes: list = BULK_SIZES, workers: int = None,
+                  output: str = "generated_maps.json", difficulty: str = None, on_progress=None,
+                  seed: int = None, seeds_only: bool = False) -> dict:
+    """
+    Generate 'count' candidate maps per size across a process pool.
+
+    Every candidate is generated, validated and (with 'difficulty', a key of
+    DIFFICULTY_BANDS) graded in a worker, so the rejection sampling of a
+    difficulty band runs on every CPU. Accepted maps are appended to 'output'
+    in candidate order as the results come back (the file is a complete JSON
+    list once the run ends), so a long run can be watched or stopped.
+    on_progress(event, info) is called in this process for every finished
+    candidate ("valid" or "rejected", see MapGenerator).
+
+    The candidate seeds are drawn from random.Random(seed), so a run with the
+    same seed writes the same file (maps, order and "#n" names), whatever
+    the number of workers. With seeds_only, only SEED_ONLY_KEYS of
+    each map are written; levels.load_level rebuilds the rest from the seed.
+
+    Returns:
+        dict: {size: number of accepted maps}
+    """
+    seed_source = random.Random(seed)
+    tasks = [(size, seed_source.randrange(MAX_SEED)) for size in sizes for _ in range(count)]
+    accepted = {size: 0 for size in sizes}
+
+    with open(output, "w") as f, multiprocessing.Pool(workers) as pool:
+        f.write("[")
+        candidates = pool.imap(partial(generate_candidate, difficulty=difficulty), tasks, chunksize=BULK_CHUNK_SIZE)
+        for map_dict, size, rejected_by in candidates:
+            if map_dict is None:
+                if on_progress is not None:
+                    on_progress("rejected", {"size": size, "rejected_by": rejected_by})
+                continue
+            accepted[size] += 1
+            if on_progress is not None:
+                on_progress("valid", {"size": size, "accepted": accepted[size]})
+            map_dict["name"] = f"Generated Map {size}x{size} #{accepted[size]}"
+            if seeds_only:
+                map_dict = {key: map_dict[key] for key in SEED_ONLY_KEYS if key in map_dict}
+
+            # Lines of the map object inside a one-map list (already indented)
+            map_lines = format_maps_json([map_dict])[1:-1]
+            f.write(("," if sum(accepted.values()) > 1 else "") + "\n" + "\n".join(map_lines))
+            f.flush()
+        f.write("\n]")
+
+    return accepted
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Generate new maps into a JSON file.")
+    parser.add_argument("--bulk", type=int, default=None, metavar="N",
+                        help="try N candidate maps per size in a process pool")
+    parser.add_argument("--sizes", type=int, nargs="+", default=BULK_SIZES, help="map sizes of --bulk")
+    parser.add_argument("--workers", type=int, default=None, help="processes of --bulk (default: number of CPUs)")
+    parser.add_argument("--output", default="generated_maps.json", help="output file of --bulk")
+    parser.add_argument("--difficulty", choices=list(DIFFICULTY_BANDS), default=None,
+                        help="keep only --bulk maps in this difficulty band")
+    parser.add_argument("--verbose", action="store_true", help="print every --bulk candidate")
+    parser.add_argument("--seed", type=int, default=None, help="seed of a reproducible --bulk run")
+    parser.add_argument("--seeds-only", action="store_true",
+                        help="write only name, size and seed of each --bulk map (see levels.load_level)")
+    args = parser.parse_args()
+
+    print("Starting script...")
+    if args.bulk is None:
+        main()
+    else:
+        accepted = generate_bulk(
+            args.bulk, args.sizes, args.workers, args.output, args.difficulty,
+            on_progress=print_progress if args.verbose else None,
+            seed=args.seed, seeds_only=args.seeds_only,
+        )
+        for size, accepted_count in accepted.items():
+            print(f"{size}x{size}: {accepted_count}/{args.bulk} accepted")
+        print(f"Maps saved to {args.output}")
@@ -0,0 +1,122 @@
+import threading
+from typing import List, Optional
+
+from .game_algorithms import Shortest_Path, CompiledBoard, SEARCH_ASTAR
+from .solution_cache import SolutionCache
+from .search_stats import SearchStats
+from .move_table import MoveTable
+
+
+class HintWorker:
+    """
+    Runs Shortest_Path on a background thread so the game loop keeps drawing.
+
+    Usage (one request at a time):
+        worker.start(...)      -> when the player asks for a hint
+        worker.cancel()        -> when the player moves / undoes / resets
+        path = worker.poll()   -> every frame, None until a result is ready
+        worker.hit_memory_limit -> after poll() returned [], True when the
+                                   search gave up at the iteration cap with
+                                   its memory_limit table overflowing
+                                   (unknown, not "no way to win")
+
+    Every found path is kept (in the level's SolutionCache, or in a small one
+    of the worker if none is given). When the player followed the hint, the
+    new state is on that path and start() answers it right away, without a
+    thread or a search; any other state is solved from scratch.
+    """
+
+    def __init__(self, recent_entries: int = 4096) -> None:
+        self.__lock = threading.Lock()
+        self.__thread: Optional[threading.Thread] = None
+        self.__cancel_event: Optional[threading.Event] = None
+        self.__result: Optional[List[tuple]] = None
+        self.__recent_paths = SolutionCache(max_entries=recent_entries)
+        self.__hit_memory_limit = False
+        self.hit_memory_limit = False
+
+    def start(
+        self,
+        superdata: dict,
+        start: tuple,
+        goal: tuple,
+        zombie_positions: list,
+        scorpion_positions: list,
+        current_gate_opened: bool = False,
+        board: CompiledBoard = None,
+        algorithm: str = SEARCH_ASTAR,
+        solution_cache: SolutionCache = None,
+        move_table: MoveTable = None,
+        memory_limit: int = None,
+    ) -> None:
+        """Cancel any running search and start a new one with the given state."""
+        self.cancel()
+
+        if solution_cache is None:
+            solution_cache = self.__recent_paths
+
+        # Still on a found path (the player followed the hint) -> answer now
+        if board is not None:
+            state = board.encode_state(start, current_gate_opened, zombie_positions, scorpion_positions)
+            cached_moves = solution_cache.lookup(state)
+            if cached_moves is not None:
+                with self.__lock:
+                    self.__result = [start] + cached_moves
+                    self.__hit_memory_limit = False
+                return
+
+        cancel_event = threading.Event()
+        self.__cancel_event = cancel_event
+        stats = SearchStats()
+
+        def run() -> None:
+            path = Shortest_Path(
+                superdata,
+                start,
+                goal,
+                zombie_positions=zombie_positions,
+                scorpion_positions=scorpion_positions,
+                current_gate_opened=current_gate_opened,
+                board=board,
+                algorithm=algorithm,
+                cancel_event=cancel_event,
+                solution_cache=solution_cache,
+                move_table=move_table,
+                memory_limit=memory_limit,
+                stats=stats,
+            )
+            with self.__lock:
+                # Result of a cancelled request is outdated, drop it
+                if not cancel_event.is_set():
+                    self.__result = path
+                    self.__hit_memory_limit = stats.hit_memory_limit and stats.hit_iteration_cap
+
+        self.__thread = threading.Thread(target=run, name="hint-solver", daemon=True)
+        self.__thread.start()
+
+    def cancel(self) -> None:
+        """Stop the running search (if any) and forget its result."""
+        with self.__lock:
+            if self.__cancel_event is not None:
+                self.__cancel_event.set()
+            self.__cancel_event = None
+            self.__thread = None
+            self.__result = None
+
+    def is_running(self) -> bool:
+        """Check if a search is still in progress."""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def poll(self) -> Optional[List[tuple]]:
+        """
+        Return the finished path once ([] if there is no way to win),
+        or None while the search is still running / nothing was requested.
+        """
+        with self.__lock:
+            result = self.__result
+            self.__result = None
+            if result is not None:
+                self.__cancel_event = None
+                self.__thread = None
+                self.hit_memory_limit = self.__hit_memory_limit
+            return result
@@ -0,0 +1,71 @@
+"""
+Level data helpers that do not need pygame.
+
+Loading a level from maps_collection and finding its winning cell are shared
+by the game (re-exported from utils) and by headless tools such as the map
+validator, which should not pay for importing pygame.
+"""
+
+from typing import List, Tuple, Optional
+from .map_collection import maps_collection
+from .settings import UP, DOWN, LEFT, RIGHT
+
+
+# ------------------------------------------------------- #
+# --------------------- LEVEL HELPER--------------------- #
+# ------------------------------------------------------- #
+def clean_map_data(map_data: List[List[str]]) -> List[List[str]]:
+    """Return a cleaned copy of map_data with whitespace stripped from each tile id."""
+    return [[(cell or "").strip() for cell in col] for col in map_data]
+
+def get_winning_position(stair_pos: Tuple[int, int], map_len: int) -> Optional[List[int]]:
+    """Determines the grid cell in front of the stair to win."""
+    row, col = stair_pos
+    if col == 0:  # Stair is at the top edge
+        return [row, 1],  UP
+    elif col == map_len + 1:  # Stair is at the bottom edge
+        return [row, map_len], DOWN
+    elif row == 0:  # Stair is at the left edge
+        return [1, col], LEFT
+    elif row == map_len + 1:  # Stair is at the right edge
+        return [map_len, col], RIGHT
+    return None
+
+def expand_seeded_level(level_data: dict) -> dict:
+    """
+    Fill a level stored as its seed ({"map_length", "seed", ...}, written by
+    generate_new_map --seeds-only) with the generated map, in place. Keys
+    already in level_data (name, level_score) are kept.
+    """
+    from .map_generator import generate_seeded_map  # only seeded levels need the generator
+
+    generated = generate_seeded_map(level_data["map_length"], level_data["seed"])
+    # Same shapes as the levels read from JSON (lists, not tuples)
+    generated["stair_position"] = list(generated["stair_position"])
+    for key in ("zombie_starts", "scorpion_starts", "trap_pos"):
+        generated[key] = [list(item) for item in generated[key]]
+
+    for key, value in generated.items():
+        level_data.setdefault(key, value)
+    return level_data
+
+def load_level(level_index: int):
+    """Load a level from maps_collection and return its components (cleaned)."""
+    if level_index < 0 or level_index >= len(maps_collection):
+        return None, None, None, None, None, None, None
+
+    level_data = maps_collection[level_index]
+    if "map_data" not in level_data and "seed" in level_data:
+        expand_seeded_level(level_data)
+    cleaned_map_data = clean_map_data(level_data["map_data"])
+    level_data["map_data"] = cleaned_map_data
+
+    return (
+        level_data.get("map_length", 6),
+        level_data.get("stair_position", (0, 1)),
+        level_data,
+        level_data.get("player_start", (1, 1)).copy(),
+        level_data.get("zombie_starts", []).copy(),
+        level_data.get("scorpion_starts", []).copy(),
+        level_data.get("level_score", 1000),
+    )
@@ -1,4 +1,5 @@
 import os
+import time
 from typing import List, Tuple
 import pygame
 
@@ -916,6 +917,9 @@ class HintPackage:
         self.TILE_SIZE= tile_size
         self.facing_direction = DOWN
         self.show_hint = False
+        self.is_thinking = False  # True while the hint is computed in background
+        self.moves_remaining = None  # turns left to win when following the hint
+        self.__moves_font = None
 
         self.__hint_frame, self.__shadow_hint_frame = self.load_hint_image()
     
@@ -971,4 +975,38 @@ class HintPackage:
         screen.blit(current_shadow, (hint_x, hint_y))
         screen.blit(current_image, (hint_x, hint_y))
 
+    def draw_thinking(self, screen: pygame.Surface, player_pos: List[int]) -> None:
+        """Draw three pulsing dots above the player while the hint is being computed."""
+        x, y = player_pos
+        center_x = MARGIN_LEFT + self.TILE_SIZE * (x - 1) + self.TILE_SIZE // 2
+        center_y = MARGIN_TOP + self.TILE_SIZE * (y - 1) - self.TILE_SIZE // 6
+
+        radius = max(2, self.TILE_SIZE // 14)
+        gap = radius * 3
+        active_dot = int(time.time() * 4) % 3
+
+        for i in range(3):
+            color = (255, 240, 180) if i == active_dot else (140, 120, 80)
+            dot_pos = (center_x + (i - 1) * gap, center_y)
+            pygame.draw.circle(screen, (0, 0, 0), dot_pos, radius + 1)
+            pygame.draw.circle(screen, color, dot_pos, radius)
+
+    def draw_moves_remaining(self, screen: pygame.Surface, player_pos: List[int]) -> None:
+        """Draw the number of turns left to win (from the last hint) above the player."""
+        if not self.moves_remaining:
+            return
+        if self.__moves_font is None:
+            self.__moves_font = pygame.font.Font(None, max(16, self.TILE_SIZE // 3))
+
+        x, y = player_pos
+        center_x = MARGIN_LEFT + self.TILE_SIZE * (x - 1) + self.TILE_SIZE // 2
+        center_y = MARGIN_TOP + self.TILE_SIZE * (y - 1) - self.TILE_SIZE // 6
+
+        text = str(self.moves_remaining)
+        shadow = self.__moves_font.render(text, True, (0, 0, 0))
+        label = self.__moves_font.render(text, True, (255, 240, 180))
+        rect = label.get_rect(center=(center_x, center_y))
+        screen.blit(shadow, rect.move(1, 1))
+        screen.blit(label, rect)
+
 pygame.quit()
@@ -1,6 +1,6 @@
 import random
+import math
 import sys
-import io
 import os
 from collections import deque
 
@@ -10,15 +10,87 @@ parent_dir = os.path.dirname(os.path.dirname(current_dir))
 sys.path.append(parent_dir)
 
 try:
-    from .game_algorithms import Shortest_Path
+    from .game_algorithms import Shortest_Path, SEARCH_ASTAR, SEARCH_PARALLEL_BFS, CompiledBoard, generate_successors
+    from .rules import WallBoard, is_lose
+    from .search_stats import SearchStats
 except ImportError:
     # Fallback for running as script
-    from Assets.module.game_algorithms import Shortest_Path
+    from Assets.module.game_algorithms import Shortest_Path, SEARCH_ASTAR, SEARCH_PARALLEL_BFS, CompiledBoard, generate_successors
+    from Assets.module.rules import WallBoard, is_lose
+    from Assets.module.search_stats import SearchStats
+
+# Difficulty score bands [low, high) accepted by create_map(difficulty=...),
+# see difficulty_score. The score does not grow with the map size: valid maps
+# of every size from 6 to 16 score about 20 to 95, and each band holds
+# roughly a third of them at every size (40 seeds per size). Shipped levels:
+# 4.9 (level 30) to 69.9 (level 10)
+DIFFICULTY_BANDS = {
+    "easy": (0, 28),
+    "medium": (28, 36),
+    "hard": (36, None),
+}
+
+
+MOVE_DELTAS = (("UP", 0, -1), ("DOWN", 0, 1), ("LEFT", -1, 0), ("RIGHT", 1, 0))
+
+
+# Map seeds are drawn below this, so a level fits in a small id
+MAX_SEED = 2 ** 32
+
+
+def print_progress(event: str, info: dict) -> None:
+    """on_progress callback that prints every MapGenerator event on one line."""
+    print(event + "".join(f", {key}={value}" for key, value in info.items()))
+
+
+def difficulty_score(metrics: dict, size: int) -> float:
+    """
+    Combine the solver metrics of MapGenerator.measure_difficulty into one
+    score: long solutions, forced waits, big searches and few winning first
+    moves all make a map harder.
+
+    The size dependent metrics are relative to the map size, so the bands of
+    DIFFICULTY_BANDS fit every size: path_length against size ** 1.5 (how the
+    typical shortest win grows with the map) and states_explored per cell.
+    """
+    return round(
+        30 * metrics["path_length"] / size ** 1.5
+        + 4 * metrics["forced_waits"]
+        + 3 * math.log2(metrics["states_explored"] / (size * size) + 1)
+        + 10 / max(1, metrics["winning_first_moves"]),
+        1,
+    )
+
+
+def in_difficulty_band(score: float, difficulty: str) -> bool:
+    """Check if a difficulty score is inside DIFFICULTY_BANDS[difficulty]."""
+    low, high = DIFFICULTY_BANDS[difficulty]
+    return score >= low and (high is None or score < high)
 
 
 class MapGenerator:
-    def __init__(self, size=6):
+    """
+    Random maze generator that keeps only winnable maps.
+
+    Every map is laid out from its own seed with a private random.Random, so
+    the same (size, seed) always gives the same map (build_from_seed /
+    generate_seeded_map) and generators never share random state. 'seed'
+    seeds the sequence of map seeds create_map tries (None: from the OS).
+
+    on_progress(event, info) is called, if given, for every generation
+    event ("attempt", "valid", "rejected", "error", "failed") with a dict of
+    plain values (print_progress prints them). Nothing is printed otherwise,
+    so generators can run quietly in threads and worker processes.
+    """
+
+    def __init__(self, size=6, workers=1, on_progress=None, seed=None):
         self.size = size
+        # > 1: validate with the BFS split across this many processes
+        self.workers = workers
+        self.on_progress = on_progress
+        self.seed_source = random.Random(seed)
+        self.random = random.Random()
+        self.seed = None  # seed of the current map
         self.map_data = []
         self.player_start = (1, 1)
         self.stair_pos = (size, size)
@@ -28,12 +100,28 @@ class MapGenerator:
         self.key_pos = ()
         self.gate_pos = ()
 
+        # Filled by validate() / measure_difficulty()
+        self.solution = []
+        self.search_stats = None
+        self.difficulty = None
+        self.rejected_by = None  # tier of validate() that rejected the map
+
         # Internal wall representation
         # walls_v: (r, c) -> Wall between (r, c) and (r, c+1)
         # walls_h: (r, c) -> Wall between (r, c) and (r+1, c)
         self.walls_v = set()
         self.walls_h = set()
 
+    def build_from_seed(self, seed):
+        """Lay out the walls and entities of the map 'seed' (not validated)."""
+        self.seed = seed
+        self.random.seed(seed)
+        self.walls_v.clear()
+        self.walls_h.clear()
+        self.generate_maze()
+        self.convert_to_map_data()
+        self.place_entities()
+
     def generate_maze(self):
         """Generates a random maze using DFS (Recursive Backtracking)."""
         # Start with all walls present
@@ -69,7 +157,7 @@ class MapGenerator:
                 neighbors.append(("R", (r, c + 1)))
 
             if neighbors:
-                direction, next_cell = random.choice(neighbors)
+                direction, next_cell = self.random.choice(neighbors)
                 nr, nc = next_cell
 
                 # Remove wall
@@ -91,10 +179,10 @@ class MapGenerator:
         remove_count = self.size // 2
         for _ in range(remove_count):
             if self.walls_v:
-                w = random.choice(list(self.walls_v))
+                w = self.random.choice(list(self.walls_v))
                 self.walls_v.remove(w)
             if self.walls_h:
-                w = random.choice(list(self.walls_h))
+                w = self.random.choice(list(self.walls_h))
                 self.walls_h.remove(w)
 
     def convert_to_map_data(self):
@@ -183,15 +271,15 @@ class MapGenerator:
 
         # 1. Stair (Exit) - Random Edge
         # Stair must be OUTSIDE the grid.
-        edge = random.choice(["top", "bottom", "left", "right"])
+        edge = self.random.choice(["top", "bottom", "left", "right"])
         if edge == "top":
-            self.stair_pos = (random.randint(1, self.size), 0)
+            self.stair_pos = (self.random.randint(1, self.size), 0)
         elif edge == "bottom":
-            self.stair_pos = (random.randint(1, self.size), self.size + 1)
+            self.stair_pos = (self.random.randint(1, self.size), self.size + 1)
         elif edge == "left":
-            self.stair_pos = (0, random.randint(1, self.size))
+            self.stair_pos = (0, self.random.randint(1, self.size))
         elif edge == "right":
-            self.stair_pos = (self.size + 1, random.randint(1, self.size))
+            self.stair_pos = (self.size + 1, self.random.randint(1, self.size))
 
         # Clear wall for stair
         self.open_wall_for_stair()
@@ -209,7 +297,8 @@ class MapGenerator:
         elif sx == self.size + 1:  # Right
             start_node = (sy - 1, self.size - 1)
 
-        # BFS to find furthest cell
+        # BFS to find furthest cell (walls are final after opening the stair)
+        board = WallBoard(self.map_data)
         queue = deque([(start_node, 0)])
         visited = {start_node}
         max_dist = -1
@@ -222,39 +311,12 @@ class MapGenerator:
                 max_dist = dist
                 furthest_cell = (r, c)
 
-            # Check neighbors
-            # Up
-            if r > 0 and (r - 1, c) not in visited:
-                # Check if wall blocks UP
-                curr_cell = self.map_data[r][c]
-                if curr_cell not in ["t", "tl", "tr", "b*", "l*", "r*"]:
-                    # Check if wall blocks DOWN from above (should match if map is consistent)
-                    queue.append(((r - 1, c), dist + 1))
-                    visited.add((r - 1, c))
-
-            # Down
-            if r < self.size - 1 and (r + 1, c) not in visited:
-                # Check if wall blocks DOWN
-                curr_cell = self.map_data[r][c]
-                if curr_cell not in ["b", "bl", "br", "t*", "l*", "r*"]:
-                    queue.append(((r + 1, c), dist + 1))
-                    visited.add((r + 1, c))
-
-            # Left
-            if c > 0 and (r, c - 1) not in visited:
-                # Check if wall blocks LEFT
-                curr_cell = self.map_data[r][c]
-                if curr_cell not in ["l", "tl", "bl", "t*", "b*", "r*"]:
-                    queue.append(((r, c - 1), dist + 1))
-                    visited.add((r, c - 1))
-
-            # Right
-            if c < self.size - 1 and (r, c + 1) not in visited:
-                # Check if wall blocks RIGHT
-                curr_cell = self.map_data[r][c]
-                if curr_cell not in ["r", "tr", "br", "t*", "b*", "l*"]:
-                    queue.append(((r, c + 1), dist + 1))
-                    visited.add((r, c + 1))
+            # Check neighbors (board uses 1-based x = c + 1, y = r + 1)
+            for direction, dr, dc in (("UP", -1, 0), ("DOWN", 1, 0), ("LEFT", 0, -1), ("RIGHT", 0, 1)):
+                neighbor = (r + dr, c + dc)
+                if neighbor not in visited and board.can_move(c + 1, r + 1, direction):
+                    queue.append((neighbor, dist + 1))
+                    visited.add(neighbor)
 
         self.player_start = [
             furthest_cell[1] + 1,
@@ -263,18 +325,18 @@ class MapGenerator:
 
         # 3. Enemies
         # Number of enemies based on size
-        num_zombies = random.randint(1, self.size // 3)
-        num_scorpions = random.randint(0, self.size // 4)
+        num_zombies = self.random.randint(1, self.size // 3)
+        num_scorpions = self.random.randint(0, self.size // 4)
 
         self.zombies = []
         for _ in range(num_zombies):
             tries = 0
             while tries < 100:
-                zr = random.randint(0, self.size - 1)
-                zc = random.randint(0, self.size - 1)
+                zr = self.random.randint(0, self.size - 1)
+                zc = self.random.randint(0, self.size - 1)
                 pos = [zc + 1, zr + 1]
                 if pos != self.player_start:
-                    z_type = random.randint(0, 3)
+                    z_type = self.random.randint(0, 3)
                     self.zombies.append((pos[0], pos[1], z_type))
                     break
                 tries += 1
@@ -283,13 +345,13 @@ class MapGenerator:
         for _ in range(num_scorpions):
             tries = 0
             while tries < 100:
-                sr = random.randint(0, self.size - 1)
-                sc = random.randint(0, self.size - 1)
+                sr = self.random.randint(0, self.size - 1)
+                sc = self.random.randint(0, self.size - 1)
                 pos = [sc + 1, sr + 1]
                 if pos != self.player_start and pos not in [
                     [z[0], z[1]] for z in self.zombies
                 ]:
-                    s_type = random.randint(0, 3)
+                    s_type = self.random.randint(0, 3)
                     self.scorpions.append((pos[0], pos[1], s_type))
                     break
                 tries += 1
@@ -378,76 +440,208 @@ class MapGenerator:
             # If empty, s is ''
             self.map_data[r][c] = s
 
-    def validate(self):
-        """Checks if the map is winnable."""
-        superdata = {
+    def get_superdata(self):
+        """Level dictionary of the current map as the solver expects it."""
+        return {
             "map_data": self.map_data,
             "trap_pos": self.traps,
             "key_pos": self.key_pos,
             "gate_pos": self.gate_pos,
         }
 
+    def get_goal_cell(self):
+        """Cell in front of the stair (the stair is outside the grid), None if misplaced."""
         sx, sy = self.stair_pos
-        goal_cell = None
         # Stair is outside, so goal is the cell adjacent to it inside the grid
         if sy == 0:
-            goal_cell = (sx, 1)
+            return (sx, 1)
         elif sy == self.size + 1:
-            goal_cell = (sx, self.size)
+            return (sx, self.size)
         elif sx == 0:
-            goal_cell = (1, sy)
+            return (1, sy)
         elif sx == self.size + 1:
-            goal_cell = (self.size, sy)
+            return (self.size, sy)
+        return None
+
+    def passes_static_checks(self, goal_cell, board):
+        """
+        Tier 1 of validate: no enemy spawned on the player or on a trap, and
+        the goal is reachable from the start ignoring enemies (gate opened, so
+        every edge the key could open counts, traps avoided).
+        """
+        start_pos = tuple(self.player_start)
+        trap_cells = {(trap[0], trap[1]) for trap in self.traps}
+        for enemy in list(self.zombies) + list(self.scorpions):
+            if (enemy[0], enemy[1]) == start_pos or (enemy[0], enemy[1]) in trap_cells:
+                return False
+
+        queue = deque([start_pos])
+        visited = {start_pos}
+        while queue:
+            x, y = queue.popleft()
+            if (x, y) == goal_cell:
+                return True
+            for direction, dx, dy in MOVE_DELTAS:
+                neighbor = (x + dx, y + dy)
+                if neighbor not in visited and neighbor not in trap_cells and board.can_move(x, y, direction, True):
+                    visited.add(neighbor)
+                    queue.append(neighbor)
+        return False
+
+    def passes_danger_checks(self, goal_cell, compiled_board):
+        """
+        Tier 2 of validate: at least one first move (waiting included) is not
+        caught right away. A smart zombie next to the start is only rejected
+        when it really catches every move, a distance rule also dropped
+        solvable maps.
+        """
+        superdata = self.get_superdata()
+        start_pos = tuple(self.player_start)
+        if start_pos == goal_cell:
+            return True
+
+        for position, _, zombies, scorpions in generate_successors(
+            compiled_board, start_pos, False, self.zombies, self.scorpions
+        ):
+            if not is_lose(superdata, position, zombies, scorpions):
+                return True
+        return False
+
+    def validate(self):
+        """
+        Checks if the map is winnable.
+
+        Cheap tiers run first and reject the obviously bad candidates before
+        the full enemy-aware Shortest_Path: passes_static_checks,
+        passes_danger_checks, then the solver (on the board compiled for
+        tier 2). rejected_by tells which tier failed (None: valid).
+        """
+        superdata = self.get_superdata()
+        goal_cell = self.get_goal_cell()
+        self.solution = []
+        self.search_stats = SearchStats()
+        self.difficulty = None
+        self.rejected_by = "stair"
 
         if not goal_cell:
             return False
 
-        # Redirect stdout to suppress print from Shortest_Path
-        old_stdout = sys.stdout
-        sys.stdout = io.StringIO()
+        board = WallBoard(self.map_data, self.gate_pos)
+        self.rejected_by = "static"
+        if not self.passes_static_checks(goal_cell, board):
+            return False
+
+        compiled_board = CompiledBoard(superdata)
+        self.rejected_by = "danger"
+        if not self.passes_danger_checks(goal_cell, compiled_board):
+            return False
 
         # Run Shortest Path
         try:
             # Ensure start is a tuple
             start_pos = tuple(self.player_start)
             path = Shortest_Path(
-                superdata, start_pos, goal_cell, self.zombies, self.scorpions
+                superdata, start_pos, goal_cell, self.zombies, self.scorpions,
+                algorithm=SEARCH_PARALLEL_BFS if self.workers > 1 else SEARCH_ASTAR,
+                board=compiled_board, workers=self.workers, stats=self.search_stats
             )
         except Exception as e:
-            sys.stdout = old_stdout
-            print(f"Validation Error: {e}")
+            if self.on_progress is not None:
+                self.on_progress("error", {"size": self.size, "error": repr(e)})
             path = []
 
-        sys.stdout = old_stdout
-
+        self.solution = path
+        self.rejected_by = None if path else "solver"
         return len(path) > 0
 
-    def create_map(self):
-        """Main loop to generate a valid map."""
+    def measure_difficulty(self):
+        """
+        Solver metrics of a validated map, with their difficulty_score.
+
+        Returns:
+            dict: path_length (turns of the shortest win), forced_waits (turns
+                  of that win spent standing still), states_explored (by an A*
+                  search, whatever solver validate() used), winning_first_moves
+                  (distinct first moves, waiting included, that can still win)
+                  and score.
+                  None if validate() did not find a solution.
+        """
+        if not self.solution:
+            return None
+
+        superdata = self.get_superdata()
+        goal_cell = self.get_goal_cell()
+        board = CompiledBoard(superdata)
+        start_pos = tuple(self.player_start)
+
+        # Same search whatever validate() ran (parallel BFS with workers > 1)
+        search_stats = self.search_stats
+        if search_stats.algorithm != SEARCH_ASTAR:
+            search_stats = SearchStats()
+            Shortest_Path(
+                superdata, start_pos, goal_cell, self.zombies, self.scorpions,
+                board=board, algorithm=SEARCH_ASTAR, stats=search_stats
+            )
+
+        winning_first_moves = 0
+        for position, gate_opened, zombies, scorpions in generate_successors(
+            board, start_pos, False, self.zombies, self.scorpions
+        ):
+            if is_lose(superdata, position, zombies, scorpions):
+                continue
+            if position == goal_cell or Shortest_Path(
+                superdata, position, goal_cell, zombies, scorpions,
+                current_gate_opened=gate_opened, board=board, algorithm=SEARCH_ASTAR
+            ):
+                winning_first_moves += 1
+
+        metrics = {
+            "path_length": len(self.solution) - 1,
+            "forced_waits": sum(current == following for current, following in zip(self.solution, self.solution[1:])),
+            "states_explored": search_stats.states_expanded,
+            "winning_first_moves": winning_first_moves,
+        }
+        metrics["score"] = difficulty_score(metrics, self.size)
+        self.difficulty = metrics
+        return metrics
+
+    def create_map(self, difficulty=None, max_attempts=10):
+        """
+        Main loop to generate a valid map.
+
+        difficulty: key of DIFFICULTY_BANDS, valid maps outside the band are
+        rejected too (None: any valid map).
+        """
         attempts = 0
-        while attempts < 10:
-            print(f"Attempt {attempts}")
-            self.walls_v.clear()
-            self.walls_h.clear()
-            print("Generating maze...")
-            self.generate_maze()
-            print("Converting...")
-            self.convert_to_map_data()
-            print("Placing entities...")
-            self.place_entities()
-            print("Validating...")
+        while attempts < max_attempts:
+            self.build_from_seed(self.seed_source.randrange(MAX_SEED))
+            if self.on_progress is not None:
+                self.on_progress("attempt", {"size": self.size, "attempt": attempts, "seed": self.seed})
 
             if self.validate():
-                print("Map Valid!")
-                return self.get_map_dict()
-            print("Map Invalid.")
+                if difficulty is None:
+                    if self.on_progress is not None:
+                        self.on_progress("valid", {"size": self.size, "attempt": attempts})
+                    return self.get_map_dict()
+                metrics = self.measure_difficulty()
+                if in_difficulty_band(metrics["score"], difficulty):
+                    if self.on_progress is not None:
+                        self.on_progress("valid", {"size": self.size, "attempt": attempts, "score": metrics["score"]})
+                    return self.get_map_dict()
+                self.rejected_by = "difficulty"
+            if self.on_progress is not None:
+                info = {"size": self.size, "attempt": attempts, "rejected_by": self.rejected_by}
+                if self.difficulty is not None:
+                    info["score"] = self.difficulty["score"]
+                self.on_progress("rejected", info)
             attempts += 1
 
-        print("Failed to generate valid map after 10 attempts.")
+        if self.on_progress is not None:
+            self.on_progress("failed", {"size": self.size, "attempts": max_attempts})
         return None
 
     def get_map_dict(self):
-        return {
+        map_dict = {
             "name": f"Generated Map {self.size}x{self.size}",
             "map_length": self.size,
             "map_data": self.map_data,
@@ -459,12 +653,27 @@ class MapGenerator:
             "key_pos": list(self.key_pos) if self.key_pos else [],
             "gate_pos": list(self.gate_pos) if self.gate_pos else [],
             "level_score": 1000,
+            "seed": self.seed,
         }
+        if self.difficulty is not None:
+            map_dict["difficulty"] = self.difficulty
+        return map_dict
+
+
+def generate_seeded_map(size, seed):
+    """
+    Map dict of the (size, seed) map, rebuilt without validating it again.
+    The map only matches the one generated earlier while the generation code
+    stays the same.
+    """
+    generator = MapGenerator(size)
+    generator.build_from_seed(seed)
+    return generator.get_map_dict()
 
 
 if __name__ == "__main__":
     # Test
-    gen = MapGenerator(16)
+    gen = MapGenerator(16, on_progress=print_progress)
     map_dict = gen.create_map()
     if map_dict:
         print("Successfully generated map:")
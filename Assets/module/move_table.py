@@ -0,0 +1,374 @@
+import os
+import sys
+import zlib
+import struct
+from array import array
+from collections import deque
+from typing import List, Optional, Tuple
+
+from .game_algorithms import CompiledBoard, FRONTIER_BATCH_SIZE, expand_frontier, generate_successors
+from .rules import is_lose
+from .solution_cache import level_fingerprint
+
+
+# File layout: header (magic, fingerprint, map width, key size, state count) followed by
+# a zlib block with the sorted state keys, the next cells and the distances.
+MOVE_TABLE_MAGIC = b"MMT1"
+HEADER_FORMAT = ">4s40sHBI"
+
+# Distance stored for states that can never win (caught, or no way out)
+UNSOLVABLE = 0xFFFF
+
+
+def move_table_path(level_index: int) -> str:
+    return os.path.join("assets", "move_tables", f"level_{level_index}.bin")
+
+
+def load_move_table(level_index: int, superdata: dict, goal: tuple) -> Optional["MoveTable"]:
+    """Load the generated table of a level, None if missing or built for other level data."""
+    return MoveTable.load(move_table_path(level_index), level_fingerprint(superdata, goal))
+
+
+def _to_big_endian(values: array) -> bytes:
+    if sys.byteorder == "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_big_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "little":
+        values.byteswap()
+    return values
+
+
+class MoveTable:
+    """
+    Solved state space of one level: for every state reachable from the level
+    start, the optimal next player position and the number of turns left.
+
+    Keys are packed solver states (CompiledBoard.encode_state) kept as one
+    sorted big-endian byte string, so a lookup is a binary search over the
+    loaded file instead of a search through the game tree.
+
+    Distance values:
+        0             player stands on the goal (next position = itself)
+        1..0xFFFE     turns left when following the next positions
+        UNSOLVABLE    player is caught or cannot win any more from here
+    """
+
+    def __init__(self, fingerprint: str, width: int, key_bytes: int, keys: bytes, cells: array, distances: array) -> None:
+        self.fingerprint = fingerprint
+        self.width = width  # map width, to turn stored cell numbers back into (x, y)
+        self.key_bytes = key_bytes
+        self.__keys = keys
+        self.__cells = cells
+        self.__distances = distances
+
+    def __len__(self) -> int:
+        return len(self.__distances)
+
+    def _find(self, state: int) -> int:
+        """Index of 'state' in the sorted keys, -1 if the state is not in the table."""
+        key_bytes = self.key_bytes
+        if state < 0 or state.bit_length() > key_bytes * 8:
+            return -1
+        key = state.to_bytes(key_bytes, "big")
+        keys = self.__keys
+
+        low, high = 0, len(self.__distances)
+        while low < high:
+            middle = (low + high) // 2
+            start = middle * key_bytes
+            if keys[start:start + key_bytes] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.__distances) and keys[low * key_bytes:(low + 1) * key_bytes] == key:
+            return low
+        return -1
+
+    def lookup(self, state: int) -> Optional[Tuple[Tuple[int, int], int]]:
+        """
+        Return (next player position, turns left) for a packed state,
+        None if the state was not reached while solving the level.
+        Turns left is UNSOLVABLE when the player cannot win from 'state'.
+        """
+        index = self._find(state)
+        if index < 0:
+            return None
+        cell = self.__cells[index]
+        return (cell % self.width + 1, cell // self.width + 1), self.__distances[index]
+
+    def is_dead(self, state: int) -> bool:
+        """Check if the player can no longer win from a (known) state."""
+        entry = self.lookup(state)
+        return entry is not None and entry[1] == UNSOLVABLE
+
+    def get_path(self, board: CompiledBoard, state: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Replay the table from 'state' to the goal.
+
+        Returns:
+            list: Same format as Shortest_Path ([(x1,y1), ..., goal], [] if the
+                  player cannot win), or None if 'state' is not in the table.
+        """
+        entry = self.lookup(state)
+        if entry is None:
+            return None
+
+        position, gate_opened, zombies, scorpions = board.decode_state(state)
+        path = [position]
+        while True:
+            next_position, distance = entry
+            if distance == UNSOLVABLE:
+                return []
+            if distance == 0:
+                return path
+
+            # Only the player move is stored, the enemy reply is simulated again
+            for successor in generate_successors(board, position, gate_opened, zombies, scorpions):
+                if successor[0] == next_position:
+                    position, gate_opened, zombies, scorpions = successor
+                    break
+            else:
+                return None
+
+            path.append(position)
+            entry = self.lookup(board.encode_state(position, gate_opened, zombies, scorpions))
+            if entry is None:
+                return None
+
+    def save(self, file_path: str) -> None:
+        header = struct.pack(
+            HEADER_FORMAT,
+            MOVE_TABLE_MAGIC,
+            self.fingerprint.encode("ascii"),
+            self.width,
+            self.key_bytes,
+            len(self),
+        )
+        payload = self.__keys + _to_big_endian(self.__cells) + _to_big_endian(self.__distances)
+
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        with open(file_path, "wb") as f:
+            f.write(header)
+            f.write(zlib.compress(payload, 9))
+
+    @classmethod
+    def load(cls, file_path: str, fingerprint: str = None) -> Optional["MoveTable"]:
+        """Read a table file. Returns None if missing, broken or (if given) for another fingerprint."""
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+            header_size = struct.calcsize(HEADER_FORMAT)
+            magic, file_fingerprint, width, key_bytes, count = struct.unpack(HEADER_FORMAT, data[:header_size])
+            payload = zlib.decompress(data[header_size:])
+        except (OSError, struct.error, zlib.error) as e:
+            print(f"Move table could not be read: {e}")
+            return None
+
+        file_fingerprint = file_fingerprint.decode("ascii")
+        if magic != MOVE_TABLE_MAGIC or (fingerprint is not None and file_fingerprint != fingerprint):
+            return None
+
+        keys_end = key_bytes * count
+        cells_end = keys_end + 2 * count
+        if len(payload) != cells_end + 2 * count:
+            print(f"Move table could not be read: {file_path} is truncated")
+            return None
+
+        return cls(
+            file_fingerprint,
+            width,
+            key_bytes,
+            payload[:keys_end],
+            _from_big_endian("H", payload[keys_end:cells_end]),
+            _from_big_endian("H", payload[cells_end:]),
+        )
+
+
+def solve_level(
+    superdata: dict,
+    start: tuple,
+    goal: tuple,
+    zombie_positions: list = [],
+    scorpion_positions: list = [],
+    current_gate_opened: bool = False,
+    board: CompiledBoard = None,
+    max_states: int = None,
+) -> Optional[MoveTable]:
+    """
+    Solve every state reachable from the given start backwards from the goal.
+
+    Same move rules as Shortest_Path. The state graph is deterministic (the
+    enemies only react to the player), so the distance to win of every state
+    is one backwards BFS from all winning states over the reversed edges.
+
+    Args:
+        superdata: Dictionary containing map_data, gate_pos, key_pos, trap_pos
+        start: Player starting position (x, y)
+        goal: Goal position (x, y)
+        zombie_positions: List of [(x, y, type), ...]
+        scorpion_positions: List of [(x, y, intelligence_level), ...]
+        current_gate_opened: Gate state at the start
+        board: Precompiled board of the level (built here if not given)
+        max_states: Give up (return None) when more states are reachable
+
+    Returns:
+        MoveTable of the level, or None if max_states was exceeded
+    """
+
+    #══════════════════════════════════════════════════════════════════════════
+    #              STEP 1: ENUMERATE REACHABLE STATES (FORWARD)
+    #══════════════════════════════════════════════════════════════════════════
+
+    if board is None:
+        board = CompiledBoard(superdata)
+
+    initial_state = board.encode_state(start, current_gate_opened, zombie_positions, scorpion_positions)
+
+    # State i of 'states' has successors edges[edge_start[i]:edge_start[i + 1]]
+    state_index = {initial_state: 0}
+    states = [initial_state]
+    edge_start = array("l", [0])
+    edges = array("l")
+
+    # Winning and lost states end the game, they get no outgoing edges
+    won = []
+
+    i = 0
+    while i < len(states):
+        # Expand the next states in order together (one vectorized enemy move)
+        batch_end = min(len(states), i + FRONTIER_BATCH_SIZE)
+        frontier = []
+        expandable = []
+        for index in range(i, batch_end):
+            position, gate_opened, zombie_list, scorpion_list = board.decode_state(states[index])
+
+            caught = is_lose(superdata, position, zombie_list, scorpion_list)
+            if position == goal and not caught:
+                won.append(index)
+            if caught or position == goal:
+                expandable.append(False)
+            else:
+                frontier.append((position, gate_opened, zombie_list, scorpion_list))
+                expandable.append(True)
+
+        expanded = iter(expand_frontier(board, frontier))
+        for can_expand in expandable:
+            if can_expand:
+                for successor in next(expanded):
+                    new_state = board.encode_state(*successor)
+                    index = state_index.get(new_state)
+                    if index is None:
+                        index = len(states)
+                        state_index[new_state] = index
+                        states.append(new_state)
+                    edges.append(index)
+            edge_start.append(len(edges))
+
+        if max_states is not None and len(states) > max_states:
+            return None
+        i = batch_end
+
+    del state_index
+    state_count = len(states)
+
+    #══════════════════════════════════════════════════════════════════════════
+    #              STEP 2: REVERSE THE EDGES
+    #══════════════════════════════════════════════════════════════════════════
+
+    reverse_start = array("l", [0]) * (state_count + 1)
+    for target in edges:
+        reverse_start[target + 1] += 1
+    for index in range(state_count):
+        reverse_start[index + 1] += reverse_start[index]
+
+    reverse_edges = array("l", [0]) * len(edges)
+    fill = array("l", reverse_start)
+    for source in range(state_count):
+        for edge in range(edge_start[source], edge_start[source + 1]):
+            target = edges[edge]
+            reverse_edges[fill[target]] = source
+            fill[target] += 1
+    del fill, edges, edge_start
+
+    #══════════════════════════════════════════════════════════════════════════
+    #              STEP 3: BACKWARDS BFS FROM THE WINNING STATES
+    #══════════════════════════════════════════════════════════════════════════
+
+    cell_mask = board.entity_mask
+    distances = array("H", [UNSOLVABLE]) * state_count
+    cells = array("H", ((state & cell_mask) >> 1 for state in states))
+
+    queue = deque(won)
+    for index in won:
+        distances[index] = 0
+
+    while queue:
+        index = queue.popleft()
+        next_distance = distances[index] + 1
+        next_cell = (states[index] & cell_mask) >> 1
+        for edge in range(reverse_start[index], reverse_start[index + 1]):
+            previous = reverse_edges[edge]
+            if distances[previous] == UNSOLVABLE:
+                # First time reached = fewest turns, move towards 'index'
+                distances[previous] = next_distance
+                cells[previous] = next_cell
+                queue.append(previous)
+
+    #══════════════════════════════════════════════════════════════════════════
+    #              STEP 4: PACK INTO A SORTED TABLE
+    #══════════════════════════════════════════════════════════════════════════
+
+    order = sorted(range(state_count), key=states.__getitem__)
+    key_bytes = max(1, (states[order[-1]].bit_length() + 7) // 8)
+
+    return MoveTable(
+        level_fingerprint(superdata, goal),
+        board.width,
+        key_bytes,
+        b"".join(states[index].to_bytes(key_bytes, "big") for index in order),
+        array("H", (cells[index] for index in order)),
+        array("H", (distances[index] for index in order)),
+    )
+
+
+if __name__ == "__main__":
+    # Usage: python -m Assets.module.move_table [level ...] [--max-states N]
+    import time
+    import argparse
+
+    from .map_collection import maps_collection
+    from .levels import load_level, get_winning_position
+
+    parser = argparse.ArgumentParser(description="Solve levels offline into move tables for instant hints.")
+    parser.add_argument("levels", nargs="*", type=int, help="level indexes (default: all)")
+    parser.add_argument("--max-states", type=int, default=None, help="skip levels with more reachable states")
+    args = parser.parse_args()
+
+    for level_index in args.levels or range(len(maps_collection)):
+        map_length, stair_position, superdata, player_start, zombie_starts, scorpion_starts, _ = load_level(level_index)
+        winning_position, _ = get_winning_position(stair_position, map_length)
+
+        start_time = time.time()
+        table = solve_level(
+            superdata,
+            tuple(player_start),
+            tuple(winning_position),
+            [tuple(zombie) for zombie in zombie_starts],
+            [tuple(scorpion) for scorpion in scorpion_starts],
+            max_states=args.max_states,
+        )
+        if table is None:
+            print(f"Level {level_index}: skipped (more than {args.max_states} states)")
+            continue
+
+        file_path = move_table_path(level_index)
+        table.save(file_path)
+        print(f"Level {level_index}: {len(table)} states, {time.time() - start_time:.2f}s -> {file_path}")
@@ -0,0 +1,106 @@
+"""
+Vectorized enemy movement (optional NumPy backend).
+
+Walls come from WallBoard (one 4-bit mask per cell and gate state, bit set =
+the enemy can leave the cell in that direction, same rule as is_linked).
+advance_enemies() then moves a whole batch of (enemy, player) rows at once,
+with exactly the behaviour of generate_next_zombie_positions /
+generate_next_scorpion_positions:
+
+    - primary axis: vertical for type 0 / 2, horizontal for type 1 / 3
+    - move on the primary axis towards the player while not aligned on it
+    - dumb types (0 / 1) stay if blocked, smart types (2 / 3) try the other axis
+    - once aligned on the primary axis, move on the other axis
+    - zombies repeat this twice per turn, scorpions once
+
+If NumPy is not installed HAS_NUMPY is False and callers keep using the
+per-enemy Python functions.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, not in requirements.txt
+    np = None
+
+from .settings import UP, DOWN, LEFT, RIGHT
+from .rules import WallBoard, CAN_MOVE_BITS
+
+HAS_NUMPY = np is not None
+
+# Bits of a wall mask (set = open in that direction)
+MASK_UP = CAN_MOVE_BITS[UP]
+MASK_DOWN = CAN_MOVE_BITS[DOWN]
+MASK_LEFT = CAN_MOVE_BITS[LEFT]
+MASK_RIGHT = CAN_MOVE_BITS[RIGHT]
+
+ZOMBIE_STEPS = 2
+SCORPION_STEPS = 1
+
+
+def build_wall_masks(superdata: dict):
+    """
+    Compile the walls of a level into masks[gate_opened, y - 1, x - 1].
+
+    Returns:
+        np.ndarray of shape (2, height, width), dtype uint8 (None without NumPy)
+    """
+    if not HAS_NUMPY:
+        return None
+
+    board = WallBoard(superdata["map_data"], superdata.get("gate_pos"))
+    return np.array(board.masks, dtype=np.uint8).reshape(2, board.height, board.width)
+
+
+def _step(masks, x, y, types, player_x, player_y, gate):
+    """Advance every row by one step (rows already on the player do not move)."""
+    mask = masks[gate, y - 1, x - 1]
+    dx = np.sign(player_x - x)
+    dy = np.sign(player_y - y)
+
+    can_vertical = ((dy < 0) & ((mask & MASK_UP) != 0)) | ((dy > 0) & ((mask & MASK_DOWN) != 0))
+    can_horizontal = ((dx < 0) & ((mask & MASK_LEFT) != 0)) | ((dx > 0) & ((mask & MASK_RIGHT) != 0))
+
+    vertical_first = (types & 1) == 0
+    smart = types >= 2
+
+    primary_needed = np.where(vertical_first, dy != 0, dx != 0)
+    can_primary = np.where(vertical_first, can_vertical, can_horizontal)
+    can_secondary = np.where(vertical_first, can_horizontal, can_vertical)
+
+    move_primary = primary_needed & can_primary
+    move_secondary = can_secondary & (~primary_needed | (smart & ~can_primary))
+
+    move_vertical = np.where(vertical_first, move_primary, move_secondary)
+    move_horizontal = np.where(vertical_first, move_secondary, move_primary)
+    return x + dx * move_horizontal, y + dy * move_vertical
+
+
+def advance_enemies(masks, x, y, types, player_x, player_y, gate_opened, steps):
+    """
+    Move a batch of enemies for one turn.
+
+    Args:
+        masks: Result of build_wall_masks
+        x, y: Enemy positions (1-indexed), one row per (enemy, player) pair
+        types: Enemy type / intelligence level (0..3)
+        player_x, player_y: Player position the enemy of the row chases
+        gate_opened: Gate state of the row (after the player's key toggle)
+        steps: ZOMBIE_STEPS or SCORPION_STEPS per row
+
+    Returns:
+        (new_x, new_y) as NumPy arrays
+    """
+    x = np.asarray(x, dtype=np.int16)
+    y = np.asarray(y, dtype=np.int16)
+    types = np.asarray(types, dtype=np.int8)
+    player_x = np.asarray(player_x, dtype=np.int16)
+    player_y = np.asarray(player_y, dtype=np.int16)
+    gate = np.asarray(gate_opened, dtype=np.intp)
+    steps = np.asarray(steps, dtype=np.int8)
+
+    x, y = _step(masks, x, y, types, player_x, player_y, gate)
+
+    # Zombies take a second step
+    second_x, second_y = _step(masks, x, y, types, player_x, player_y, gate)
+    twice = steps >= 2
+    return np.where(twice, second_x, x), np.where(twice, second_y, y)
@@ -0,0 +1,255 @@
+import os
+import time
+import heapq
+import threading
+import multiprocessing
+
+from .game_algorithms import CompiledBoard, expand_frontier, SEARCH_PARALLEL_BFS
+from .rules import is_lose, is_trap
+from .search_stats import SearchStats
+
+
+def shard_of(state: int, shard_count: int) -> int:
+    """Shard owning a packed state (int hash is the same in every process)."""
+    return hash(state) % shard_count
+
+
+def _shard_worker(shard: int, shard_count: int, superdata: dict, goal: tuple, connection) -> None:
+    """
+    One process of parallel_bfs. Owns the visited states (and their parent)
+    whose shard_of() is 'shard' and expands the frontier states it owns.
+
+    Commands received on 'connection' as (command, argument):
+        seed    initial state                -> None
+        expand  expand states with index < argument
+                -> (winner or None, candidates grouped by owner shard)
+        accept  candidates sent to this shard -> sorted order keys of the new states
+        index   global layer index of every new state (same order) -> None
+        parent  state                        -> parent state (None for the start)
+        stop
+    """
+    board = CompiledBoard(superdata)
+    parents = {}
+    frontier = []  # [(layer index, state)] owned by this shard, sorted by index
+    pending = []   # states accepted for the next layer, sorted by order key
+
+    while True:
+        command, argument = connection.recv()
+
+        if command == "seed":
+            parents[argument] = None
+            frontier = [(0, argument)]
+            connection.send(None)
+
+        elif command == "expand":
+            batch = []
+            for index, state in frontier:
+                if index >= argument:
+                    break
+                position, gate_opened, zombie_list, scorpion_list = board.decode_state(state)
+                if is_trap(superdata, position) or is_lose(superdata, position, zombie_list, scorpion_list):
+                    continue
+                batch.append((index, state, (position, gate_opened, zombie_list, scorpion_list)))
+
+            # Order key of a child = (layer index of parent, move index), the
+            # order in which the serial BFS would have discovered it
+            winner = None
+            outgoing = [{} for _ in range(shard_count)]
+            for (index, state, _), successors in zip(batch, expand_frontier(board, [decoded for _, _, decoded in batch])):
+                for move_index, (neighbor, new_gate_opened, new_zombies, new_scorpions) in enumerate(successors):
+                    new_state = board.encode_state(neighbor, new_gate_opened, new_zombies, new_scorpions)
+                    if neighbor == goal and not is_lose(superdata, neighbor, new_zombies, new_scorpions):
+                        winner = ((index, move_index), state, new_state)
+                        break
+                    candidates = outgoing[shard_of(new_state, shard_count)]
+                    if new_state not in candidates:
+                        candidates[new_state] = (index, move_index, state)
+                if winner is not None:
+                    break
+
+            connection.send((winner, [list(candidates.items()) for candidates in outgoing]))
+
+        elif command == "accept":
+            best = {}
+            for new_state, info in argument:
+                if new_state in parents:
+                    continue
+                if new_state not in best or info[:2] < best[new_state][:2]:
+                    best[new_state] = info
+            pending = sorted(best.items(), key=lambda item: item[1][:2])
+            for new_state, (_, _, parent_state) in pending:
+                parents[new_state] = parent_state
+            connection.send([info[:2] for _, info in pending])
+
+        elif command == "index":
+            frontier = [(index, new_state) for index, (new_state, _) in zip(argument, pending)]
+            pending = []
+            connection.send(None)
+
+        elif command == "parent":
+            connection.send(parents.get(argument))
+
+        elif command == "stop":
+            connection.close()
+            return
+
+
+def parallel_bfs(
+    superdata: dict,
+    board: CompiledBoard,
+    initial_state: int,
+    goal: tuple,
+    workers: int = None,
+    max_iterations: int = 1000000,
+    cancel_event: threading.Event = None,
+    solution_cache=None,
+    stats: SearchStats = None,
+) -> list:
+    """
+    Layer-by-layer BFS over the same state space as Shortest_Path, split
+    across 'workers' processes.
+
+    Every process owns the visited states of one hash shard. Per layer:
+        1. each shard expands the frontier states it owns
+        2. children are sent to their owner shard, which drops visited
+           states and keeps the earliest discoverer as parent
+        3. new states get their global index in the next layer
+    Children are ordered by (parent index, move index), so the layers, the
+    iteration cap, the chosen parents and the returned path are exactly the
+    ones of the serial BFS.
+
+    Args:
+        superdata: Dictionary containing map_data, gate_pos, key_pos, trap_pos
+        board: Precompiled board of the level (used to decode the path)
+        initial_state: Packed start state (board.encode_state)
+        goal: Goal position (x, y)
+        workers: Number of processes (default: number of CPUs)
+        max_iterations: Same cap on dequeued states as Shortest_Path
+        cancel_event: Set from another thread to abort the search (returns [])
+        solution_cache: SolutionCache to store the found path in
+        stats: SearchStats filled with the coordinator's counters and timings
+
+    Returns:
+        list: Shortest path as [(x1,y1), (x2,y2), ..., goal] or [] if no path
+    """
+    shard_count = max(1, workers or os.cpu_count() or 1)
+    context = multiprocessing.get_context()
+
+    if stats is not None:
+        stats.start(SEARCH_PARALLEL_BFS)
+        stats.peak_queue_size = stats.peak_visited_size = 1
+
+    connections = []
+    processes = []
+    try:
+        for shard in range(shard_count):
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=_shard_worker,
+                args=(shard, shard_count, superdata, goal, child_connection),
+                name=f"bfs-shard-{shard}",
+                daemon=True,
+            )
+            process.start()
+            child_connection.close()
+            connections.append(parent_connection)
+            processes.append(process)
+
+        def ask(shard: int, command: str, argument=None):
+            connections[shard].send((command, argument))
+            return connections[shard].recv()
+
+        def ask_all(command: str, arguments: list) -> list:
+            for connection, argument in zip(connections, arguments):
+                connection.send((command, argument))
+            return [connection.recv() for connection in connections]
+
+        ask(shard_of(initial_state, shard_count), "seed", initial_state)
+
+        layer_size = 1
+        depth = 0
+        count_steps = 0
+        while layer_size and count_steps < max_iterations:
+            if cancel_event is not None and cancel_event.is_set():
+                if stats is not None:
+                    stats.cancelled = True
+                    stats.finish([])
+                return []
+
+            #──────────────────────────────────────────────────────────────
+            #              EXPAND THE LAYER (up to the iteration cap)
+            #──────────────────────────────────────────────────────────────
+
+            limit = min(layer_size, max_iterations - count_steps)
+            count_steps += limit
+            if stats is not None:
+                stats.states_expanded = count_steps
+                stats.max_depth = depth
+                expand_started = time.perf_counter()
+
+            results = ask_all("expand", [limit] * shard_count)
+
+            if stats is not None:
+                stats.enemy_time += time.perf_counter() - expand_started
+
+            winners = [winner for winner, _ in results if winner is not None]
+            if winners:
+                _, parent_state, winning_state = min(winners)
+                states = [winning_state]
+                state = parent_state
+                while state is not None:
+                    states.append(state)
+                    state = ask(shard_of(state, shard_count), "parent", state)
+                states.reverse()
+
+                path = [board.decode_position(state) for state in states]
+                if solution_cache is not None:
+                    solution_cache.record(states, path)
+                if stats is not None:
+                    stats.max_depth = depth + 1
+                    stats.finish(path)
+                return path
+
+            #──────────────────────────────────────────────────────────────
+            #              DEDUPE ON THE OWNER SHARDS, NUMBER THE NEXT LAYER
+            #──────────────────────────────────────────────────────────────
+
+            if stats is not None:
+                dedupe_started = time.perf_counter()
+
+            incoming = [[] for _ in range(shard_count)]
+            for _, outgoing in results:
+                for shard, candidates in enumerate(outgoing):
+                    incoming[shard].extend(candidates)
+            order_keys = ask_all("accept", incoming)
+
+            indexes = [[] for _ in range(shard_count)]
+            merged = heapq.merge(*[[(key, shard) for key in keys] for shard, keys in enumerate(order_keys)])
+            layer_size = 0
+            for _, shard in merged:
+                indexes[shard].append(layer_size)
+                layer_size += 1
+            ask_all("index", indexes)
+            depth += 1
+
+            if stats is not None:
+                stats.dedupe_time += time.perf_counter() - dedupe_started
+                stats.peak_queue_size = max(stats.peak_queue_size, layer_size)
+                stats.peak_visited_size += layer_size
+
+        if stats is not None:
+            stats.hit_iteration_cap = layer_size > 0 and count_steps >= max_iterations
+            stats.finish([])
+        return []
+
+    finally:
+        for connection in connections:
+            try:
+                connection.send(("stop", None))
+                connection.close()
+            except OSError:
+                pass
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
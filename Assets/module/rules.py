@@ -0,0 +1,1162 @@
+"""
+Game rules that do not need pygame.
+
+Walls and the gate (WallBoard / is_linked), traps, the enemy AI, the
+enemy collisions, the key toggling the gate and winning / losing are shared
+by the sprite managers, which animate the moves they return, and by the
+solver, which plays them out. Keeping them here lets worker processes
+(parallel BFS shards, the map validator) import the rules without loading
+pygame. utils re-exports the wall helpers.
+
+LevelRules.step plays one complete turn over an immutable TurnState; the
+solver's generate_successors and step share resolve_turn, and the game loop
+resolves enemy clashes with the same resolve_collisions (tests/test_rules.py
+checks that they agree on the shipped levels).
+"""
+
+from typing import List, Tuple, Optional, NamedTuple
+from .settings import UP, DOWN, LEFT, RIGHT
+
+
+# -------------------------------------------------- #
+# --------------------- WALLS ---------------------- #
+# -------------------------------------------------- #
+
+# Tile codes that close each side of a cell
+TOP_WALL_TILES = ('t', 'tl', 'tr', 'b*', 'l*', 'r*')
+BOTTOM_WALL_TILES = ('b', 'bl', 'br', 't*', 'l*', 'r*')
+LEFT_WALL_TILES = ('l', 'tl', 'bl', 'b*', 't*', 'r*')
+RIGHT_WALL_TILES = ('r', 'br', 'tr', 't*', 'l*', 'b*')
+
+# Bit of each direction in a WallBoard mask (set = can move that way)
+CAN_MOVE_BITS = {UP: 1, DOWN: 2, LEFT: 4, RIGHT: 8}
+
+
+class WallBoard:
+    """
+    Walls of a map compiled into one 4-bit mask per cell and gate state,
+    so a move check is an index + bit test instead of tile string lookups.
+
+    A move is blocked by the wall on either side of the shared edge, by the
+    map border, or (gate closed) by the gate on the bottom edge of gate_pos.
+
+    Attributes:
+        width, height: Map size in cells
+        masks: (masks with gate closed, masks with gate opened), each a tuple
+               indexed by (y - 1) * width + (x - 1), bits from CAN_MOVE_BITS
+    """
+
+    def __init__(self, map_data: List[List[str]], gate_pos: Optional[list] = None) -> None:
+        self.height = len(map_data)
+        self.width = len(map_data[0]) if map_data else 0
+
+        # Accept [x, y], (x, y) and the wrapped [[x, y]] form of level data
+        if gate_pos and isinstance(gate_pos[0], (list, tuple)):
+            gate_pos = gate_pos[0]
+        gate = (gate_pos[0], gate_pos[1]) if gate_pos else None
+
+        opened_masks = []
+        closed_masks = []
+        for y in range(1, self.height + 1):
+            for x in range(1, self.width + 1):
+                tile = map_data[y - 1][x - 1]
+                mask = 0
+                if y > 1 and tile not in TOP_WALL_TILES and map_data[y - 2][x - 1] not in BOTTOM_WALL_TILES:
+                    mask |= CAN_MOVE_BITS[UP]
+                if y < self.height and tile not in BOTTOM_WALL_TILES and map_data[y][x - 1] not in TOP_WALL_TILES:
+                    mask |= CAN_MOVE_BITS[DOWN]
+                if x > 1 and tile not in LEFT_WALL_TILES and map_data[y - 1][x - 2] not in RIGHT_WALL_TILES:
+                    mask |= CAN_MOVE_BITS[LEFT]
+                if x < self.width and tile not in RIGHT_WALL_TILES and map_data[y - 1][x] not in LEFT_WALL_TILES:
+                    mask |= CAN_MOVE_BITS[RIGHT]
+                opened_masks.append(mask)
+
+                # Closed gate blocks the edge below the gate cell (both ways)
+                if gate == (x, y):
+                    mask &= ~CAN_MOVE_BITS[DOWN]
+                elif gate == (x, y - 1):
+                    mask &= ~CAN_MOVE_BITS[UP]
+                closed_masks.append(mask)
+
+        self.masks = (tuple(closed_masks), tuple(opened_masks))
+
+    def can_move(self, x: int, y: int, direction: str, gate_opened: bool = False) -> bool:
+        """Check if (x, y) (1-indexed) can move one cell towards 'direction'."""
+        if 0 < x <= self.width and 0 < y <= self.height:
+            mask = self.masks[1 if gate_opened else 0][(y - 1) * self.width + x - 1]
+            return mask & CAN_MOVE_BITS.get(direction, 0) != 0
+        return False
+
+
+# Boards compiled by is_linked, keyed by id(map_data) and id(gate_pos). Both
+# objects are kept in the entry so their ids cannot be reused meanwhile.
+_wall_board_cache = {}
+WALL_BOARD_CACHE_SIZE = 16
+
+
+def get_wall_board(map_data: List[List[str]], gate_pos: Optional[list] = None) -> WallBoard:
+    """
+    Return the WallBoard of a map, compiled once per map_data / gate_pos object.
+    map_data and gate_pos must not be edited in place after this is called.
+    """
+    cache_key = (id(map_data), id(gate_pos))
+    entry = _wall_board_cache.get(cache_key)
+    if entry is None or entry[0] is not map_data or entry[1] is not gate_pos:
+        if len(_wall_board_cache) >= WALL_BOARD_CACHE_SIZE:
+            _wall_board_cache.pop(next(iter(_wall_board_cache)))
+        entry = (map_data, gate_pos, WallBoard(map_data, gate_pos))
+        _wall_board_cache[cache_key] = entry
+    return entry[2]
+
+
+def is_linked(map_data: list, direction:  list, facing_direction: str, gate_opened: bool = False, superdata: dict = None) -> bool:
+    """
+    Check if can move from 'direction' in 'facing_direction' considering walls and gates.
+    
+    Args:
+        map_data: Map data matrix
+        direction: Current position [x, y]
+        facing_direction: Direction to move (UP/DOWN/LEFT/RIGHT)
+        gate_opened: Current state of gate (True = opened, False = closed)
+        superdata: Original map data containing gate_pos and key_pos
+    
+    Returns: 
+        bool: True if can move, False otherwise
+    """
+    gate_pos = superdata.get("gate_pos") if superdata else None
+    return get_wall_board(map_data, gate_pos).can_move(direction[0], direction[1], facing_direction, gate_opened)
+
+
+def get_face_direction(from_pos:  tuple, to_pos: tuple, map_data: list = None, gate_opened: bool = False, superdata: dict = None) -> str:
+    """
+    Determine the facing direction from one position to another.
+    
+    Args:
+        from_pos:  Starting position (x, y)
+        to_pos: Target position (x, y)
+        map_data: Map data matrix
+        gate_opened:  Current state of gate (True = opened, False = closed)
+        superdata: Original map data containing gate_pos and key_pos
+    
+    Returns:
+        str: Direction string (UP/DOWN/LEFT/RIGHT)
+    """
+    
+    #----- STEP 1: EXTRACT COORDINATES -----#
+    from_x, from_y = from_pos
+    to_x, to_y = to_pos
+    
+    #----- STEP 2: DETERMINE DIRECTION BASED ON COORDINATE DIFFERENCE -----#
+    # Check horizontal difference first
+    if to_x < from_x: 
+        return LEFT
+    elif from_x < to_x:
+        return RIGHT
+    
+    # Check vertical difference
+    elif to_y < from_y: 
+        return UP
+    elif to_y > from_y: 
+        return DOWN
+    
+    #----- STEP 3: IF POSITIONS ARE THE SAME, DEFAULT TO WALL SIDE -----#
+
+    # This handles edge case where from_pos == to_pos
+    # Return direction that faces a wall (for standing still animation)
+    
+    if map_data is not None: 
+        possible_directions = [UP, DOWN, LEFT, RIGHT]
+        
+        for direction in possible_directions: 
+            # Check if this direction is blocked (wall or closed gate)
+            if not is_linked(map_data, from_pos, direction, gate_opened, superdata):
+                return direction
+    
+    # Fallback:  return DOWN if no map_data provided
+    return DOWN
+
+#==============================================================================
+#                         TRAPS AND LOSING
+#==============================================================================
+
+# Trap cells of the last levels, see get_trap_cells
+_trap_cells_cache = {}
+TRAP_CELLS_CACHE_SIZE = 16
+NO_TRAPS = frozenset()
+
+
+def get_trap_cells(superdata: dict) -> frozenset:
+    """
+    Return the trap positions of a level as a frozenset of (x, y) tuples.
+
+    Built once per trap_pos list (traps outside the map are left out, like
+    the boundary check of is_trap did), so every later check is one hash
+    lookup instead of a list scan. trap_pos must not be edited in place
+    after this is called.
+    """
+    trap_pos = superdata.get("trap_pos") if superdata else None
+    if not trap_pos:
+        return NO_TRAPS
+    
+    entry = _trap_cells_cache.get(id(trap_pos))
+    if entry is None or entry[0] is not trap_pos:
+        map_data = superdata["map_data"]
+        height, width = len(map_data), len(map_data[0])
+        trap_cells = frozenset(
+            (trap[0], trap[1]) for trap in trap_pos
+            if 1 <= trap[0] <= width and 1 <= trap[1] <= height
+        )
+        if len(_trap_cells_cache) >= TRAP_CELLS_CACHE_SIZE:
+            _trap_cells_cache.pop(next(iter(_trap_cells_cache)))
+        entry = (trap_pos, trap_cells)
+        _trap_cells_cache[id(trap_pos)] = entry
+    return entry[1]
+
+def is_trap(superdata: list, position: tuple) -> bool:
+    """
+    Check if a position contains a trap.  
+    """
+    # Most levels have no trap at all
+    if not superdata["trap_pos"]:
+        return False
+    return (position[0], position[1]) in get_trap_cells(superdata)
+
+def is_lose(superdata: list, player_position: tuple, zombie_positions: list = [], scorpion_positions: list = []) -> bool:
+    """
+    Check if player is caught by zombie or scorpion.  
+    """
+    # Check traps
+    if is_trap(superdata, player_position):
+        return True
+    
+    # Check zombies
+    if zombie_positions:
+        for zombie_info in zombie_positions:
+            if player_position == (zombie_info[0], zombie_info[1]):
+                return True
+    
+    # Check scorpions
+    if scorpion_positions:
+        for scorpion_info in scorpion_positions:  
+            if player_position == (scorpion_info[0], scorpion_info[1]):
+                return True
+    
+    return False
+
+#==============================================================================
+#                         ENEMY STEPS
+#==============================================================================
+
+def try_move(game_map: list, current_pos: tuple, direction: str, delta_x: int, delta_y:  int, 
+             gate_opened: bool = False, superdata: dict = None, wall_board: WallBoard = None) -> tuple:
+    """
+    Attempts to move in a specific direction considering walls and gates.
+    Returns the new coordinate if linked, otherwise returns the current coordinate.
+    
+    Args:
+        game_map: Map data matrix
+        current_pos: Current position (x, y) in 1-indexed coordinates
+        direction: Direction constant (UP/DOWN/LEFT/RIGHT)
+        delta_x: Change in x coordinate
+        delta_y: Change in y coordinate
+        gate_opened:  Whether gate is currently opened
+        superdata: Full map data including gate_pos, key_pos, trap_pos
+        wall_board: Compiled walls of game_map (looked up from the cache if None)
+    
+    Returns:
+        tuple: New position if move is valid, otherwise current position
+    """
+    if wall_board is None:
+        wall_board = get_wall_board(game_map, superdata.get("gate_pos") if superdata else None)
+    if wall_board.can_move(current_pos[0], current_pos[1], direction, gate_opened):
+        return (current_pos[0] + delta_x, current_pos[1] + delta_y)
+    return current_pos
+
+def get_horizontal_direction(zombie_x: int, player_x: int) -> tuple:
+    """
+    Determines the horizontal direction towards the player.
+    Returns:  (direction_constant, delta_x, delta_y)
+    """
+    if zombie_x > player_x:  
+        return LEFT, -1, 0  # Move Left
+    if zombie_x < player_x:  
+        return RIGHT, 1, 0  # Move Right
+    
+    return None, 0, 0       # Same column
+
+def get_vertical_direction(zombie_y: int, player_y: int) -> tuple:
+    """
+    Determines the vertical direction towards the player.
+    Returns: (direction_constant, delta_x, delta_y)
+    """
+    if zombie_y > player_y: 
+        return UP, 0, -1    # Move Up
+    if zombie_y < player_y: 
+        return DOWN, 0, 1   # Move Down
+    
+    return None, 0, 0       # Same row
+
+#==============================================================================
+#                         ZOMBIE MOVEMENT SYSTEM
+#==============================================================================
+
+def generate_next_zombie_positions(
+    map_data: list = [], 
+    current_zombie_positions: list = [], 
+    current_player_position: tuple = (), 
+    gate_opened: bool = False, 
+    superdata: dict = None, 
+    show_list: bool = False
+) -> list:
+    """
+    Generate next positions for all zombies considering walls, gates, and player position.
+    
+    Args:
+        map_data: Map data matrix
+        current_zombie_positions:  List of zombie tuples [(x, y, type), ...]
+        current_player_position: Player position (x, y)
+        gate_opened: Current state of gate (True = open, False = closed)
+        superdata: Full map data including gate_pos, key_pos, trap_pos
+        show_list:  If True, return movement directions; if False, return positions
+    
+    Returns:
+        List of next zombie positions or movement directions
+    
+    Zombie Types:
+        Type 0: Vertical priority, dumb (freezes if blocked vertically)
+        Type 1: Horizontal priority, dumb (freezes if blocked horizontally)
+        Type 2: Vertical priority, smart (tries horizontal if blocked vertically)
+        Type 3: Horizontal priority, smart (tries vertical if blocked horizontally)
+    """
+
+    def generate_type_0(
+        map_data: list, 
+        current_zombie_position: tuple, 
+        current_player_position: tuple,
+        gate_opened: bool,
+        superdata: dict,
+        show_list: bool = False
+    ) -> tuple:
+        """
+        Type 0 Zombie:  Vertical Priority, Dumb AI
+        - Speed: 2 steps per turn
+        - Behavior: Prioritizes vertical movement (UP/DOWN)
+        - Weakness: Freezes if blocked vertically, won't try horizontal
+        """
+        zombie_pos = current_zombie_position
+        move_list = []
+        
+        # Determine initial direction
+        move_dir, dx, dy = get_vertical_direction(zombie_pos[1], current_player_position[1])
+        
+        # Move up to 2 steps
+        for _ in range(2):
+            z_x, z_y = zombie_pos
+            p_x, p_y = current_player_position
+
+            # Stop if caught player
+            if zombie_pos == current_player_position:
+                break
+
+            new_pos = zombie_pos
+
+            # CASE 1: Vertical Alignment Needed (Priority)
+            if z_y != p_y: 
+                # Determine vertical direction
+                if z_y > p_y: 
+                    move_dir, dx, dy = UP, 0, -1
+                else:
+                    move_dir, dx, dy = DOWN, 0, 1
+                
+                # Attempt vertical move (gate affects this!)
+                new_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+                if new_pos != zombie_pos and move_dir is not None: 
+                    move_list.append(move_dir)
+
+                # [DUMB AI] Freeze if blocked vertically
+                if new_pos == zombie_pos:
+                    break
+
+            # CASE 2: Same Row - Move Horizontally
+            else:
+                move_dir, dx, dy = get_horizontal_direction(z_x, p_x)
+                
+                if move_dir is not None: 
+                    new_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+                    if new_pos != zombie_pos: 
+                        move_list.append(move_dir)
+
+            zombie_pos = new_pos
+
+        # Add idle animation if can't move
+        if move_list == [] and move_dir is not None:
+            move_list. append(move_dir)
+
+        return move_list if show_list else zombie_pos
+        
+    def generate_type_1(
+        map_data: list,
+        current_zombie_position:  tuple,
+        current_player_position: tuple,
+        gate_opened: bool,
+        superdata: dict,
+        show_list: bool = False
+    ) -> tuple:
+        """
+        Type 1 Zombie: Horizontal Priority, Dumb AI
+        - Speed: 2 steps per turn
+        - Behavior:  Prioritizes horizontal movement (LEFT/RIGHT)
+        - Weakness:  Freezes if blocked horizontally, won't try vertical
+        """
+        zombie_pos = current_zombie_position
+        move_list = []
+
+        # Determine initial direction
+        move_dir, dx, dy = get_horizontal_direction(zombie_pos[0], current_player_position[0])
+        
+        # Move up to 2 steps
+        for _ in range(2):
+            z_x, z_y = zombie_pos
+            p_x, p_y = current_player_position
+
+            # Stop if caught player
+            if zombie_pos == current_player_position:
+                break
+
+            new_pos = zombie_pos
+
+            # CASE 1: Horizontal Alignment Needed (Priority)
+            if z_x != p_x: 
+                move_dir, dx, dy = get_horizontal_direction(z_x, p_x)
+                
+                # Attempt horizontal move
+                new_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+                if new_pos != zombie_pos and move_dir is not None: 
+                    move_list.append(move_dir)
+                    
+                # [DUMB AI] Freeze if blocked horizontally
+                if new_pos == zombie_pos:
+                    break
+
+            # CASE 2: Same Column - Move Vertically
+            else:
+                move_dir, dx, dy = get_vertical_direction(z_y, p_y)
+                
+                if move_dir is not None: 
+                    new_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+                    if new_pos != zombie_pos:
+                        move_list.append(move_dir)
+
+            zombie_pos = new_pos
+
+        # Add idle animation if can't move
+        if move_list == [] and move_dir is not None:
+            move_list.append(move_dir)
+
+        return move_list if show_list else zombie_pos
+    
+    def generate_type_2(
+        map_data: list,
+        current_zombie_position: tuple,
+        current_player_position: tuple,
+        gate_opened: bool,
+        superdata: dict,
+        show_list: bool = False
+    ) -> tuple:
+        """
+        Type 2 Zombie:  Vertical Priority, Smart AI
+        - Speed: 2 steps per turn
+        - Behavior: Prioritizes vertical movement (UP/DOWN)
+        - Intelligence: If blocked vertically, tries horizontal (sliding)
+        """
+        zombie_pos = current_zombie_position
+        move_list = []
+
+        # Determine initial direction
+        move_dir, dx, dy = get_vertical_direction(zombie_pos[1], current_player_position[1])
+
+        # Move up to 2 steps
+        for _ in range(2):
+            z_x, z_y = zombie_pos
+            p_x, p_y = current_player_position
+
+            if zombie_pos == current_player_position:
+                break
+
+            new_pos = zombie_pos
+
+            # CASE 1: Vertical Alignment Needed (Priority)
+            if z_y != p_y:
+                move_dir, dx, dy = get_vertical_direction(z_y, p_y)
+                
+                # Try vertical move first (gate may block this!)
+                attempt_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+
+                if attempt_pos != zombie_pos:
+                    # Vertical move succeeded
+                    new_pos = attempt_pos
+                    if move_dir is not None: 
+                        move_list.append(move_dir)
+                else:
+                    # [SMART AI] Blocked vertically -> Try horizontal slide
+                    h_dir, h_dx, h_dy = get_horizontal_direction(z_x, p_x)
+                    
+                    if h_dir is not None:
+                        new_pos = try_move(map_data, zombie_pos, h_dir, h_dx, h_dy, gate_opened, superdata, wall_board)
+                        if new_pos != zombie_pos:
+                            move_list.append(h_dir)
+
+            # CASE 2: Same Row - Move Horizontally
+            else: 
+                move_dir, dx, dy = get_horizontal_direction(z_x, p_x)
+                if move_dir is not None: 
+                    new_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+                    if new_pos != zombie_pos:
+                        move_list.append(move_dir)
+
+            zombie_pos = new_pos
+
+        # Add idle animation if can't move
+        if move_list == [] and move_dir is not None:
+            move_list.append(move_dir)
+
+        return move_list if show_list else zombie_pos
+    
+    def generate_type_3(
+        map_data:  list,
+        current_zombie_position: tuple,
+        current_player_position: tuple,
+        gate_opened: bool,
+        superdata: dict,
+        show_list: bool = False
+    ) -> tuple:
+        """
+        Type 3 Zombie:  Horizontal Priority, Smart AI
+        - Speed: 2 steps per turn
+        - Behavior:  Prioritizes horizontal movement (LEFT/RIGHT)
+        - Intelligence: If blocked horizontally, tries vertical (sliding)
+        """
+        zombie_pos = current_zombie_position
+        move_list = []
+
+        # Determine initial direction
+        move_dir, dx, dy = get_horizontal_direction(zombie_pos[0], current_player_position[0])
+
+        # Move up to 2 steps
+        for _ in range(2):
+            z_x, z_y = zombie_pos
+            p_x, p_y = current_player_position
+
+            if zombie_pos == current_player_position:
+                break
+
+            new_pos = zombie_pos
+
+            # CASE 1: Horizontal Alignment Needed (Priority)
+            if z_x != p_x:
+                move_dir, dx, dy = get_horizontal_direction(z_x, p_x)
+                
+                # Try horizontal move first
+                attempt_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+
+                if attempt_pos != zombie_pos:
+                    # Horizontal move succeeded
+                    new_pos = attempt_pos
+                    if move_dir is not None:
+                        move_list. append(move_dir)
+                else:
+                    # [SMART AI] Blocked horizontally -> Try vertical slide
+                    v_dir, v_dx, v_dy = get_vertical_direction(z_y, p_y)
+                    
+                    if v_dir is not None:
+                        new_pos = try_move(map_data, zombie_pos, v_dir, v_dx, v_dy, gate_opened, superdata, wall_board)
+                        if new_pos != zombie_pos: 
+                            move_list.append(v_dir)
+
+            # CASE 2: Same Column - Move Vertically
+            else: 
+                move_dir, dx, dy = get_vertical_direction(z_y, p_y)
+                if move_dir is not None:
+                    new_pos = try_move(map_data, zombie_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+                    if new_pos != zombie_pos: 
+                        move_list.append(move_dir)
+
+            zombie_pos = new_pos
+
+        # Add idle animation if can't move
+        if move_list == [] and move_dir is not None: 
+            move_list.append(move_dir)
+
+        return move_list if show_list else zombie_pos
+
+    #--------------------------------------------------------#
+    #----- Main Logic:  Process All Zombies -----#
+    #--------------------------------------------------------#
+    
+    # Walls are compiled once per map, every try_move below reuses them
+    wall_board = get_wall_board(map_data, superdata.get("gate_pos") if superdata else None)
+    
+    next_zombie_pos = []
+    move_list = []
+
+    for zombie_info in current_zombie_positions: 
+        current_zombie_position = (zombie_info[0], zombie_info[1])
+        zombie_type = zombie_info[2]
+
+        # Dispatch to appropriate AI type
+        if zombie_type == 0:
+            result = generate_type_0(map_data, current_zombie_position, current_player_position, gate_opened, superdata, show_list)
+        elif zombie_type == 1:
+            result = generate_type_1(map_data, current_zombie_position, current_player_position, gate_opened, superdata, show_list)
+        elif zombie_type == 2:
+            result = generate_type_2(map_data, current_zombie_position, current_player_position, gate_opened, superdata, show_list)
+        elif zombie_type == 3:
+            result = generate_type_3(map_data, current_zombie_position, current_player_position, gate_opened, superdata, show_list)
+        else:
+            continue  # Invalid zombie type
+        
+        if show_list:
+            move_list += result
+        else:
+            next_zombie_pos. append(result + (zombie_type,))
+    
+    return move_list if show_list else next_zombie_pos
+
+
+#==============================================================================
+#                        SCORPION MOVEMENT SYSTEM
+#==============================================================================
+
+def generate_next_scorpion_positions(
+    map_data: list = [], 
+    current_scorpion_positions: list = [], 
+    current_player_position: tuple = (),
+    gate_opened: bool = False,
+    superdata:  dict = None,
+    show_list: bool = False
+) -> list:
+    """
+    Generate next positions for all scorpions considering walls, gates, and player position. 
+    
+    Args:
+        map_data: Map data matrix
+        current_scorpion_positions: List of scorpion tuples [(x, y, intelligence_level), ...]
+        current_player_position: Player position (x, y)
+        gate_opened:  Current state of gate (True = open, False = closed)
+        superdata: Full map data including gate_pos, key_pos, trap_pos
+        show_list: If True, return movement directions; if False, return positions
+    
+    Returns:
+        List of next scorpion positions or movement directions
+    
+    Scorpion Types: 
+        Type 0: Vertical priority, dumb (freezes if blocked vertically)
+        Type 1: Horizontal priority, dumb (freezes if blocked horizontally)
+        Type 2: Vertical priority, smart (tries horizontal if blocked vertically)
+        Type 3: Horizontal priority, smart (tries vertical if blocked horizontally)
+    """
+    
+    def generate_type_0(
+        map_data: list,
+        current_scorpion_position: tuple,
+        current_player_position: tuple,
+        gate_opened: bool,
+        superdata: dict,
+        show_list: bool = False
+    ) -> tuple:
+        """
+        Type 0 Scorpion: Vertical Priority, Dumb AI
+        - Speed: 1 step per turn
+        - Behavior: Prioritizes vertical movement (UP/DOWN)
+        - Weakness: Freezes if blocked vertically
+        """
+        scorpion_pos = current_scorpion_position
+        move_list = []
+        
+        move_dir, dx, dy = get_vertical_direction(scorpion_pos[1], current_player_position[1])
+
+        s_x, s_y = scorpion_pos
+        p_x, p_y = current_player_position
+
+        if scorpion_pos == current_player_position:
+            return move_list if show_list else scorpion_pos
+
+        new_pos = scorpion_pos
+
+        # CASE 1: Vertical Alignment Needed
+        if s_y != p_y:
+            if s_y > p_y: 
+                move_dir, dx, dy = UP, 0, -1
+            else:
+                move_dir, dx, dy = DOWN, 0, 1
+            
+            new_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+            if new_pos != scorpion_pos and move_dir is not None: 
+                move_list.append(move_dir)
+
+        # CASE 2: Same Row (Horizontal Alignment)
+        else:
+            move_dir, dx, dy = get_horizontal_direction(s_x, p_x)
+            
+            if move_dir is not None:
+                new_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+                if new_pos != scorpion_pos:
+                    move_list. append(move_dir)
+
+        if move_list == [] and move_dir is not None:
+            move_list.append(move_dir)
+
+        return move_list if show_list else new_pos
+        
+    def generate_type_1(
+        map_data: list,
+        current_scorpion_position: tuple,
+        current_player_position: tuple,
+        gate_opened: bool,
+        superdata: dict,
+        show_list: bool = False
+    ) -> tuple:
+        """
+        Type 1 Scorpion: Horizontal Priority, Dumb AI
+        - Speed:  1 step per turn
+        - Behavior: Prioritizes horizontal movement (LEFT/RIGHT)
+        - Weakness: Freezes if blocked horizontally
+        """
+        scorpion_pos = current_scorpion_position
+        move_list = []
+        
+        move_dir, dx, dy = get_horizontal_direction(scorpion_pos[0], current_player_position[0])
+
+        s_x, s_y = scorpion_pos
+        p_x, p_y = current_player_position
+
+        if scorpion_pos == current_player_position:
+            return move_list if show_list else scorpion_pos
+
+        new_pos = scorpion_pos
+
+        # CASE 1: Horizontal Alignment Needed (Priority)
+        if s_x != p_x:
+            move_dir, dx, dy = get_horizontal_direction(s_x, p_x)
+            
+            new_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+            if new_pos != scorpion_pos and move_dir is not None: 
+                move_list.append(move_dir)
+
+        # CASE 2: Same Column (Vertical Alignment)
+        else:
+            move_dir, dx, dy = get_vertical_direction(s_y, p_y)
+            
+            if move_dir is not None:
+                new_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+                if new_pos != scorpion_pos:
+                    move_list.append(move_dir)
+
+        if move_list == [] and move_dir is not None: 
+            move_list.append(move_dir)
+
+        return move_list if show_list else new_pos
+    
+    def generate_type_2(
+        map_data: list,
+        current_scorpion_position: tuple,
+        current_player_position: tuple,
+        gate_opened: bool,
+        superdata:  dict,
+        show_list:  bool = False
+    ) -> tuple:
+        """
+        Type 2 Scorpion:  Vertical Priority, Smart AI
+        - Speed: 1 step per turn
+        - Behavior: Prioritizes vertical movement (UP/DOWN)
+        - Intelligence: If blocked vertically, tries horizontal
+        """
+        scorpion_pos = current_scorpion_position
+        move_list = []
+        
+        move_dir, dx, dy = get_vertical_direction(scorpion_pos[1], current_player_position[1])
+
+        s_x, s_y = scorpion_pos
+        p_x, p_y = current_player_position
+
+        if scorpion_pos == current_player_position: 
+            return move_list if show_list else scorpion_pos
+
+        new_pos = scorpion_pos
+
+        # CASE 1: Vertical Alignment Needed (Priority)
+        if s_y != p_y:
+            move_dir, dx, dy = get_vertical_direction(s_y, p_y)
+            
+            attempt_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+
+            if attempt_pos != scorpion_pos:
+                new_pos = attempt_pos
+                if move_dir is not None: 
+                    move_list.append(move_dir)
+            else:
+                # [SMART AI] Blocked Vertically -> Try Horizontal
+                h_dir, h_dx, h_dy = get_horizontal_direction(s_x, p_x)
+                
+                if h_dir is not None: 
+                    new_pos = try_move(map_data, scorpion_pos, h_dir, h_dx, h_dy, gate_opened, superdata, wall_board)
+                    if new_pos != scorpion_pos:
+                        move_list.append(h_dir)
+
+        # CASE 2: Same Row (Horizontal only)
+        else:
+            move_dir, dx, dy = get_horizontal_direction(s_x, p_x)
+            if move_dir is not None: 
+                new_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+                if new_pos != scorpion_pos: 
+                    move_list.append(move_dir)
+
+        if move_list == [] and move_dir is not None:
+            move_list.append(move_dir)
+
+        return move_list if show_list else new_pos
+    
+    def generate_type_3(
+        map_data: list,
+        current_scorpion_position: tuple,
+        current_player_position: tuple,
+        gate_opened: bool,
+        superdata: dict,
+        show_list: bool = False
+    ) -> tuple:
+        """
+        Type 3 Scorpion: Horizontal Priority, Smart AI
+        - Speed: 1 step per turn
+        - Behavior: Prioritizes horizontal movement (LEFT/RIGHT)
+        - Intelligence: If blocked horizontally, tries vertical
+        """
+        scorpion_pos = current_scorpion_position
+        move_list = []
+        
+        move_dir, dx, dy = get_horizontal_direction(scorpion_pos[0], current_player_position[0])
+
+        s_x, s_y = scorpion_pos
+        p_x, p_y = current_player_position
+
+        if scorpion_pos == current_player_position: 
+            return move_list if show_list else scorpion_pos
+
+        new_pos = scorpion_pos
+
+        # CASE 1: Horizontal Alignment Needed (Priority)
+        if s_x != p_x: 
+            move_dir, dx, dy = get_horizontal_direction(s_x, p_x)
+            
+            attempt_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+
+            if attempt_pos != scorpion_pos:
+                new_pos = attempt_pos
+                if move_dir is not None: 
+                    move_list.append(move_dir)
+            else:
+                # [SMART AI] Blocked Horizontally -> Try Vertical
+                v_dir, v_dx, v_dy = get_vertical_direction(s_y, p_y)
+                
+                if v_dir is not None:
+                    new_pos = try_move(map_data, scorpion_pos, v_dir, v_dx, v_dy, gate_opened, superdata, wall_board)
+                    if new_pos != scorpion_pos: 
+                        move_list.append(v_dir)
+
+        # CASE 2: Same Column (Vertical only)
+        else:
+            move_dir, dx, dy = get_vertical_direction(s_y, p_y)
+            if move_dir is not None:
+                new_pos = try_move(map_data, scorpion_pos, move_dir, dx, dy, gate_opened, superdata, wall_board)
+                if new_pos != scorpion_pos:
+                    move_list.append(move_dir)
+
+        if move_list == [] and move_dir is not None: 
+            move_list.append(move_dir)
+
+        return move_list if show_list else new_pos
+
+    #----------------------------------------------------------#
+    #----- Main Logic: Process All Scorpions -----#
+    #----------------------------------------------------------#
+    
+    # Walls are compiled once per map, every try_move below reuses them
+    wall_board = get_wall_board(map_data, superdata.get("gate_pos") if superdata else None)
+    
+    next_scorpion_pos = []
+    move_list = []
+
+    for scorpion_info in current_scorpion_positions:
+        current_scorpion_position = (scorpion_info[0], scorpion_info[1])
+        intelligence_level = scorpion_info[2]
+
+        # Dispatch to appropriate AI type
+        if intelligence_level == 0:
+            result = generate_type_0(map_data, current_scorpion_position, current_player_position, gate_opened, superdata, show_list)
+        elif intelligence_level == 1:
+            result = generate_type_1(map_data, current_scorpion_position, current_player_position, gate_opened, superdata, show_list)
+        elif intelligence_level == 2:
+            result = generate_type_2(map_data, current_scorpion_position, current_player_position, gate_opened, superdata, show_list)
+        elif intelligence_level == 3:
+            result = generate_type_3(map_data, current_scorpion_position, current_player_position, gate_opened, superdata, show_list)
+        else:
+            continue  # Invalid scorpion type
+
+        if show_list:
+            move_list += result
+        else:
+            next_scorpion_pos.append(result + (intelligence_level,))
+            
+    return move_list if show_list else next_scorpion_pos
+
+
+def resolve_same_kind(enemies: list) -> list:
+    """
+    Merge enemies of one kind that ended on the same cell.
+
+    The one with the highest type / intelligence level survives, on a tie the
+    first one in the list. Survivors keep their order.
+    """
+    if len(enemies) < 2:
+        return enemies
+    
+    # Usual case: every enemy on its own cell
+    if len({(enemy[0], enemy[1]) for enemy in enemies}) == len(enemies):
+        return enemies
+    
+    # cell -> index of the enemy currently kept there
+    survivors = {}
+    for index, enemy in enumerate(enemies):
+        cell = (enemy[0], enemy[1])
+        kept = survivors.get(cell)
+        if kept is None or enemy[2] > enemies[kept][2]:
+            survivors[cell] = index
+    
+    return [enemy for index, enemy in enumerate(enemies) if survivors[(enemy[0], enemy[1])] == index]
+
+def resolve_collisions(next_zombie_positions: list, next_scorpion_positions: list, superdata = None,
+                       trap_cells: frozenset = None) -> Tuple:
+    """
+    Resolve enemy collisions after the enemies moved.
+
+    1. Two zombies (or two scorpions) on one cell -> higher type survives
+    2. Enemies standing on a trap die
+    3. A zombie and a scorpion on one cell -> both die
+
+    Enemies only need (x, y, type) as their first items, extra items are
+    kept (the game loop appends the sprite index).
+
+    Args:
+        trap_cells: get_trap_cells(superdata), when the caller already has it
+
+    Returns:
+        (zombies, scorpions) left alive, clashes: number of merges, trap
+        deaths and zombie / scorpion pairs (the game rewards each one)
+    """
+    zombie_count = len(next_zombie_positions)
+    scorpion_count = len(next_scorpion_positions)
+
+    # Check if two zombies / two scorpions are in a same position
+    next_zombie_positions = resolve_same_kind(next_zombie_positions)
+    next_scorpion_positions = resolve_same_kind(next_scorpion_positions)
+
+    # check if any zombie / scorpion is in trap, if yes remove it
+    if trap_cells is None:
+        trap_cells = get_trap_cells(superdata)
+    if trap_cells:
+        if next_zombie_positions:
+            next_zombie_positions = [zombie for zombie in next_zombie_positions if (zombie[0], zombie[1]) not in trap_cells]
+        if next_scorpion_positions:
+            next_scorpion_positions = [scorpion for scorpion in next_scorpion_positions if (scorpion[0], scorpion[1]) not in trap_cells]
+    clashes = zombie_count + scorpion_count - len(next_zombie_positions) - len(next_scorpion_positions)
+
+    # Check if any zombie and scorpion in same position, if yes remove both
+    # (at most one of each kind is left per cell, so pairs are unique)
+    if next_zombie_positions and next_scorpion_positions:
+        shared_cells = {(zombie[0], zombie[1]) for zombie in next_zombie_positions}.intersection(
+            [(scorpion[0], scorpion[1]) for scorpion in next_scorpion_positions]
+        )
+        if shared_cells:
+            clashes += len(shared_cells)
+            next_zombie_positions = [zombie for zombie in next_zombie_positions if (zombie[0], zombie[1]) not in shared_cells]
+            next_scorpion_positions = [scorpion for scorpion in next_scorpion_positions if (scorpion[0], scorpion[1]) not in shared_cells]
+
+    return next_zombie_positions, next_scorpion_positions, clashes
+
+def check_same_pos(next_zombie_positions: list, next_scorpion_positions: list, superdata = None,
+                   trap_cells: frozenset = None) -> Tuple:
+    """
+    Resolve enemy collisions after the enemies moved (see resolve_collisions).
+
+    Returns:
+        (zombies, scorpions) left alive
+    """
+    next_zombie_positions, next_scorpion_positions, _ = resolve_collisions(
+        next_zombie_positions, next_scorpion_positions, superdata, trap_cells
+    )
+    return next_zombie_positions, next_scorpion_positions
+
+#==============================================================================
+#                         KEY, GATE AND WINNING
+#==============================================================================
+
+def normalize_position(position) -> tuple:
+    """
+    Convert a position from level data to an (x, y) tuple.
+    Accepts [x, y], (x, y) and the wrapped form [[x, y]] used by a few levels.
+    Returns None when the position is empty.
+    """
+    if not position:
+        return None
+    if isinstance(position[0], (list, tuple)):
+        position = position[0]
+    return (position[0], position[1])
+
+def toggle_gate(key_pos: Optional[tuple], player_position: tuple, gate_opened: bool) -> bool:
+    """
+    Return the gate state after the player's move ended on player_position.
+
+    Every move ending on the key flips the gate, a wait on the key included.
+    key_pos is normalize_position(superdata["key_pos"]) (None: no key).
+    """
+    if key_pos and (player_position[0], player_position[1]) == key_pos:
+        return not gate_opened
+    return gate_opened
+
+def is_win(player_position: tuple, winning_position: Optional[tuple]) -> bool:
+    """
+    Check if the player stands on the cell in front of the stairs.
+    winning_position is the first item returned by levels.get_winning_position.
+    """
+    return bool(winning_position) and (player_position[0], player_position[1]) == (winning_position[0], winning_position[1])
+
+
+#==============================================================================
+#                         ONE WHOLE TURN
+#==============================================================================
+
+# Outcome of a turn returned by LevelRules.step
+ONGOING = 'ONGOING'
+WIN = 'WIN'
+LOSE = 'LOSE'
+
+# Player position to add for each direction
+DIRECTION_DELTAS = {UP: (0, -1), DOWN: (0, 1), LEFT: (-1, 0), RIGHT: (1, 0)}
+
+
+class TurnState(NamedTuple):
+    """
+    Everything that changes during a game, as plain immutable data.
+
+    Attributes:
+        player: Player position (x, y)
+        gate_opened: Gate state (always False on levels without a gate)
+        zombies: ((x, y, type), ...)
+        scorpions: ((x, y, intelligence_level), ...)
+    """
+    player: Tuple[int, int]
+    gate_opened: bool
+    zombies: tuple
+    scorpions: tuple
+
+
+def resolve_turn(superdata: dict, player_position: tuple, gate_opened: bool, key_pos: Optional[tuple],
+                 zombie_list: list, scorpion_list: list, trap_cells: frozenset = None) -> Tuple:
+    """
+    Play the rest of a turn once the player ended its move on player_position.
+
+    The key toggles the gate first, the enemies move with the NEW gate state,
+    then collisions and trap deaths are resolved.
+
+    Returns:
+        (new_gate_opened, zombies, scorpions, clashes), see resolve_collisions
+    """
+    gate_opened = toggle_gate(key_pos, player_position, gate_opened)
+    map_data = superdata["map_data"]
+
+    new_zombie_positions = generate_next_zombie_positions(
+        map_data=map_data,
+        current_zombie_positions=zombie_list,
+        current_player_position=player_position,
+        gate_opened=gate_opened,
+        superdata=superdata
+    ) if zombie_list else []
+
+    new_scorpion_positions = generate_next_scorpion_positions(
+        map_data=map_data,
+        current_scorpion_positions=scorpion_list,
+        current_player_position=player_position,
+        gate_opened=gate_opened,
+        superdata=superdata
+    ) if scorpion_list else []
+
+    new_zombie_positions, new_scorpion_positions, clashes = resolve_collisions(
+        new_zombie_positions, new_scorpion_positions, superdata, trap_cells
+    )
+    return gate_opened, new_zombie_positions, new_scorpion_positions, clashes
+
+
+class LevelRules:
+    """
+    Static data of one level needed to play turns with step().
+
+    Attributes:
+        superdata: Original level dictionary
+        key_pos: Key position (x, y) or None
+        trap_cells: Trap positions as a frozenset of (x, y)
+        wall_board: WallBoard of the level
+        winning_position: Cell in front of the stairs (x, y) or None
+        goal_direction: Direction to press on winning_position to win
+    """
+
+    def __init__(self, superdata: dict, winning_position: Optional[tuple] = None,
+                 goal_direction: Optional[str] = None) -> None:
+        self.superdata = superdata
+        self.key_pos = normalize_position(superdata.get("key_pos", []))
+        self.trap_cells = get_trap_cells(superdata)
+        self.wall_board = get_wall_board(superdata["map_data"], superdata.get("gate_pos"))
+        self.winning_position = normalize_position(winning_position)
+        self.goal_direction = goal_direction
+
+    def initial_state(self, player_start, zombie_starts=None, scorpion_starts=None,
+                      gate_opened: bool = False) -> TurnState:
+        """Build the TurnState of a level start from level data lists."""
+        return TurnState(
+            (player_start[0], player_start[1]),
+            gate_opened,
+            tuple((zombie[0], zombie[1], zombie[2]) for zombie in zombie_starts or ()),
+            tuple((scorpion[0], scorpion[1], scorpion[2]) for scorpion in scorpion_starts or ()),
+        )
+
+    def step(self, state: TurnState, player_move: Optional[str]) -> Tuple[TurnState, str]:
+        """
+        Play one complete turn.
+
+        Args:
+            state: State before the turn
+            player_move: UP / DOWN / LEFT / RIGHT, or None to wait. A move
+                         blocked by a wall or the closed gate is a wait too
+
+        Returns:
+            (state after the turn, ONGOING / WIN / LOSE). On WIN (goal
+            direction pressed on the winning cell) the state is unchanged.
+        """
+        player = state.player
+        if player_move is not None:
+            if player_move == self.goal_direction and is_win(player, self.winning_position):
+                return state, WIN
+            if self.wall_board.can_move(player[0], player[1], player_move, state.gate_opened):
+                delta_x, delta_y = DIRECTION_DELTAS[player_move]
+                player = (player[0] + delta_x, player[1] + delta_y)
+
+        if player in self.trap_cells:
+            return state._replace(player=player), LOSE
+
+        gate_opened, zombies, scorpions, _ = resolve_turn(
+            self.superdata, player, state.gate_opened, self.key_pos,
+            state.zombies, state.scorpions, self.trap_cells
+        )
+        next_state = TurnState(player, gate_opened, tuple(zombies), tuple(scorpions))
+
+        if is_lose(self.superdata, player, zombies, scorpions):
+            return next_state, LOSE
+        return next_state, ONGOING
@@ -0,0 +1,93 @@
+import time
+from typing import Callable, Optional
+
+
+class SearchStats:
+    """
+    Counters and timings of one Shortest_Path call, for tuning the solver and
+    comparing runs per level.
+
+    Pass an instance as Shortest_Path(..., stats=stats). It is filled in place
+    and, if on_finish is given, on_finish(stats) is called once the search
+    returns (also when it was cancelled or hit the iteration cap).
+
+    Timings (seconds, time.perf_counter):
+        graph_time   looking up the player moves in the precompiled graph
+        enemy_time   simulating zombies / scorpions and enemy collisions
+        dedupe_time  packing successor states and checking them against the
+                     visited states (and the heap / queue pushes)
+        search_time  whole search, from the first dequeued state to the return
+    SEARCH_PARALLEL_BFS only measures the coordinator: enemy_time is the wall
+    time of the shards expanding, dedupe_time the time of them deduping.
+    """
+
+    def __init__(self, on_finish: Optional[Callable[["SearchStats"], None]] = None) -> None:
+        self.on_finish = on_finish
+
+        self.algorithm: Optional[str] = None
+        self.answered_from: Optional[str] = None  # "search", "move_table", "cache" or "input"
+
+        self.states_expanded = 0
+        self.states_pruned = 0  # dropped by prune_dead_states before being queued
+        self.peak_queue_size = 0
+        self.peak_visited_size = 0
+        self.max_depth = 0
+        self.hit_iteration_cap = False
+        self.hit_memory_limit = False  # SEARCH_IDA replaced table entries (searched again)
+        self.cancelled = False
+        self.path_length: Optional[int] = None  # turns of the returned path, None if no path
+
+        self.graph_time = 0.0
+        self.enemy_time = 0.0
+        self.dedupe_time = 0.0
+        self.search_time = 0.0
+
+        self.__started: Optional[float] = None
+
+    def start(self, algorithm: str) -> None:
+        """Called by the search right before its main loop."""
+        self.algorithm = algorithm
+        self.answered_from = "search"
+        self.__started = time.perf_counter()
+
+    def finish(self, path: list, answered_from: Optional[str] = None) -> list:
+        """Record the result, notify on_finish and return 'path' unchanged."""
+        if answered_from is not None:
+            self.answered_from = answered_from
+        if self.__started is not None:
+            self.search_time = time.perf_counter() - self.__started
+        self.path_length = len(path) - 1 if path else None
+
+        if self.on_finish is not None:
+            self.on_finish(self)
+        return path
+
+    def as_dict(self) -> dict:
+        """Plain values, e.g. to dump per-level stats as JSON."""
+        return {
+            "algorithm": self.algorithm,
+            "answered_from": self.answered_from,
+            "states_expanded": self.states_expanded,
+            "states_pruned": self.states_pruned,
+            "peak_queue_size": self.peak_queue_size,
+            "peak_visited_size": self.peak_visited_size,
+            "max_depth": self.max_depth,
+            "hit_iteration_cap": self.hit_iteration_cap,
+            "hit_memory_limit": self.hit_memory_limit,
+            "cancelled": self.cancelled,
+            "path_length": self.path_length,
+            "graph_time": self.graph_time,
+            "enemy_time": self.enemy_time,
+            "dedupe_time": self.dedupe_time,
+            "search_time": self.search_time,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"SearchStats({self.algorithm}: {self.states_expanded} expanded, {self.states_pruned} pruned, "
+            f"queue {self.peak_queue_size}, visited {self.peak_visited_size}, "
+            f"depth {self.max_depth}, path {self.path_length}, "
+            f"cap {'hit' if self.hit_iteration_cap else 'ok'}, "
+            f"graph {self.graph_time:.3f}s enemy {self.enemy_time:.3f}s "
+            f"dedupe {self.dedupe_time:.3f}s total {self.search_time:.3f}s)"
+        )
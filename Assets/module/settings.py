@@ -1,5 +1,3 @@
-import pygame
-
 # Direction constants
 RIGHT = "RIGHT"
 LEFT = "LEFT"
@@ -28,6 +26,11 @@ MARGIN_BACKDROP_Y = (SCREEN_HEIGHT - BACKDROP_HEIGHT) // 2
 MARGIN_LEFT = 88 + MARGIN_BACKDROP_X
 MARGIN_TOP = 106 + MARGIN_BACKDROP_Y
 
+# HINT SOLVER
+# Most solver states kept in memory per hint (None = no limit). Above it the
+# hint switches to the low-memory IDA* search, set it on low-RAM machines.
+HINT_MEMORY_LIMIT = None
+
 
 # -----------------------------------------------------------------------------#
 # ---------------------------------- MAIN LOBBY -------------------------------#
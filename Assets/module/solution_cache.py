@@ -0,0 +1,169 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+
+# Bump when the packed state layout (CompiledBoard.encode_state) changes,
+# so old cache files on disk are ignored instead of giving wrong hints.
+CACHE_FORMAT_VERSION = 1
+
+
+def level_fingerprint(superdata: dict, goal: tuple) -> str:
+    """Hash of everything a cached solution depends on (walls, traps, key, gate, goal)."""
+    content = json.dumps(
+        [
+            CACHE_FORMAT_VERSION,
+            superdata.get("map_data", []),
+            superdata.get("trap_pos", []),
+            superdata.get("key_pos", []),
+            superdata.get("gate_pos", []),
+            list(goal),
+        ]
+    )
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def load_level_cache(level_index: int, superdata: dict, goal: tuple, on_disk: bool = True) -> "SolutionCache":
+    """Create the cache of a level, backed by assets/save/hint_cache_<level>.json if on_disk."""
+    file_path = os.path.join("assets", "save", f"hint_cache_{level_index}.json") if on_disk else None
+    cache = SolutionCache(level_fingerprint(superdata, goal), file_path=file_path)
+    cache.load()
+    return cache
+
+
+class SolutionCache:
+    """
+    Per-level memory of solved states for instant repeated hints.
+
+    Maps a packed solver state (see CompiledBoard.encode_state: player
+    position, gate state, zombies, scorpions) to:
+        (next player position, remaining turns to win, next packed state)
+
+    Every state on a path found by Shortest_Path is stored, so asking again
+    from any of them (after undo, or after following the hint) is a lookup.
+    Least recently used entries are evicted past max_entries. If file_path is
+    given the cache can be loaded from / saved to disk (JSON); save() only
+    writes when something was recorded since the last load or save.
+    """
+
+    def __init__(self, fingerprint: str = "", max_entries: int = 100000, file_path: Optional[str] = None) -> None:
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.file_path = file_path
+
+        self.__entries: "OrderedDict[int, Tuple[Tuple[int, int], int, int]]" = OrderedDict()
+        self.__lock = threading.Lock()  # hints are solved on a worker thread
+        self.dirty = False  # entries changed since the last load / save
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get_next_move(self, state: int) -> Optional[Tuple[Tuple[int, int], int]]:
+        """Return (next position, remaining turns) for a state, or None if unknown."""
+        with self.__lock:
+            entry = self.__entries.get(state)
+            if entry is None:
+                return None
+            self.__entries.move_to_end(state)
+            return entry[0], entry[1]
+
+    def lookup(self, state: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Rebuild the remaining moves from 'state' to the goal.
+
+        Returns:
+            list: Next positions [(x1,y1), ..., goal] ([] if 'state' already won),
+                  or None if the state (or part of its chain) is not cached.
+        """
+        with self.__lock:
+            moves = []
+            while True:
+                entry = self.__entries.get(state)
+                if entry is None:
+                    return None
+                self.__entries.move_to_end(state)
+
+                next_position, remaining, next_state = entry
+                if remaining == 0:
+                    return moves
+                moves.append(next_position)
+                state = next_state
+
+    def record(self, states: List[int], positions: List[Tuple[int, int]]) -> None:
+        """
+        Store a solved path.
+
+        Args:
+            states: Packed states along the path, last one is the winning state
+            positions: Player position of each state (same length as states)
+        """
+        remaining = len(states) - 1
+        with self.__lock:
+            for i, state in enumerate(states):
+                if i < remaining:
+                    entry = (tuple(positions[i + 1]), remaining - i, states[i + 1])
+                else:
+                    entry = (tuple(positions[i]), 0, state)
+                self.__entries[state] = entry
+                self.__entries.move_to_end(state)
+
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+            self.dirty = True
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.dirty = True
+
+    def load(self) -> bool:
+        """Load entries from file_path. Returns False if missing, broken or for another level."""
+        if not self.file_path or not os.path.exists(self.file_path):
+            return False
+        try:
+            with open(self.file_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Hint cache could not be read: {e}")
+            return False
+
+        if data.get("fingerprint") != self.fingerprint:
+            return False
+
+        with self.__lock:
+            self.__entries.clear()
+            for state, (x, y, remaining, next_state) in data.get("entries", []):
+                self.__entries[state] = ((x, y), remaining, next_state)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+            self.dirty = False
+        return True
+
+    def save(self) -> bool:
+        """
+        Write entries to file_path (oldest first, so LRU order survives a reload).
+
+        Does nothing if no path was recorded since the last load / save.
+        """
+        if not self.file_path:
+            return False
+        with self.__lock:
+            if not self.dirty:
+                return True
+            self.dirty = False
+            entries = [
+                [state, [next_position[0], next_position[1], remaining, next_state]]
+                for state, (next_position, remaining, next_state) in self.__entries.items()
+            ]
+        data = {"fingerprint": self.fingerprint, "entries": entries}
+        try:
+            with open(self.file_path, "w") as f:
+                json.dump(data, f)
+        except OSError as e:
+            print(f"Hint cache could not be saved: {e}")
+            self.dirty = True
+            return False
+        return True
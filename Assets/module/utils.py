@@ -3,6 +3,8 @@ import os
 from typing import List, Tuple, Optional
 from .map_collection import maps_collection
 from .settings import *
+from .levels import clean_map_data, get_winning_position, load_level  # pygame-free, re-exported here
+from .rules import CAN_MOVE_BITS, WallBoard, get_wall_board, is_linked, get_face_direction  # pygame-free, re-exported here
 import pygame
 from dataclasses import dataclass
 from .settings import COLOR_BUTTON, COLOR_BUTTON_HOVER, COLOR_TEXT
@@ -10,11 +12,6 @@ from .settings import COLOR_BUTTON, COLOR_BUTTON_HOVER, COLOR_TEXT
 # --------------------------------------------------- #
 # --------------------- HELPERS --------------------- #
 # --------------------------------------------------- #
-def clean_map_data(map_data: List[List[str]]) -> List[List[str]]:
-    """Return a cleaned copy of map_data with whitespace stripped from each tile id."""
-    return [[(cell or "").strip() for cell in col] for col in map_data]
-
-
 def extract_sprite_frames(sheet: pygame.Surface, frame_width: int, frame_height: int) -> List[pygame.Surface]:
     """Extract frames from a sprite sheet given each frame's width and height."""
     sheet_width, sheet_height = sheet.get_size()
@@ -55,143 +52,6 @@ def load_and_scale_image(TILE_SIZE, filename: str = "", is_shadow: bool = False,
         return pygame.transform.smoothscale(surface, new_size)
 
 
-def is_linked(map_data: list, direction:  list, facing_direction: str, gate_opened: bool = False, superdata: dict = None) -> bool:
-    """
-    Check if can move from 'direction' in 'facing_direction' considering walls and gates.
-    
-    Args:
-        map_data: Map data matrix
-        direction: Current position [x, y]
-        facing_direction: Direction to move (UP/DOWN/LEFT/RIGHT)
-        gate_opened: Current state of gate (True = opened, False = closed)
-        superdata: Original map data containing gate_pos and key_pos
-    
-    Returns: 
-        bool: True if can move, False otherwise
-    """
-    x = direction[0]
-    y = direction[1]
-    
-    # Check if gate is blocking the path
-    if superdata and superdata.get("gate_pos") and not gate_opened:
-        gx, gy = superdata["gate_pos"]
-        
-        # Check if next position is the gate
-        if facing_direction == UP: 
-            if (x - 1, y - 2) == (gx - 1, gy - 1):
-                return False
-        elif facing_direction == DOWN:
-            if (x - 1, y - 1) == (gx - 1, gy - 1):
-                return False
-    
-    # Original wall checking logic
-    if facing_direction == UP:
-        return (y - 1 > 0) and \
-               (map_data[y - 1][x - 1] not in ['t', 'tl', 'tr', 'b*', 'l*', 'r*']) and \
-               (map_data[y - 2][x - 1] not in ['b', 'bl', 'br', 't*', 'l*', 'r*'])
-    
-    if facing_direction == DOWN:
-        return (y + 1 <= len(map_data[0])) and \
-               (map_data[y - 1][x - 1] not in ['b', 'bl', 'br', 't*', 'l*', 'r*']) and \
-               (map_data[y][x - 1] not in ['t', 'tl', 'tr', 'b*', 'l*', 'r*'])
-    
-    if facing_direction == LEFT:
-        return (x - 1 > 0) and \
-               (map_data[y - 1][x - 1] not in ['l', 'tl', 'bl', 'b*', 't*', 'r*']) and \
-               (map_data[y - 1][x - 2] not in ['r', 'br', 'tr', 't*', 'l*', 'b*'])
-    
-    if facing_direction == RIGHT:
-        return (x + 1 <= len(map_data[0])) and \
-               (map_data[y - 1][x - 1] not in ['r', 'br', 'tr', 't*', 'l*', 'b*']) and \
-               (map_data[y - 1][x] not in ['l', 'tl', 'bl', 'b*', 't*', 'r*'])
-    
-    return True
-
-
-def get_face_direction(from_pos:  tuple, to_pos: tuple, map_data: list = None, gate_opened: bool = False, superdata: dict = None) -> str:
-    """
-    Determine the facing direction from one position to another.
-    
-    Args:
-        from_pos:  Starting position (x, y)
-        to_pos: Target position (x, y)
-        map_data: Map data matrix
-        gate_opened:  Current state of gate (True = opened, False = closed)
-        superdata: Original map data containing gate_pos and key_pos
-    
-    Returns:
-        str: Direction string (UP/DOWN/LEFT/RIGHT)
-    """
-    
-    #----- STEP 1: EXTRACT COORDINATES -----#
-    from_x, from_y = from_pos
-    to_x, to_y = to_pos
-    
-    #----- STEP 2: DETERMINE DIRECTION BASED ON COORDINATE DIFFERENCE -----#
-    # Check horizontal difference first
-    if to_x < from_x: 
-        return LEFT
-    elif from_x < to_x:
-        return RIGHT
-    
-    # Check vertical difference
-    elif to_y < from_y: 
-        return UP
-    elif to_y > from_y: 
-        return DOWN
-    
-    #----- STEP 3: IF POSITIONS ARE THE SAME, DEFAULT TO WALL SIDE -----#
-
-    # This handles edge case where from_pos == to_pos
-    # Return direction that faces a wall (for standing still animation)
-    
-    if map_data is not None: 
-        possible_directions = [UP, DOWN, LEFT, RIGHT]
-        
-        for direction in possible_directions: 
-            # Check if this direction is blocked (wall or closed gate)
-            if not is_linked(map_data, from_pos, direction, gate_opened, superdata):
-                return direction
-    
-    # Fallback:  return DOWN if no map_data provided
-    return DOWN
-
-
-# ------------------------------------------------------- #
-# --------------------- LEVEL HELPER--------------------- #
-# ------------------------------------------------------- #
-def get_winning_position(stair_pos: Tuple[int, int], map_len: int) -> Optional[List[int]]:
-    """Determines the grid cell in front of the stair to win."""
-    row, col = stair_pos
-    if col == 0:  # Stair is at the top edge
-        return [row, 1],  UP
-    elif col == map_len + 1:  # Stair is at the bottom edge
-        return [row, map_len], DOWN
-    elif row == 0:  # Stair is at the left edge
-        return [1, col], LEFT
-    elif row == map_len + 1:  # Stair is at the right edge
-        return [map_len, col], RIGHT
-    return None
-
-def load_level(level_index: int):
-    """Load a level from maps_collection and return its components (cleaned)."""
-    if level_index < 0 or level_index >= len(maps_collection):
-        return None, None, None, None, None, None, None
-
-    level_data = maps_collection[level_index]
-    cleaned_map_data = clean_map_data(level_data["map_data"])
-    level_data["map_data"] = cleaned_map_data
-
-    return (
-        level_data.get("map_length", 6),
-        level_data.get("stair_position", (0, 1)),
-        level_data,
-        level_data.get("player_start", (1, 1)).copy(),
-        level_data.get("zombie_starts", []).copy(),
-        level_data.get("scorpion_starts", []).copy(),
-        level_data.get("level_score", 1000),
-    )
-
 # -------------------------------------------------------- #
 # --------------------- CLASS HELPER --------------------- #
 # -------------------------------------------------------- #
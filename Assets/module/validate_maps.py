@@ -0,0 +1,134 @@
+"""
+Headless check of every level in maps_collection.
+
+Usage:
+    python -m Assets.module.validate_maps [level ...] [--workers N]
+           [--algorithm bfs|astar|ida] [--memory-limit N]
+           [--format json|csv] [--output FILE]
+
+Each level is solved from its start state in a process pool, with the same
+solver as the hints. One row per level:
+    status          "solvable", "unsolvable" or "cap" (no path and the search
+                    hit the iteration cap or overflowed its memory limit:
+                    unknown, not proven unsolvable)
+    path_length     turns of the shortest win (None if not solvable)
+    states_explored states expanded by the search (SearchStats)
+    wall_time       seconds for the level, board compilation included
+"""
+
+import os
+import csv
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from .map_collection import maps_collection
+from .levels import load_level, get_winning_position
+from .game_algorithms import Shortest_Path, SEARCH_BFS, SEARCH_ASTAR, SEARCH_IDA
+from .search_stats import SearchStats
+
+REPORT_FIELDS = ["level", "name", "status", "path_length", "states_explored", "peak_visited", "wall_time"]
+
+
+def validate_level(level_index: int, algorithm: str = SEARCH_ASTAR, memory_limit: int = None) -> dict:
+    """Solve one level from its start state and return its report row."""
+    map_length, stair_position, superdata, player_start, zombie_starts, scorpion_starts, _ = load_level(level_index)
+    winning_position, _ = get_winning_position(stair_position, map_length)
+
+    stats = SearchStats()
+    start_time = time.perf_counter()
+    path = Shortest_Path(
+        superdata,
+        tuple(player_start),
+        tuple(winning_position),
+        [tuple(zombie) for zombie in zombie_starts],
+        [tuple(scorpion) for scorpion in scorpion_starts],
+        algorithm=algorithm,
+        stats=stats,
+        memory_limit=memory_limit,
+    )
+    wall_time = time.perf_counter() - start_time
+
+    if path:
+        status = "solvable"
+    elif stats.hit_iteration_cap or stats.hit_memory_limit:
+        status = "cap"
+    else:
+        status = "unsolvable"
+
+    return {
+        "level": level_index,
+        "name": superdata.get("name", ""),
+        "status": status,
+        "path_length": len(path) - 1 if path else None,
+        "states_explored": stats.states_expanded,
+        "peak_visited": stats.peak_visited_size,
+        "wall_time": round(wall_time, 4),
+    }
+
+
+def validate_levels(levels: list = None, algorithm: str = SEARCH_ASTAR, workers: int = None,
+                    memory_limit: int = None) -> list:
+    """
+    Report rows of 'levels' (default: every level), in level order.
+
+    Args:
+        levels: Level indexes of maps_collection
+        algorithm: SEARCH_BFS, SEARCH_ASTAR or SEARCH_IDA
+        workers: Number of processes (default: number of CPUs, 1 = no pool)
+        memory_limit: Shortest_Path memory_limit (None: no limit)
+    """
+    levels = list(range(len(maps_collection))) if levels is None else list(levels)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(levels) or 1))
+
+    if workers == 1:
+        return [validate_level(level_index, algorithm, memory_limit) for level_index in levels]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(validate_level, levels, repeat(algorithm), repeat(memory_limit)))
+
+
+def write_report(rows: list, output_format: str, stream) -> None:
+    """Write report rows as "json" (list of objects) or "csv" (REPORT_FIELDS columns)."""
+    if output_format == "csv":
+        writer = csv.DictWriter(stream, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        json.dump(rows, stream, indent=2, ensure_ascii=False)
+        stream.write("\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve every level headlessly and report solvability.")
+    parser.add_argument("levels", nargs="*", type=int, help="level indexes (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: number of CPUs)")
+    parser.add_argument("--algorithm", choices=[SEARCH_BFS, SEARCH_ASTAR, SEARCH_IDA], default=SEARCH_ASTAR)
+    parser.add_argument("--memory-limit", type=int, default=None,
+                        help="most states kept by the search (see Shortest_Path)")
+    parser.add_argument("--format", dest="output_format", choices=["json", "csv"], default="json")
+    parser.add_argument("--output", default=None, help="report file (default: stdout)")
+    args = parser.parse_args()
+
+    invalid = [level_index for level_index in args.levels if not 0 <= level_index < len(maps_collection)]
+    if invalid:
+        parser.error(f"no such level: {invalid}")
+
+    start_time = time.perf_counter()
+    rows = validate_levels(args.levels or None, args.algorithm, args.workers, args.memory_limit)
+
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            write_report(rows, args.output_format, f)
+    else:
+        write_report(rows, args.output_format, sys.stdout)
+
+    counts = {status: sum(row["status"] == status for row in rows) for status in ("solvable", "unsolvable", "cap")}
+    print(
+        f"{len(rows)} levels: {counts['solvable']} solvable, {counts['unsolvable']} unsolvable, "
+        f"{counts['cap']} unknown (iteration cap / memory limit) ({time.perf_counter() - start_time:.2f}s)",
+        file=sys.stderr,
+    )
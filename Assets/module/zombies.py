@@ -5,7 +5,7 @@ import pygame
 import random
 from .utils import *
 from .settings import *
-from .game_algorithms import generate_next_zombie_positions
+from .rules import generate_next_zombie_positions
 
 
 class MummyMazeZombieManager:
@@ -23,6 +23,7 @@ class MummyMazeZombieManager:
         self.grid_position = [grid_position[0], grid_position[1]] if grid_position is not None else [1, 2]
         self.zombie_type = grid_position[2] if grid_position is not None and len(grid_position) > 2 else 0 # Default type 0
         self.map_data = data["map_data"] if data and "map_data" in data else []
+        self.__wall_board = WallBoard(self.map_data, data.get("gate_pos") if data else None)  # compiled walls for move checks
 
         # 1. Load Resources
         self.zombie_frames= self.load_zombie_frames()
@@ -117,49 +118,8 @@ class MummyMazeZombieManager:
         return effect_frames
 
     def zombie_can_move(self, position: List[int], facing_direction: str, gate_opened: bool = False) -> bool:
-        """Check if zombie can move in facing_direction considering wall tiles."""
-        x, y = position
-        map_w = len(self.map_data[0])
-        
-        try:
-            if facing_direction == UP:
-                if y - 1 <= 0: return False
-
-                # Check if gate is in the way
-                if self.__superdata["gate_pos"] != [] and not gate_opened:
-                    gx, gy = self.__superdata["gate_pos"]
-                    if (x - 1, y - 2) == (gx - 1, gy - 1):
-                        return False
-                
-                # If gate not in the way or opened, check walls
-                return (self.map_data[y - 1][x - 1] not in ['t', 'tl', 'tr', 'b*', 'l*', 'r*']) and \
-                       (self.map_data[y - 2][x - 1] not in ['b', 'bl', 'br', 't*', 'l*', 'r*'])
-            
-            if facing_direction == DOWN:
-                if y + 1 > map_w: return False
-
-                # Check if gate is in the way
-                if self.__superdata["gate_pos"] != [] and not gate_opened:
-                    gx, gy = self.__superdata["gate_pos"]
-                    if (x - 1, y - 1) == (gx - 1, gy - 1):
-                        return False
-                    
-                # If gate not in the way or opened, check walls
-                return (self.map_data[y - 1][x - 1] not in ['b', 'bl', 'br', 't*', 'l*', 'r*']) and \
-                       (self.map_data[y][x - 1] not in ['t', 'tl', 'tr', 'b*', 'l*', 'r*'])
-            
-            if facing_direction == LEFT:
-                if x - 1 <= 0: return False
-                return (self.map_data[y - 1][x - 1] not in ['l', 'tl', 'bl', 'b*', 't*', 'r*']) and \
-                       (self.map_data[y - 1][x - 2] not in ['r', 'br', 'tr', 't*', 'l*', 'b*'])
-            
-            if facing_direction == RIGHT:
-                if x + 1 > map_w: return False
-                return (self.map_data[y - 1][x - 1] not in ['r', 'br', 'tr', 't*', 'l*', 'b*']) and \
-                       (self.map_data[y - 1][x] not in ['l', 'tl', 'bl', 'b*', 't*', 'r*'])
-        except IndexError:
-            return False
-        return True
+        """Check if zombie can move in facing_direction considering walls and the gate."""
+        return self.__wall_board.can_move(position[0], position[1], facing_direction, gate_opened)
 
     def zombie_movement(self, player_position: List[int] = [], type: int = 0) -> int:
         """Determine next movement(s) for the zombie to approach the player."""
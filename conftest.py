@@ -0,0 +1 @@
+"""Lets pytest import the Assets package from the repository root."""
@@ -14,7 +14,11 @@ from Assets.module.scorpion import MummyMazeScorpionManager
 from Assets.module.settings import *
 from Assets.module.pointpackage import PersonalPointPackage, GlobalPointPackage
 from Assets.module.load_save_data import save_data, load_data
-from Assets.module.game_algorithms import Shortest_Path
+from Assets.module.game_algorithms import CompiledBoard, SEARCH_ASTAR, path_directions
+from Assets.module.rules import resolve_collisions
+from Assets.module.hint_worker import HintWorker
+from Assets.module.solution_cache import load_level_cache
+from Assets.module.move_table import load_move_table
 from Assets.module.fonts import MetricFont
 from Assets.module.options_menu import OptionsMenu
 
@@ -31,6 +35,9 @@ screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE
 pygame.display.set_caption("Mummy Maze Deluxe - 25TNT1 - Dudes Chase Money")
 clock = pygame.time.Clock()
 
+# Arrow key replayed by auto-solve for every direction of the solved path
+AUTO_SOLVE_KEYS = {UP: pygame.K_UP, DOWN: pygame.K_DOWN, LEFT: pygame.K_LEFT, RIGHT: pygame.K_RIGHT}
+
 # ---------------------------------------------------------------------------- #
 # ------------------------------FONT SETTING---------------------------------- #
 # ---------------------------------------------------------------------------- #
@@ -1051,6 +1058,9 @@ def main_game(current_level, victory_common_surface = victory_common_surface, gl
         global_data[global_data["user_name"]]["game_data"] = game_data
         save_data(global_data)
 
+        # Keep solved hint states of this level for the next session (written only if new ones were found)
+        solution_cache.save()
+
         return global_data
 
 
@@ -1130,6 +1140,42 @@ def main_game(current_level, victory_common_surface = victory_common_surface, gl
     # Initialize hint package
     hint = HintPackage(current_tile_size)
 
+    # Precompiled board and solved-state cache for the hint solver (per level)
+    solver_board = CompiledBoard(map_data)
+    solution_cache = load_level_cache(current_level, map_data, tuple(winning_position))
+    # Offline solved table of the level (None if not generated, see move_table.py)
+    move_table = load_move_table(current_level, map_data, tuple(winning_position))
+
+    # Hint search runs on a worker thread, result is picked up in the main loop
+    hint_worker = HintWorker()
+    hint_gate_state = False  # gate state the pending hint was requested with
+
+    # Auto-solve (P): one solve, then its directions are played one turn at a time
+    auto_solve_requested = False  # the pending hint_worker result is for auto-solve
+    auto_solve_moves = []         # directions still to play
+
+    def start_solver() -> bool:
+        """Solve the current game state in the background, returns the gate state it used."""
+        # ✅ GET CURRENT GATE STATE FROM GAME
+        gate_opened = False  # Default:  gate closed
+        if MummyMazeMap.is_kg_exists():
+            gate_opened = MummyMazeMap.gate_key.is_opening_gate()
+
+        hint_worker.start(
+            map_data,  # superdata (dictionary chứa map_data, gate_pos, key_pos, trap_pos)
+            tuple(MummyExplorer.grid_position), 
+            tuple(winning_position), 
+            zombie_positions=[tuple(zombie.grid_position + [zombie.zombie_type]) for zombie in MummyZombies] if MummyZombies else [],
+            scorpion_positions=[tuple(scorpion.grid_position + [scorpion.scorpion_type]) for scorpion in MummyScorpions] if MummyScorpions else [],
+            current_gate_opened=gate_opened,  # ✅ TRUYỀN GATE STATE HIỆN TẠI! 
+            board=solver_board,
+            algorithm=SEARCH_ASTAR,
+            solution_cache=solution_cache,
+            move_table=move_table,
+            memory_limit=HINT_MEMORY_LIMIT
+        )
+        return gate_opened
+
     #----------------------------------------------------------------------------------#
     #-----------------------------HANDLE LOADED GAME STATE-----------------------------#
     #----------------------------------------------------------------------------------#
@@ -1236,116 +1282,63 @@ def main_game(current_level, victory_common_surface = victory_common_surface, gl
                         player_moved = False
 
 
-            # Check if two zombies in a same position (if any)
-            if MummyZombies:
-                zombie_i = 0
-                while zombie_i < len(MummyZombies):
-                    zombie_j = zombie_i + 1
-                    while zombie_j < len(MummyZombies):
-                        if (
-                            MummyZombies[zombie_i].get_x()
-                            == MummyZombies[zombie_j].get_x()
-                            and MummyZombies[zombie_i].get_y()
-                            == MummyZombies[zombie_j].get_y()
-                        ):
-                            ScoreTracker.player.bonus_score += 20  # Reward for zombie clash
-
-                            if MummyZombies[zombie_i].zombie_type > MummyZombies[zombie_j].zombie_type:
-                                # if zombie_i has higher type, remove zombie_j
-                                MummyZombies.pop(zombie_j)
-                            else:
-                                # else remove zombie_i
-                                MummyZombies.pop(zombie_i)
-                                zombie_i -= 1
-                                break  # Exit inner loop to avoid index issues
-                        else:
-                            zombie_j += 1
-                    zombie_i += 1
-
-            # Check if zombie in trap (if any)
-            if MummyZombies and MummyMazeMap.is_trap_exists():
-                zombie_i = 0
-                while zombie_i < len(MummyZombies):
-                    if MummyMazeMap.is_position_in_trap(
-                        MummyZombies[zombie_i].grid_position
-                    ):
-                        ScoreTracker.player.bonus_score += 20  # Reward for zombie trap
-
-                        # Reset the position of the zombie
-                        MummyZombies.pop(zombie_i)
-                    else:
-                        zombie_i += 1
-
-            # Check if two scorpions in a same position (if any)
-            if MummyScorpions:
-                scorpion_i = 0
-                while scorpion_i < len(MummyScorpions):
-                    scorpion_j = scorpion_i + 1
-                    while scorpion_j < len(MummyScorpions):
-                        if (
-                            MummyScorpions[scorpion_i].get_x()
-                            == MummyScorpions[scorpion_j].get_x()
-                            and MummyScorpions[scorpion_i].get_y()
-                            == MummyScorpions[scorpion_j].get_y()
-                        ):
-                            
-                            ScoreTracker.player.bonus_score += 20  # Reward for scorpion clash
-
-                            if MummyScorpions[scorpion_i].scorpion_type > MummyScorpions[scorpion_j].scorpion_type:
-                                # if scorpion_i has higher type, remove scorpion_j
-                                MummyScorpions.pop(scorpion_j)
-                            else:
-                                # else remove scorpion_i
-                                MummyScorpions.pop(scorpion_i)
-                                scorpion_i -= 1
-                                break  # Exit inner loop to avoid index issues
-                        else:
-                            scorpion_j += 1
-                    scorpion_i += 1
-            
-            # Check if scorpion in trap (if any)
-            if MummyScorpions and MummyMazeMap.is_trap_exists():
-                scorpion_i = 0
-                while scorpion_i < len(MummyScorpions):
-                    if MummyMazeMap.is_position_in_trap(
-                        MummyScorpions[scorpion_i].grid_position
-                    ):
-                        # Insert sound
-
-                        ScoreTracker.player.bonus_score += 20  # Reward for scorpion trap
-
-                        # Reset the position of the scorpion
-                        MummyScorpions.pop(scorpion_i)
-                    else:
-                        scorpion_i += 1
-                        
-            # Check if zombie and scorpion in a same position (if any) -> delete both
-            if MummyZombies and MummyScorpions:
-                zombie_i = 0
-                while zombie_i < len(MummyZombies):
-                    scorpion_j = 0
-                    while scorpion_j < len(MummyScorpions):
-                        if (
-                            MummyZombies[zombie_i].get_x()
-                            == MummyScorpions[scorpion_j].get_x()
-                            and MummyZombies[zombie_i].get_y()
-                            == MummyScorpions[scorpion_j].get_y()
-                        ):
-                            # Insert sound
-
-                            ScoreTracker.player.bonus_score += 20  # Reward for zombie and scorpion clash
-
-                            # Reset the position of both
-                            MummyZombies.pop(zombie_i)
-                            MummyScorpions.pop(scorpion_j)
-                            zombie_i -= 1
-                            break  # Exit inner loop to avoid index issues
-                        else:
-                            scorpion_j += 1
-                    zombie_i += 1
+            # Enemy clashes and trap deaths, same rules as a solver turn.
+            # Each enemy carries its sprite index to find the survivors back
+            if MummyZombies or MummyScorpions:
+                alive_zombies, alive_scorpions, clashes = resolve_collisions(
+                    [(zombie.get_x(), zombie.get_y(), zombie.zombie_type, index)
+                     for index, zombie in enumerate(MummyZombies or [])],
+                    [(scorpion.get_x(), scorpion.get_y(), scorpion.scorpion_type, index)
+                     for index, scorpion in enumerate(MummyScorpions or [])],
+                    map_data,
+                )
+                if clashes:
+                    ScoreTracker.player.bonus_score += 20 * clashes  # Reward for every clash / trap death
+                    if MummyZombies:
+                        MummyZombies[:] = [MummyZombies[zombie[3]] for zombie in alive_zombies]
+                    if MummyScorpions:
+                        MummyScorpions[:] = [MummyScorpions[scorpion[3]] for scorpion in alive_scorpions]
+
+        # Apply a hint computed by the worker thread (if finished)
+        path = hint_worker.poll()
+        if path is not None and auto_solve_requested:
+            hint.is_thinking = False
+            auto_solve_requested = False
+            if path == []:
+                if hint_worker.hit_memory_limit:
+                    print("Can't find a hint within HINT_MEMORY_LIMIT.")
+                else:
+                    print("Can't find the way to win. You lose!")
+            else:
+                # Every turn of the path, then the step into the stair that wins
+                auto_solve_moves = path_directions(path, map_data, hint_gate_state) + [goal_direction]
+                ScoreTracker.player.hint_penalty += 5  # Same penalty as one hint
+        elif path is not None:
+            hint.is_thinking = False
+            if path == []:
+                if hint_worker.hit_memory_limit:
+                    print("Can't find a hint within HINT_MEMORY_LIMIT.")
+                else:
+                    print("Can't find the way to win. You lose!")
+            else:
+                # ✅ CẬP NHẬT:  Thêm gate_opened và superdata vào get_face_direction
+                face_direction = get_face_direction(
+                    path[0], 
+                    path[1], 
+                    MummyMazeMap.map_data,  # Map data ma trận
+                    gate_opened=hint_gate_state,  # ✅ TRUYỀN GATE STATE
+                    superdata=map_data  # ✅ Dữ liệu gốc chứa gate_pos, key_pos
+                ) if len(path) >= 2 else "WIN"
+                
+                hint.show_hint = True
+                hint.facing_direction = face_direction
+                hint.moves_remaining = len(path) - 1
+                
+                ScoreTracker.player.hint_penalty += 5  # Increase hint penalty
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                hint_worker.cancel()
                 save(is_playing= True)
                 return "exit"
 
@@ -1382,6 +1375,12 @@ def main_game(current_level, victory_common_surface = victory_common_surface, gl
                 panel_clicked = side_panel.handle_event(event)
 
                 if panel_clicked == "UNDO MOVE" or (event.type == pygame.KEYDOWN and event.key == pygame.K_BACKSPACE):
+                    # Pending hint belongs to the state before undo
+                    hint_worker.cancel()
+                    hint.is_thinking = False
+                    auto_solve_requested = False
+                    auto_solve_moves = []
+
                     if history_states != []:
                         last_state = history_states.pop()
 
@@ -1420,6 +1419,10 @@ def main_game(current_level, victory_common_surface = victory_common_surface, gl
                     
                     # Reset side panel buttons first
                     side_panel.reset_button_states()
+                    hint_worker.cancel()
+                    hint.is_thinking = False
+                    auto_solve_requested = False
+                    auto_solve_moves = []
 
                     (
                         map_length,
@@ -1436,6 +1439,7 @@ def main_game(current_level, victory_common_surface = victory_common_surface, gl
                     )
 
                     current_tile_size = 480 // map_length
+                    solver_board = CompiledBoard(map_data)
                     MummyMazeMap = MummyMazeMapManager(
                         length=map_length,
                         stair_position=stair_position,
@@ -1497,38 +1501,19 @@ def main_game(current_level, victory_common_surface = victory_common_surface, gl
                     options_menu.is_open = True
                 
                 elif panel_clicked == "HINT" or (event.type == pygame.KEYDOWN and event.key == pygame.K_h):
-                    # ✅ GET CURRENT GATE STATE FROM GAME
-                    current_gate_state = False  # Default:  gate closed
-                    if MummyMazeMap.is_kg_exists():
-                        current_gate_state = MummyMazeMap.gate_key.is_opening_gate()
-
-                    # Gọi Shortest_Path với CURRENT gate state
-                    path = Shortest_Path(
-                        map_data,  # superdata (dictionary chứa map_data, gate_pos, key_pos, trap_pos)
-                        tuple(MummyExplorer.grid_position), 
-                        tuple(winning_position), 
-                        zombie_positions=[tuple(zombie.grid_position + [zombie.zombie_type]) for zombie in MummyZombies] if MummyZombies else [],
-                        scorpion_positions=[tuple(scorpion.grid_position + [scorpion.scorpion_type]) for scorpion in MummyScorpions] if MummyScorpions else [],
-                        current_gate_opened=current_gate_state  # ✅ TRUYỀN GATE STATE HIỆN TẠI! 
-                    ) 
-                    
-                    if path == []:
-                        print("Can't find the way to win. You lose!")
-                    else:
-                        # ✅ CẬP NHẬT:  Thêm gate_opened và superdata vào get_face_direction
-                        face_direction = get_face_direction(
-                            path[0], 
-                            path[1], 
-                            MummyMazeMap.map_data,  # Map data ma trận
-                            gate_opened=current_gate_state,  # ✅ TRUYỀN GATE STATE
-                            superdata=map_data  # ✅ Dữ liệu gốc chứa gate_pos, key_pos
-                        ) if len(path) >= 2 else "WIN"
-                        
-                        hint.show_hint = True
-                        hint.facing_direction = face_direction
-                        
-                        ScoreTracker.player.hint_penalty += 5  # Increase hint penalty
+                    # Gọi Shortest_Path với CURRENT gate state (chạy nền, không làm đứng màn hình)
+                    if not hint_worker.is_running():
+                        hint_gate_state = start_solver()
+                        hint.is_thinking = True
+
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_p and not auto_solve_moves:
+                    # Auto-solve: one solve, the whole path is then played turn by turn
+                    hint_gate_state = start_solver()
+                    auto_solve_requested = True
+                    hint.is_thinking = True
+                    hint.show_hint = False
                 elif panel_clicked == "QUIT TO MAIN" or (event.type == pygame.KEYDOWN and (event.key == pygame.K_ESCAPE or event.key == pygame.K_q)):
+                    hint_worker.cancel()
                     global_data = save(is_playing= True)
                     return "main_menu"
 
@@ -1542,6 +1527,10 @@ def main_game(current_level, victory_common_surface = victory_common_surface, gl
                     # change show_hint to False when player makes a move
                     hint.show_hint = False
 
+                    # Any key of the player stops auto-solve (its own keys are marked)
+                    if not getattr(event, "auto_solve", False):
+                        auto_solve_moves = []
+
                     # Save current state before making a move
                     history_states.append(
                         {
@@ -1574,6 +1563,13 @@ def main_game(current_level, victory_common_surface = victory_common_surface, gl
                         }
                     )
 
+                    # Player moves -> pending hint is outdated
+                    if event.key in (pygame.K_UP, pygame.K_w, pygame.K_DOWN, pygame.K_s,
+                                     pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d):
+                        hint_worker.cancel()
+                        hint.is_thinking = False
+                        auto_solve_requested = False
+
                     # Handle player movement
                     if event.key == pygame.K_UP or event.key == pygame.K_w:
                         MummyExplorer.update_player_status(UP)
@@ -1649,6 +1645,9 @@ def main_game(current_level, victory_common_surface = victory_common_surface, gl
                             # hint package update
                             if hint.TILE_SIZE != current_tile_size:
                                 hint = HintPackage(current_tile_size)
+                            solver_board = CompiledBoard(map_data)
+                            solution_cache = load_level_cache(current_level, map_data, tuple(winning_position))
+                            move_table = load_move_table(current_level, map_data, tuple(winning_position))
 
                             MummyMazeMap = MummyMazeMapManager(
                                 length=map_length,
@@ -1716,6 +1715,15 @@ def main_game(current_level, victory_common_surface = victory_common_surface, gl
 
 
         
+        # Auto-solve: press the next direction once everyone stands still again,
+        # the key goes through the same handling as a key of the player
+        if auto_solve_moves and not options_menu.is_open and not MummyExplorer.movement_list and (
+            not MummyZombies or all(not zombie.movement_list for zombie in MummyZombies)
+        ) and (not MummyScorpions or all(not scorpion.movement_list for scorpion in MummyScorpions)):
+            pygame.event.post(
+                pygame.event.Event(pygame.KEYDOWN, key=AUTO_SOLVE_KEYS[auto_solve_moves.pop(0)], auto_solve=True)
+            )
+
         #------------------------------------------------------------------------------------#
         #------------------------------- CHECK LOSE CONDITION -------------------------------#
         #------------------------------------------------------------------------------------#
@@ -1742,6 +1750,7 @@ def main_game(current_level, victory_common_surface = victory_common_surface, gl
                 break
 
         if reason is not None:
+            auto_solve_moves = []
             MummyExplorer.start_lose_effect(screen, reason=reason)
             game_data["is_playing"] = False
             save(is_playing = False)
@@ -1885,6 +1894,9 @@ def main_game(current_level, victory_common_surface = victory_common_surface, gl
         # 8. DRAW HINT IF ANY
         if hint.show_hint:
             hint.draw(screen, (MummyExplorer. get_x(), MummyExplorer.get_y()))
+            hint.draw_moves_remaining(screen, (MummyExplorer.get_x(), MummyExplorer.get_y()))
+        elif hint.is_thinking:
+            hint.draw_thinking(screen, (MummyExplorer.get_x(), MummyExplorer.get_y()))
 
         # 9. DRAW WALLS OVER EVERYTHING
         MummyMazeMap.draw_walls(screen)
@@ -0,0 +1,41 @@
+"""Dead-state pruning never changes the path, it only expands fewer states."""
+
+import pytest
+
+from Assets.module.map_collection import maps_collection
+from Assets.module.levels import load_level, get_winning_position
+from Assets.module.game_algorithms import Shortest_Path, SEARCH_BFS, SEARCH_ASTAR
+from Assets.module.search_stats import SearchStats
+
+
+def solve(level_index: int, algorithm: str, prune_dead_states: bool):
+    map_length, stair, superdata, player_start, zombies, scorpions, _ = load_level(level_index)
+    winning_position, _ = get_winning_position(stair, map_length)
+    stats = SearchStats()
+    path = Shortest_Path(
+        superdata, tuple(player_start), tuple(winning_position),
+        [tuple(zombie) for zombie in zombies], [tuple(scorpion) for scorpion in scorpions],
+        algorithm=algorithm, stats=stats, prune_dead_states=prune_dead_states,
+    )
+    return path, stats
+
+
+@pytest.mark.parametrize("algorithm", [SEARCH_BFS, SEARCH_ASTAR])
+@pytest.mark.parametrize("level_index", range(len(maps_collection)))
+def test_pruning_keeps_the_path(level_index, algorithm):
+    path, stats = solve(level_index, algorithm, prune_dead_states=False)
+    pruned_path, pruned_stats = solve(level_index, algorithm, prune_dead_states=True)
+
+    assert pruned_path == path
+    assert pruned_stats.states_expanded <= stats.states_expanded
+
+
+def test_pruning_expands_fewer_states():
+    pruned_levels = 0
+    for level_index in range(len(maps_collection)):
+        _, stats = solve(level_index, SEARCH_BFS, prune_dead_states=False)
+        _, pruned_stats = solve(level_index, SEARCH_BFS, prune_dead_states=True)
+        if pruned_stats.states_pruned:
+            assert pruned_stats.states_expanded < stats.states_expanded
+            pruned_levels += 1
+    assert pruned_levels > 0
@@ -0,0 +1,122 @@
+"""HintWorker: cancelling a running search and answering from the cache."""
+
+import threading
+import time
+
+from Assets.module import hint_worker
+from Assets.module.levels import load_level, get_winning_position
+from Assets.module.game_algorithms import CompiledBoard, Shortest_Path, SEARCH_BFS, SEARCH_IDA
+from Assets.module.hint_worker import HintWorker
+from Assets.module.solution_cache import SolutionCache
+
+
+def level_start(level_index: int):
+    map_length, stair, superdata, player_start, zombies, scorpions, _ = load_level(level_index)
+    winning_position, _ = get_winning_position(stair, map_length)
+    return (
+        superdata, tuple(player_start), tuple(winning_position),
+        [tuple(zombie) for zombie in zombies], [tuple(scorpion) for scorpion in scorpions],
+    )
+
+
+def solver_threads() -> list:
+    return [thread for thread in threading.enumerate() if thread.name == "hint-solver"]
+
+
+def wait_for_result(worker: HintWorker, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        path = worker.poll()
+        if path is not None:
+            return path
+        time.sleep(0.01)
+    raise AssertionError("hint search did not finish")
+
+
+def test_search_runs_on_a_thread_and_matches_shortest_path():
+    superdata, start, goal, zombies, scorpions = level_start(0)
+    worker = HintWorker()
+    worker.start(superdata, start, goal, zombies, scorpions, board=CompiledBoard(superdata), algorithm=SEARCH_BFS)
+
+    path = wait_for_result(worker)
+
+    assert path == Shortest_Path(superdata, start, goal, zombies, scorpions, algorithm=SEARCH_BFS)
+    assert not worker.hit_memory_limit
+
+
+def test_cancel_stops_a_running_search():
+    # a tiny IDA* table on a big level keeps the search busy for a long time
+    superdata, start, goal, zombies, scorpions = level_start(38)
+    worker = HintWorker()
+    previous_threads = solver_threads()
+    worker.start(superdata, start, goal, zombies, scorpions,
+                 board=CompiledBoard(superdata), algorithm=SEARCH_IDA, memory_limit=64)
+    time.sleep(0.2)
+    threads = [thread for thread in solver_threads() if thread not in previous_threads]
+    assert worker.is_running() and len(threads) == 1
+
+    worker.cancel()
+
+    threads[0].join(timeout=5.0)
+    assert not threads[0].is_alive()
+    assert not worker.is_running()
+    assert worker.poll() is None  # a cancelled search gives no hint
+
+
+def test_cancel_event_reaches_the_search(monkeypatch):
+    seen_events = []
+
+    def blocking_search(*args, cancel_event=None, **kwargs):
+        seen_events.append(cancel_event)
+        cancel_event.wait(timeout=5.0)
+        return [(0, 0)]
+
+    monkeypatch.setattr(hint_worker, "Shortest_Path", blocking_search)
+    superdata, start, goal, zombies, scorpions = level_start(0)
+    worker = HintWorker()
+    previous_threads = solver_threads()
+    worker.start(superdata, start, goal, zombies, scorpions)
+    thread = [thread for thread in solver_threads() if thread not in previous_threads][0]
+
+    worker.cancel()
+    thread.join(timeout=5.0)
+
+    assert seen_events[0].is_set()
+    assert not thread.is_alive()
+    assert worker.poll() is None  # the stale [(0, 0)] was dropped
+
+
+def test_cache_hit_answers_without_a_thread(monkeypatch):
+    superdata, start, goal, zombies, scorpions = level_start(0)
+    board = CompiledBoard(superdata)
+    cache = SolutionCache()
+    expected = Shortest_Path(superdata, start, goal, zombies, scorpions, board=board, solution_cache=cache)
+    assert expected and len(cache) > 0
+
+    searches = []
+    monkeypatch.setattr(hint_worker, "Shortest_Path", lambda *args, **kwargs: searches.append(args) or [])
+    started_threads = []
+    real_thread = threading.Thread
+    monkeypatch.setattr(hint_worker.threading, "Thread",
+                        lambda *args, **kwargs: started_threads.append(kwargs) or real_thread(*args, **kwargs))
+    worker = HintWorker()
+    worker.start(superdata, start, goal, zombies, scorpions, board=board, solution_cache=cache)
+
+    assert not worker.is_running()
+    assert worker.poll() == expected
+    assert started_threads == [] and searches == []
+
+
+def test_following_the_hint_is_answered_from_the_worker_paths(monkeypatch):
+    superdata, start, goal, zombies, scorpions = level_start(0)
+    board = CompiledBoard(superdata)
+    worker = HintWorker()
+    worker.start(superdata, start, goal, zombies, scorpions, board=board)
+    path = wait_for_result(worker)
+    assert len(path) > 1
+
+    monkeypatch.setattr(hint_worker, "Shortest_Path", lambda *args, **kwargs: [])
+    worker.start(superdata, start, goal, zombies, scorpions, board=board)
+
+    assert not worker.is_running()
+    assert worker.poll() == path
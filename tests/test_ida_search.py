@@ -0,0 +1,60 @@
+"""IDA* (SEARCH_IDA) against BFS path lengths, with and without a memory ceiling."""
+
+import time
+
+import pytest
+
+from Assets.module.levels import load_level, get_winning_position
+from Assets.module.game_algorithms import Shortest_Path, SEARCH_BFS, SEARCH_IDA
+from Assets.module.search_stats import SearchStats
+
+
+def solve(level_index: int, **kwargs):
+    map_length, stair, superdata, player_start, zombies, scorpions, _ = load_level(level_index)
+    winning_position, _ = get_winning_position(stair, map_length)
+    stats = SearchStats()
+    path = Shortest_Path(
+        superdata, tuple(player_start), tuple(winning_position),
+        [tuple(zombie) for zombie in zombies], [tuple(scorpion) for scorpion in scorpions],
+        stats=stats, **kwargs,
+    )
+    return path, stats
+
+
+@pytest.mark.parametrize("level_index", [15, 28, 32, 37, 38])
+def test_ida_matches_bfs(level_index):
+    bfs_path, _ = solve(level_index, algorithm=SEARCH_BFS)
+    ida_path, stats = solve(level_index, algorithm=SEARCH_IDA)
+
+    assert len(ida_path) == len(bfs_path)
+    assert not stats.hit_iteration_cap
+    assert not stats.hit_memory_limit
+
+
+def test_unsolvable_level_is_given_up_quickly():
+    started = time.perf_counter()
+    path, stats = solve(15, algorithm=SEARCH_IDA)
+
+    assert path == []
+    assert not stats.hit_iteration_cap
+    assert time.perf_counter() - started < 20
+
+
+@pytest.mark.parametrize("level_index", [28, 32, 37])
+def test_small_ceiling_keeps_the_bfs_path(level_index):
+    bfs_path, _ = solve(level_index, algorithm=SEARCH_BFS)
+    path, stats = solve(level_index, algorithm=SEARCH_BFS, memory_limit=64)
+
+    assert stats.algorithm == SEARCH_IDA
+    assert stats.hit_memory_limit  # entries were replaced, the path is still found
+    assert stats.peak_visited_size <= 64
+    assert len(path) == len(bfs_path)
+
+
+def test_ida_solves_below_the_bfs_memory():
+    bfs_path, bfs_stats = solve(37, algorithm=SEARCH_BFS)
+    path, stats = solve(37, algorithm=SEARCH_BFS, memory_limit=bfs_stats.peak_visited_size // 4)
+
+    assert stats.algorithm == SEARCH_IDA
+    assert len(path) == len(bfs_path)
+    assert stats.peak_visited_size <= bfs_stats.peak_visited_size // 4
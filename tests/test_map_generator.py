@@ -0,0 +1,52 @@
+"""Seeded map generation is reproducible."""
+
+import json
+
+from Assets.module import levels
+from Assets.module.map_generator import MapGenerator, generate_seeded_map
+from Assets.module.generate_new_map import generate_bulk, SEED_ONLY_KEYS
+
+
+def test_same_size_and_seed_rebuild_the_same_map():
+    for size in (6, 10):
+        map_dict = MapGenerator(size, seed=0).create_map()
+        rebuilt = generate_seeded_map(size, map_dict["seed"])
+
+        map_dict.pop("difficulty", None)
+        assert rebuilt == map_dict
+        assert generate_seeded_map(size, map_dict["seed"]) == rebuilt
+
+
+def test_same_generator_seed_gives_the_same_maps():
+    first = MapGenerator(8, seed=3).create_map()
+    second = MapGenerator(8, seed=3).create_map()
+    assert first == second
+
+
+def test_seed_only_level_loads(monkeypatch):
+    map_dict = MapGenerator(6, seed=1).create_map()
+    entry = {key: map_dict[key] for key in SEED_ONLY_KEYS if key in map_dict}
+    monkeypatch.setattr(levels, "maps_collection", [entry])
+
+    map_length, stair, superdata, player_start, zombies, scorpions, level_score = levels.load_level(0)
+
+    assert map_length == 6
+    assert superdata["map_data"] == levels.clean_map_data(map_dict["map_data"])
+    assert stair == list(map_dict["stair_position"])
+    assert player_start == list(map_dict["player_start"])
+    assert zombies == [list(zombie) for zombie in map_dict["zombie_starts"]]
+    assert scorpions == [list(scorpion) for scorpion in map_dict["scorpion_starts"]]
+    assert level_score == map_dict["level_score"]
+    assert superdata["name"] == map_dict["name"]
+
+
+def test_bulk_run_is_reproducible(tmp_path):
+    outputs = []
+    for workers in (1, 2, 2):
+        output = tmp_path / f"maps_{len(outputs)}.json"
+        generate_bulk(4, sizes=[6, 8], workers=workers, output=str(output), seed=7, seeds_only=True)
+        outputs.append(output.read_text())
+
+    assert outputs[0] == outputs[1] == outputs[2]
+    maps = json.loads(outputs[0])
+    assert maps and all(set(map_dict) <= set(SEED_ONLY_KEYS) for map_dict in maps)
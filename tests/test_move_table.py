@@ -0,0 +1,131 @@
+"""MoveTable: solving, the binary file and its lookups."""
+
+import struct
+from collections import deque
+
+import pytest
+
+from Assets.module.levels import load_level, get_winning_position
+from Assets.module.game_algorithms import CompiledBoard, Shortest_Path, SEARCH_BFS, generate_successors
+from Assets.module.move_table import MoveTable, solve_level, HEADER_FORMAT, UNSOLVABLE
+from Assets.module.rules import is_lose
+from Assets.module.solution_cache import level_fingerprint
+
+SMALL_LEVELS = [0, 3, 8, 14, 16]  # 14: no way to win
+
+
+def level_start(level_index: int):
+    map_length, stair, superdata, player_start, zombies, scorpions, _ = load_level(level_index)
+    winning_position, _ = get_winning_position(stair, map_length)
+    return (
+        superdata, tuple(player_start), tuple(winning_position),
+        [tuple(zombie) for zombie in zombies], [tuple(scorpion) for scorpion in scorpions],
+    )
+
+
+def reachable_states(board: CompiledBoard, start, goal, zombies, scorpions) -> list:
+    initial_state = board.encode_state(start, False, zombies, scorpions)
+    seen = {initial_state}
+    queue = deque([initial_state])
+    while queue:
+        position, gate_opened, zombie_list, scorpion_list = board.decode_state(queue.popleft())
+        if position == goal or is_lose(board.superdata, position, zombie_list, scorpion_list):
+            continue
+        for successor in generate_successors(board, position, gate_opened, zombie_list, scorpion_list):
+            state = board.encode_state(*successor)
+            if state not in seen:
+                seen.add(state)
+                queue.append(state)
+    return sorted(seen)
+
+
+@pytest.mark.parametrize("level_index", SMALL_LEVELS)
+def test_table_path_matches_bfs(level_index):
+    superdata, start, goal, zombies, scorpions = level_start(level_index)
+    board = CompiledBoard(superdata)
+    table = solve_level(superdata, start, goal, zombies, scorpions, board=board)
+
+    state = board.encode_state(start, False, zombies, scorpions)
+    bfs_path = Shortest_Path(superdata, start, goal, zombies, scorpions, algorithm=SEARCH_BFS)
+    table_path = table.get_path(board, state)
+
+    assert len(table_path) == len(bfs_path)
+    if bfs_path:
+        assert table_path[0] == start and table_path[-1] == goal
+        assert table.lookup(state)[1] == len(bfs_path) - 1
+    else:
+        assert table.is_dead(state)
+
+
+@pytest.mark.parametrize("level_index", SMALL_LEVELS)
+def test_save_load_round_trip(level_index, tmp_path):
+    superdata, start, goal, zombies, scorpions = level_start(level_index)
+    board = CompiledBoard(superdata)
+    table = solve_level(superdata, start, goal, zombies, scorpions, board=board)
+
+    file_path = str(tmp_path / "level.bin")
+    table.save(file_path)
+    loaded = MoveTable.load(file_path, level_fingerprint(superdata, goal))
+
+    states = reachable_states(board, start, goal, zombies, scorpions)
+    assert loaded is not None
+    assert len(loaded) == len(table) == len(states)
+    # Every stored key is found by the binary search, first and last included
+    for state in states:
+        assert loaded.lookup(state) == table.lookup(state) is not None
+
+
+def test_unknown_states_are_not_found():
+    superdata, start, goal, zombies, scorpions = level_start(3)
+    board = CompiledBoard(superdata)
+    table = solve_level(superdata, start, goal, zombies, scorpions, board=board)
+    states = set(reachable_states(board, start, goal, zombies, scorpions))
+
+    assert table.lookup(-1) is None
+    assert table.lookup(1 << (table.key_bytes * 8)) is None
+    unknown = next(state for state in range(max(states)) if state not in states)
+    assert table.lookup(unknown) is None
+    assert table.get_path(board, unknown) is None
+
+
+def test_stale_or_broken_files_are_rejected(tmp_path):
+    superdata, start, goal, zombies, scorpions = level_start(3)
+    table = solve_level(superdata, start, goal, zombies, scorpions)
+    file_path = tmp_path / "level.bin"
+    table.save(str(file_path))
+    data = file_path.read_bytes()
+    header_size = struct.calcsize(HEADER_FORMAT)
+
+    # Built for other level data: another goal, or a wall changed since
+    assert MoveTable.load(str(file_path), level_fingerprint(superdata, (goal[0] + 1, goal[1]))) is None
+    edited = dict(superdata, map_data=[row[:] for row in superdata["map_data"]])
+    edited["map_data"][0][0] = "t" if edited["map_data"][0][0] != "t" else "l"
+    assert MoveTable.load(str(file_path), level_fingerprint(edited, goal)) is None
+    assert MoveTable.load(str(file_path), level_fingerprint(superdata, goal)) is not None
+    # Missing file
+    assert MoveTable.load(str(tmp_path / "missing.bin")) is None
+
+    broken = tmp_path / "broken.bin"
+    # Other file type
+    broken.write_bytes(b"XXXX" + data[4:])
+    assert MoveTable.load(str(broken)) is None
+    # Damaged zlib block
+    broken.write_bytes(data[:header_size] + b"not zlib")
+    assert MoveTable.load(str(broken)) is None
+    # State count not matching the payload
+    magic, fingerprint, width, key_bytes, count = struct.unpack(HEADER_FORMAT, data[:header_size])
+    broken.write_bytes(struct.pack(HEADER_FORMAT, magic, fingerprint, width, key_bytes, count + 1) + data[header_size:])
+    assert MoveTable.load(str(broken)) is None
+    # Cut header
+    broken.write_bytes(data[:10])
+    assert MoveTable.load(str(broken)) is None
+
+
+def test_unsolvable_distance_marks_dead_states():
+    superdata, start, goal, zombies, scorpions = level_start(14)
+    board = CompiledBoard(superdata)
+    table = solve_level(superdata, start, goal, zombies, scorpions, board=board)
+
+    state = board.encode_state(start, False, zombies, scorpions)
+    assert table.lookup(state)[1] == UNSOLVABLE
+    assert table.get_path(board, state) == []
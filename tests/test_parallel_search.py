@@ -0,0 +1,43 @@
+"""Parallel BFS returns exactly the serial BFS path."""
+
+import pytest
+
+from Assets.module.levels import load_level, get_winning_position
+from Assets.module.game_algorithms import CompiledBoard, Shortest_Path, SEARCH_BFS, SEARCH_PARALLEL_BFS
+from Assets.module.parallel_search import parallel_bfs
+from Assets.module.search_stats import SearchStats
+
+
+def level_start(level_index: int):
+    map_length, stair, superdata, player_start, zombies, scorpions, _ = load_level(level_index)
+    winning_position, _ = get_winning_position(stair, map_length)
+    return (
+        superdata, tuple(player_start), tuple(winning_position),
+        [tuple(zombie) for zombie in zombies], [tuple(scorpion) for scorpion in scorpions],
+    )
+
+
+@pytest.mark.parametrize("level_index", [0, 9, 14, 24, 37])  # 14: no way to win
+def test_parallel_bfs_matches_serial_bfs(level_index):
+    superdata, start, goal, zombies, scorpions = level_start(level_index)
+
+    serial_path = Shortest_Path(superdata, start, goal, zombies, scorpions, algorithm=SEARCH_BFS)
+    stats = SearchStats()
+    parallel_path = Shortest_Path(
+        superdata, start, goal, zombies, scorpions, algorithm=SEARCH_PARALLEL_BFS, workers=2, stats=stats
+    )
+
+    assert parallel_path == serial_path
+    assert stats.algorithm == SEARCH_PARALLEL_BFS
+
+
+def test_start_next_to_the_goal():
+    superdata, _, goal, zombies, scorpions = level_start(0)
+    board = CompiledBoard(superdata)
+    start = next(move for move in board.get_moves(goal, False) if move != goal)
+
+    serial_path = Shortest_Path(superdata, start, goal, zombies, scorpions, algorithm=SEARCH_BFS)
+    initial_state = board.encode_state(start, False, zombies, scorpions)
+    parallel_path = parallel_bfs(superdata, board, initial_state, goal, 2, 1000000)
+
+    assert parallel_path == serial_path == [start, goal]
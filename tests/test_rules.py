@@ -0,0 +1,90 @@
+"""LevelRules.step against the turns of the solver, on every shipped level."""
+
+from collections import deque
+
+import pytest
+
+from Assets.module.map_collection import maps_collection
+from Assets.module.levels import load_level
+from Assets.module.settings import UP, DOWN, LEFT, RIGHT
+from Assets.module.rules import (
+    LevelRules, LOSE, is_lose, toggle_gate, resolve_collisions, resolve_turn,
+    generate_next_zombie_positions, generate_next_scorpion_positions,
+)
+from Assets.module.game_algorithms import CompiledBoard, generate_successors, expand_frontier
+
+# States walked per level (the largest levels have a few 10 000)
+MAX_STATES = 1500
+
+
+def walk_states(level_index: int):
+    """Yield (board, rules, state) for the states reachable from the level start."""
+    _, _, superdata, player_start, zombies, scorpions, _ = load_level(level_index)
+    board = CompiledBoard(superdata)
+    rules = LevelRules(superdata)
+
+    start = rules.initial_state(player_start, zombies, scorpions)
+    seen = {board.encode_state(*start)}
+    queue = deque([start])
+    while queue and len(seen) <= MAX_STATES:
+        state = queue.popleft()
+        yield board, rules, state
+        for direction in (UP, DOWN, LEFT, RIGHT):
+            next_state, outcome = rules.step(state, direction)
+            packed = board.encode_state(*next_state)
+            if outcome != LOSE and packed not in seen:
+                seen.add(packed)
+                queue.append(next_state)
+
+
+@pytest.mark.parametrize("level_index", range(len(maps_collection)))
+def test_step_matches_solver_turns(level_index):
+    for board, rules, state in walk_states(level_index):
+        # A move into a wall is a wait, like the waits of board.get_moves
+        by_step = set()
+        for direction in (UP, DOWN, LEFT, RIGHT):
+            next_state, outcome = rules.step(state, direction)
+            if outcome != LOSE:
+                by_step.add(board.encode_state(*next_state))
+
+        successors = generate_successors(board, state.player, state.gate_opened, state.zombies, state.scorpions)
+        by_solver = {
+            board.encode_state(*successor) for successor in successors
+            if not is_lose(board.superdata, successor[0], successor[2], successor[3])
+        }
+        assert by_step == by_solver, state
+
+        frontier = [(state.player, state.gate_opened, list(state.zombies), list(state.scorpions))]
+        vectorized = expand_frontier(board, frontier)[0]
+        assert [board.encode_state(*successor) for successor in vectorized] == \
+               [board.encode_state(*successor) for successor in successors], state
+
+
+@pytest.mark.parametrize("level_index", range(len(maps_collection)))
+def test_game_loop_collisions_match_turns(level_index):
+    # index.py moves the sprites, then resolves them with resolve_collisions,
+    # every enemy tagged with its sprite index to find the survivors back
+    for board, rules, state in walk_states(level_index):
+        gate_opened = toggle_gate(rules.key_pos, state.player, state.gate_opened)
+        map_data = rules.superdata["map_data"]
+        moved_zombies = generate_next_zombie_positions(
+            map_data, list(state.zombies), state.player, gate_opened, rules.superdata
+        ) if state.zombies else []
+        moved_scorpions = generate_next_scorpion_positions(
+            map_data, list(state.scorpions), state.player, gate_opened, rules.superdata
+        ) if state.scorpions else []
+
+        alive_zombies, alive_scorpions, clashes = resolve_collisions(
+            [tuple(zombie) + (index,) for index, zombie in enumerate(moved_zombies)],
+            [tuple(scorpion) + (index,) for index, scorpion in enumerate(moved_scorpions)],
+            rules.superdata,
+        )
+
+        _, zombies, scorpions, turn_clashes = resolve_turn(
+            rules.superdata, state.player, state.gate_opened, rules.key_pos,
+            state.zombies, state.scorpions, rules.trap_cells
+        )
+        assert [tuple(moved_zombies[zombie[3]]) for zombie in alive_zombies] == [tuple(zombie) for zombie in zombies]
+        assert [tuple(moved_scorpions[scorpion[3]]) for scorpion in alive_scorpions] == \
+               [tuple(scorpion) for scorpion in scorpions]
+        assert clashes == turn_clashes
@@ -0,0 +1,119 @@
+"""SolutionCache: LRU eviction, the level fingerprint and the JSON file."""
+
+import json
+import os
+
+from Assets.module.levels import load_level, get_winning_position
+from Assets.module.solution_cache import SolutionCache, level_fingerprint, load_level_cache
+
+
+def level_fingerprint_of(level_index: int) -> str:
+    map_length, stair, superdata, _, _, _, _ = load_level(level_index)
+    winning_position, _ = get_winning_position(stair, map_length)
+    return level_fingerprint(superdata, tuple(winning_position))
+
+
+def record_chain(cache: SolutionCache, first_state: int, length: int) -> None:
+    """Record a made-up path first_state, first_state+1, ... (positions are (state, 0))."""
+    states = list(range(first_state, first_state + length))
+    cache.record(states, [(state, 0) for state in states])
+
+
+def test_record_and_lookup():
+    cache = SolutionCache()
+    record_chain(cache, 10, 4)
+
+    assert cache.lookup(10) == [(11, 0), (12, 0), (13, 0)]
+    assert cache.lookup(12) == [(13, 0)]
+    assert cache.lookup(13) == []
+    assert cache.lookup(99) is None
+    assert cache.get_next_move(11) == ((12, 0), 2)
+
+
+def test_least_recently_used_entry_is_evicted_at_capacity():
+    cache = SolutionCache(max_entries=3)
+    cache.record([1], [(1, 0)])
+    cache.record([2], [(2, 0)])
+    cache.record([3], [(3, 0)])
+    assert cache.lookup(1) == []  # 1 is now the most recently used
+
+    cache.record([4], [(4, 0)])
+
+    assert len(cache) == 3
+    assert cache.lookup(2) is None
+    for state in (1, 3, 4):
+        assert cache.lookup(state) == []
+
+
+def test_save_load_round_trip_keeps_entries_and_lru_order(tmp_path):
+    file_path = str(tmp_path / "hint_cache.json")
+    cache = SolutionCache("level", max_entries=3, file_path=file_path)
+    for state in (1, 2, 3):
+        cache.record([state], [(state, 0)])
+    cache.get_next_move(1)
+    assert cache.save()
+
+    loaded = SolutionCache("level", max_entries=3, file_path=file_path)
+    assert loaded.load()
+    assert len(loaded) == 3
+    assert not loaded.dirty
+
+    # 2 was the oldest entry before saving, so it is the first to go after reload
+    loaded.record([4], [(4, 0)])
+    assert loaded.lookup(2) is None
+    assert all(loaded.lookup(state) == [] for state in (1, 3, 4))
+
+
+def test_round_trip_of_a_real_level(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.join("assets", "save"))
+    map_length, stair, superdata, _, _, _, _ = load_level(0)
+    goal = tuple(get_winning_position(stair, map_length)[0])
+
+    cache = load_level_cache(0, superdata, goal)
+    record_chain(cache, 100, 5)
+    assert cache.save()
+
+    assert load_level_cache(0, superdata, goal).lookup(100) == [(101, 0), (102, 0), (103, 0), (104, 0)]
+
+
+def test_load_rejects_a_cache_of_another_level(tmp_path):
+    file_path = str(tmp_path / "hint_cache.json")
+    cache = SolutionCache(level_fingerprint_of(0), file_path=file_path)
+    record_chain(cache, 1, 3)
+    assert cache.save()
+
+    other = SolutionCache(level_fingerprint_of(1), file_path=file_path)
+    assert not other.load()
+    assert len(other) == 0
+
+
+def test_load_rejects_missing_and_broken_files(tmp_path):
+    file_path = tmp_path / "hint_cache.json"
+    assert not SolutionCache("level", file_path=str(file_path)).load()
+
+    file_path.write_text("{not json")
+    assert not SolutionCache("level", file_path=str(file_path)).load()
+
+
+def test_save_only_writes_when_dirty(tmp_path):
+    file_path = tmp_path / "hint_cache.json"
+    cache = SolutionCache("level", file_path=str(file_path))
+
+    assert cache.save()
+    assert not file_path.exists()  # nothing recorded yet
+
+    record_chain(cache, 1, 2)
+    assert cache.dirty
+    assert cache.save()
+    assert not cache.dirty
+    assert json.loads(file_path.read_text())["fingerprint"] == "level"
+
+    file_path.write_text("untouched")
+    cache.lookup(1)
+    assert cache.save()
+    assert file_path.read_text() == "untouched"
+
+    cache.clear()
+    assert cache.save()
+    assert json.loads(file_path.read_text())["entries"] == []
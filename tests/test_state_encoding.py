@@ -0,0 +1,69 @@
+"""Packed solver states do not depend on the order enemies are listed in."""
+
+import pytest
+
+from Assets.module.map_collection import maps_collection
+from Assets.module.levels import load_level, get_winning_position
+from Assets.module.game_algorithms import CompiledBoard, Shortest_Path, SEARCH_BFS, SEARCH_ASTAR
+from Assets.module.search_stats import SearchStats
+from Assets.module.solution_cache import SolutionCache
+
+# Levels with several zombies or several scorpions
+MULTI_ENEMY_LEVELS = [
+    level_index for level_index in range(len(maps_collection))
+    if len(load_level(level_index)[4]) > 1 or len(load_level(level_index)[5]) > 1
+]
+
+
+def level_start(level_index: int):
+    map_length, stair, superdata, player_start, zombies, scorpions, _ = load_level(level_index)
+    winning_position, _ = get_winning_position(stair, map_length)
+    return (
+        superdata, tuple(player_start), tuple(winning_position),
+        [tuple(zombie) for zombie in zombies], [tuple(scorpion) for scorpion in scorpions],
+    )
+
+
+@pytest.mark.parametrize("level_index", MULTI_ENEMY_LEVELS)
+def test_reversed_enemies_pack_to_the_same_state(level_index):
+    superdata, start, _, zombies, scorpions = level_start(level_index)
+    board = CompiledBoard(superdata)
+
+    packed = board.encode_state(start, False, zombies, scorpions)
+    assert board.encode_state(start, False, zombies[::-1], scorpions[::-1]) == packed
+
+
+@pytest.mark.parametrize("algorithm", [SEARCH_BFS, SEARCH_ASTAR])
+@pytest.mark.parametrize("level_index", MULTI_ENEMY_LEVELS)
+def test_reversed_enemies_give_the_same_path(level_index, algorithm):
+    superdata, start, goal, zombies, scorpions = level_start(level_index)
+
+    path = Shortest_Path(superdata, start, goal, zombies, scorpions, algorithm=algorithm)
+    reversed_path = Shortest_Path(superdata, start, goal, zombies[::-1], scorpions[::-1], algorithm=algorithm)
+    assert reversed_path == path
+
+
+def unsorted_encode_enemies(board, enemies):
+    # CompiledBoard.encode_enemies without the sort: packed states keep the list order
+    return [((enemy[2] << board.cell_bits) | board.encode_cell(enemy)) + 1 for enemy in enemies]
+
+
+@pytest.mark.parametrize("level_index", [9, 24, 37])
+def test_reversed_enemies_are_answered_without_a_search(level_index, monkeypatch):
+    superdata, start, goal, zombies, scorpions = level_start(level_index)
+
+    def expanded_for_reversed_hint() -> int:
+        board = CompiledBoard(superdata)
+        cache = SolutionCache()
+        Shortest_Path(superdata, start, goal, zombies, scorpions, board=board, solution_cache=cache)
+        stats = SearchStats()
+        Shortest_Path(superdata, start, goal, zombies[::-1], scorpions[::-1], board=board,
+                      solution_cache=cache, stats=stats)
+        return stats.states_expanded
+
+    # Canonical order: the second hint is the cached first one
+    assert expanded_for_reversed_hint() == 0
+
+    # List order kept: the same position is searched all over again
+    monkeypatch.setattr(CompiledBoard, "encode_enemies", unsorted_encode_enemies)
+    assert expanded_for_reversed_hint() > 0
@@ -0,0 +1,33 @@
+"""Report rows of validate_maps."""
+
+from Assets.module import validate_maps
+from Assets.module.game_algorithms import SEARCH_ASTAR, SEARCH_IDA
+
+
+def test_solvable_and_unsolvable_levels():
+    assert validate_maps.validate_level(0, SEARCH_ASTAR)["status"] == "solvable"
+    assert validate_maps.validate_level(14, SEARCH_IDA)["status"] == "unsolvable"
+
+
+def give_up(hit_iteration_cap: bool, hit_memory_limit: bool):
+    def shortest_path(*args, stats=None, **kwargs):
+        stats.hit_iteration_cap = hit_iteration_cap
+        stats.hit_memory_limit = hit_memory_limit
+        return stats.finish([])
+    return shortest_path
+
+
+def test_memory_limit_give_up_is_not_unsolvable(monkeypatch):
+    monkeypatch.setattr(validate_maps, "Shortest_Path", give_up(hit_iteration_cap=False, hit_memory_limit=True))
+    assert validate_maps.validate_level(0, SEARCH_IDA, memory_limit=64)["status"] == "cap"
+
+
+def test_iteration_cap_is_not_unsolvable(monkeypatch):
+    monkeypatch.setattr(validate_maps, "Shortest_Path", give_up(hit_iteration_cap=True, hit_memory_limit=False))
+    assert validate_maps.validate_level(0, SEARCH_ASTAR)["status"] == "cap"
+
+
+def test_memory_limit_reaches_the_search():
+    row = validate_maps.validate_level(37, SEARCH_ASTAR, memory_limit=300)
+    assert row["status"] == "solvable"
+    assert row["peak_visited"] <= 300